@@ -0,0 +1,80 @@
+#!/bin/python3
+
+# How often an asyncio event loop gets to run while busy PEACH scripts
+# run under Peach.eval_async, for a few checkpoint intervals. A task
+# that sleeps 5ms in a loop records the gaps between its wakeups; without
+# checkpoints (the last row) the scripts only give the loop a turn when
+# Python switches threads.
+#
+#   python3 bench/async_eval.py
+#   python3 bench/async_eval.py --scripts 8
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+BUSY_SOURCE = '''
+let i = 0;
+
+while i < 1500 {
+    i += 1;
+}
+'''
+
+TICK = 0.005
+
+async def ticker(stop):
+    gaps = []
+    last = time.perf_counter()
+
+    while not stop.is_set():
+        await asyncio.sleep(TICK)
+
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+    return sorted(gaps)
+
+async def run(runtime, scripts, interval):
+    from peach import Peach
+
+    stop = asyncio.Event()
+    ticks = asyncio.create_task(ticker(stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[Peach(runtime=runtime).eval_async(data=BUSY_SOURCE, interval=interval) for _ in range(scripts)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    gaps = await ticks
+
+    return (elapsed, gaps[len(gaps) // 2], gaps[int(len(gaps) * 0.99)], gaps[-1])
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure event loop latency while PEACH scripts run under eval_async.')
+    arg_parser.add_argument('--scripts', type=int, default=4, help='busy scripts to run at once')
+    args = arg_parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    from interpreter.runtime import Runtime
+
+    runtime = Runtime()
+
+    print('{:<12} {:>10} {:>12} {:>12} {:>12}'.format('interval', 'seconds', 'median gap', 'p99 gap', 'max gap'))
+
+    for interval in (200, 1000, 10 ** 9):
+        (elapsed, median, p99, worst) = asyncio.run(run(runtime, args.scripts, interval))
+        name = str(interval) if interval < 10 ** 9 else 'none'
+
+        print('{:<12} {:>10.3f} {:>10.1f}ms {:>10.1f}ms {:>10.1f}ms'.format(name, elapsed, median * 1000, p99 * 1000, worst * 1000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/bin/python3
+
+# Calls per second of the same PEACH function from Python, through
+# Peach.call_function, a handle from Peach.get_function, and
+# Peach.call_many. `first` does almost nothing, so its rows show the cost
+# of the call itself; `score` is closer to a real callback.
+#
+#   python3 bench/call_many.py
+#   python3 bench/call_many.py --records 50000
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+SCORING_SOURCE = '''
+func first(weight, value) {
+    return weight;
+}
+
+func score(weight, value) {
+    if value > 50 {
+        return weight * 2;
+    }
+
+    return weight + value;
+}
+'''
+
+def timed(run, records):
+    start = time.perf_counter()
+    results = run(records)
+    elapsed = time.perf_counter() - start
+
+    return (elapsed, results)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure PEACH calls per second from Python.')
+    arg_parser.add_argument('--records', type=int, default=20000, help='argument sets per method')
+    args = arg_parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    from peach import Peach
+
+    peach = Peach()
+    peach.eval(data=SCORING_SOURCE)
+
+    records = [(index % 7, index % 100) for index in range(args.records)]
+
+    print('{:<10} {:<22} {:>10} {:>14}'.format('function', 'method', 'seconds', 'calls/s'))
+
+    for function_name in ('first', 'score'):
+        handle = peach.get_function(function_name)
+
+        methods = [
+            ('call_function', lambda records: [peach.call_function(function_name, list(record)) for record in records]),
+            ('get_function handle', lambda records: [handle(*record) for record in records]),
+            ('call_many', lambda records: peach.call_many(handle, records)),
+            ('call_many lazy', lambda records: list(peach.call_many(handle, records, lazy=True)))
+        ]
+
+        expected = None
+
+        for (name, run) in methods:
+            (elapsed, results) = timed(run, records)
+
+            if expected is None:
+                expected = results
+            elif results != expected:
+                raise SystemExit('{} returned different results'.format(name))
+
+            print('{:<10} {:<22} {:>10.3f} {:>14.0f}'.format(function_name, name, elapsed, len(records) / elapsed))
+
+if __name__ == '__main__':
+    main()
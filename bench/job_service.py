@@ -0,0 +1,78 @@
+#!/bin/python3
+
+# Time to run many small scripts, each in its own `main.py` process
+# against the same scripts on a warm `JobPool`.
+#
+#   python3 bench/job_service.py
+#   python3 bench/job_service.py --jobs 100 --workers 4
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+JOB_SOURCE = '''
+let total = 0;
+let k = 0;
+
+while k < 20 {{
+    total += (k * {job}) % 7;
+    k += 1;
+}}
+
+print("job {job}: " + total.to_str());
+'''
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare one process per script with a warm worker pool.')
+    arg_parser.add_argument('--jobs', type=int, default=40, help='scripts to run')
+    arg_parser.add_argument('--workers', type=int, help='pool workers (default: one per CPU core)')
+    args = arg_parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    from interpreter.service import JobPool
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+
+        for job in range(args.jobs):
+            path = os.path.join(directory, 'job{}.peach'.format(job))
+
+            with open(path, 'w') as fp:
+                fp.write(JOB_SOURCE.format(job=job))
+
+            paths.append(path)
+
+        start = time.perf_counter()
+        expected = [subprocess.run([sys.executable, 'main.py', path], capture_output=True, text=True).stdout for path in paths]
+        separate = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pool = JobPool(args.workers)
+        startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = sorted(pool.run({'id': job, 'path': path} for (job, path) in enumerate(paths)), key=lambda result: result['id'])
+        pooled = time.perf_counter() - start
+
+        pool.shutdown()
+
+    wrong = sum(1 for (result, output) in zip(results, expected) if result['output'] != output)
+
+    print('{:<24} {:>10} {:>10}'.format('method', 'seconds', 'jobs/s'))
+    print('{:<24} {:>10.3f} {:>10.1f}'.format('main.py per script', separate, args.jobs / separate))
+    print('{:<24} {:>10.3f} {:>10.1f}'.format('warm pool', pooled, args.jobs / pooled))
+    print('pool startup: {:.3f}s, {} workers, {} wrong'.format(startup, pool.workers, wrong))
+
+    if wrong > 0:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
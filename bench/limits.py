@@ -0,0 +1,96 @@
+#!/bin/python3
+
+# Cost of ExecutionLimits on a busy script, and a check that each limit
+# stops a runaway one. Times are the best of several runs, alternating
+# between configurations so they share the same machine noise.
+#
+#   python3 bench/limits.py
+#   python3 bench/limits.py --iterations 1000 --runs 9
+
+import argparse
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+BUSY_SOURCE = '''
+func count(n) {{
+    let i = 0;
+
+    while i < n {{
+        i += 1;
+    }}
+
+    return i;
+}}
+
+count({iterations});
+'''
+
+RUNAWAY_SOURCES = [
+    ({'max_steps': 100000}, 'while true { }'),
+    ({'timeout': 0.5}, 'while true { }'),
+    ({'max_depth': 50}, 'func down(n) { return down(n + 1); } down(0);')
+]
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure the overhead of ExecutionLimits.')
+    arg_parser.add_argument('--iterations', type=int, default=400, help='loop iterations in the busy script')
+    arg_parser.add_argument('--runs', type=int, default=5, help='runs per configuration')
+    args = arg_parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    from peach import Peach
+    from interpreter.runtime import Runtime
+    from interpreter.limits import ExecutionLimits
+
+    runtime = Runtime()
+    source = BUSY_SOURCE.format(iterations=args.iterations)
+
+    configurations = [
+        ('no limits', lambda: None),
+        ('max_steps + timeout', lambda: ExecutionLimits(max_steps=10 ** 12, timeout=3600)),
+        ('max_depth', lambda: ExecutionLimits(max_depth=1000)),
+        ('all three', lambda: ExecutionLimits(max_steps=10 ** 12, timeout=3600, max_depth=1000))
+    ]
+
+    best = {}
+
+    for _ in range(args.runs):
+        for (name, make_limits) in configurations:
+            peach = Peach(runtime=runtime)
+
+            start = time.perf_counter()
+            peach.eval(data=source, limits=make_limits())
+            elapsed = time.perf_counter() - start
+
+            best[name] = min(best.get(name, elapsed), elapsed)
+
+    print('{:<22} {:>10} {:>10}'.format('limits', 'seconds', 'overhead'))
+
+    for (name, _) in configurations:
+        print('{:<22} {:>10.3f} {:>9.1f}%'.format(name, best[name], (best[name] / best['no limits'] - 1) * 100))
+
+    stopped = 0
+
+    for (bounds, runaway) in RUNAWAY_SOURCES:
+        limits = ExecutionLimits(**bounds)
+        peach = Peach(runtime=runtime, output=io.StringIO())
+
+        start = time.perf_counter()
+        peach.eval(data=runaway, limits=limits)
+        elapsed = time.perf_counter() - start
+
+        stopped += 1 if peach.failed else 0
+        print('runaway script with {}: stopped={} after {:.3f}s'.format(limits, peach.failed, elapsed))
+
+    if stopped != len(RUNAWAY_SOURCES):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/bin/python3
+
+# Checks that a memory quota stops scripts that keep allocating, and
+# measures what the quota costs a script that allocates a lot but stays
+# under it. Times are the best of several runs, alternating between with
+# and without the quota.
+#
+#   python3 bench/memory_quota.py
+#   python3 bench/memory_quota.py --limit 16 --runs 9
+
+import argparse
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+RUNAWAY_SOURCES = [
+    ('array append', '''
+let xs = [];
+let i = 0;
+
+while true {
+    xs.append("item number " + i.to_str());
+    i += 1;
+}
+'''),
+    ('object literals', '''
+let xs = [];
+
+while true {
+    xs.append({ a = 1 b = "x" });
+}
+'''),
+    ('string repeat', '''
+let chunks = [];
+
+while true {
+    chunks.append("abcdefgh" * 100000);
+}
+''')
+]
+
+# builds a few arrays and objects and throws most of them away again
+BUSY_SOURCE = '''
+let kept = [];
+let i = 0;
+
+while i < 300 {
+    let row = [i, i + 1, i + 2, i + 3];
+    let name = "row " + i.to_str();
+
+    if i % 10 == 0 {
+        kept.append({ name = name row = row });
+    }
+
+    i += 1;
+}
+'''
+
+MIB = 1024 * 1024
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Check and measure per-evaluation memory quotas.')
+    arg_parser.add_argument('--limit', type=float, default=2, help='quota in MiB for the runaway scripts')
+    arg_parser.add_argument('--runs', type=int, default=5, help='runs per configuration of the busy script')
+    args = arg_parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    from peach import Peach
+    from interpreter.runtime import Runtime
+    from interpreter.limits import ExecutionLimits
+
+    runtime = Runtime()
+    limit = int(args.limit * MIB)
+    stopped = 0
+
+    print('{:<18} {:>8} {:>10} {:>10} {:>9}'.format('runaway script', 'stopped', 'seconds', 'MiB used', 'recounts'))
+
+    for (name, source) in RUNAWAY_SOURCES:
+        limits = ExecutionLimits(max_memory=limit)
+        peach = Peach(runtime=runtime, output=io.StringIO())
+
+        start = time.perf_counter()
+        peach.eval(data=source, limits=limits)
+        elapsed = time.perf_counter() - start
+
+        # stopped by the quota, not by some other error
+        was_stopped = peach.failed and limits.memory.in_use > limit and 'memory limit of {} bytes exceeded'.format(limit) in peach.output.getvalue()
+        stopped += 1 if was_stopped else 0
+
+        print('{:<18} {:>8} {:>10.3f} {:>10.2f} {:>9}'.format(name, str(was_stopped), elapsed, limits.memory.in_use / MIB, limits.memory.recounts))
+
+    configurations = [
+        ('no quota', lambda: None),
+        ('quota', lambda: ExecutionLimits(max_memory=limit))
+    ]
+
+    best = {}
+
+    for _ in range(args.runs):
+        for (name, make_limits) in configurations:
+            peach = Peach(runtime=runtime)
+
+            start = time.perf_counter()
+            peach.eval(data=BUSY_SOURCE, limits=make_limits())
+            elapsed = time.perf_counter() - start
+
+            best[name] = min(best.get(name, elapsed), elapsed)
+
+    print()
+    print('{:<18} {:>10} {:>10}'.format('busy script', 'seconds', 'overhead'))
+
+    for (name, _) in configurations:
+        print('{:<18} {:>10.3f} {:>9.1f}%'.format(name, best[name], (best[name] / best['no quota'] - 1) * 100))
+
+    if stopped != len(RUNAWAY_SOURCES):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
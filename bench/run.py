@@ -0,0 +1,165 @@
+#!/bin/python3
+
+# Runs the PEACH programs in bench/ and reports wall time, node visits and
+# peak memory for each. Every run happens in a fresh process so one
+# benchmark's memory or warm caches can't leak into the next.
+#
+#   python3 bench/run.py                       run everything
+#   python3 bench/run.py fib oop_methods       run a subset
+#   python3 bench/run.py --json after.json --compare before.json
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+def find_benchmarks(names):
+    available = sorted(
+        os.path.splitext(filename)[0]
+        for filename in os.listdir(BENCH_DIR)
+        if filename.endswith('.peach')
+    )
+
+    if len(names) == 0:
+        return available
+
+    for name in names:
+        if name not in available:
+            raise SystemExit("unknown benchmark '{}', expected one of: {}".format(name, ', '.join(available)))
+
+    return names
+
+def run_child(name, count_nodes):
+    # std/ imports are relative to the repository root
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    from peach import Peach
+
+    # keep the benchmark's own output out of the result line
+    result_stream = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    sys.stdout = open(os.devnull, 'w')
+
+    peach = Peach()
+
+    start = time.perf_counter()
+    peach.eval_file(os.path.join('bench', name + '.peach'), stats=count_nodes)
+    wall = time.perf_counter() - start
+
+    result = {
+        'wall': wall,
+        # kilobytes on Linux
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+
+    if count_nodes:
+        result['node_visits'] = peach.stats.total_node_visits
+
+    result_stream.write(json.dumps(result) + '\n')
+    result_stream.flush()
+
+def spawn_child(name, count_nodes):
+    command = [sys.executable, os.path.abspath(__file__), '--child', name]
+
+    if count_nodes:
+        command.append('--count-nodes')
+
+    completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    if completed.returncode != 0 or completed.stdout.strip() == '':
+        raise RuntimeError('benchmark {} failed:\n{}'.format(name, completed.stderr))
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_benchmark(name, repeat, count_nodes):
+    timed = [spawn_child(name, False) for _ in range(repeat)]
+
+    result = {
+        'wall': min(run['wall'] for run in timed),
+        'peak_rss_kb': max(run['peak_rss_kb'] for run in timed)
+    }
+
+    # counting slows the interpreter down, so node visits come from a
+    # separate run that is not timed
+    if count_nodes:
+        result['node_visits'] = spawn_child(name, True)['node_visits']
+
+    return result
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def format_change(new, old):
+    if old is None or old == 0:
+        return ''
+
+    return '{:+.1f}%'.format(100.0 * (new - old) / old)
+
+def print_results(results, baseline):
+    header = '{:<22} {:>10} {:>8} {:>14} {:>8} {:>12} {:>8}'
+    print(header.format('benchmark', 'wall s', '', 'node visits', '', 'peak RSS MB', ''))
+
+    for (name, result) in results.items():
+        old = baseline.get(name, {})
+        visits = result.get('node_visits')
+
+        print(header.format(
+            name,
+            '{:.3f}'.format(result['wall']),
+            format_change(result['wall'], old.get('wall')),
+            '' if visits is None else visits,
+            '' if visits is None else format_change(visits, old.get('node_visits')),
+            '{:.1f}'.format(result['peak_rss_kb'] / 1024.0),
+            format_change(result['peak_rss_kb'], old.get('peak_rss_kb'))
+        ))
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Run the PEACH benchmark suite.')
+    arg_parser.add_argument('names', nargs='*', help='benchmarks to run (default: all of bench/*.peach)')
+    arg_parser.add_argument('--repeat', type=int, default=1, help='timed runs per benchmark; the fastest is reported')
+    arg_parser.add_argument('--no-count', action='store_true', help='skip the extra run that counts node visits')
+    arg_parser.add_argument('--json', metavar='PATH', help='write the results as JSON')
+    arg_parser.add_argument('--compare', metavar='PATH', help='JSON results of an earlier run to compare against')
+    arg_parser.add_argument('--child', help=argparse.SUPPRESS)
+    arg_parser.add_argument('--count-nodes', action='store_true', help=argparse.SUPPRESS)
+
+    args = arg_parser.parse_args()
+
+    if args.child is not None:
+        run_child(args.child, args.count_nodes)
+        return
+
+    baseline = {}
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)['benchmarks']
+
+    results = {}
+
+    for name in find_benchmarks(args.names):
+        sys.stderr.write('running {}...\n'.format(name))
+        results[name] = run_benchmark(name, max(args.repeat, 1), not args.no_count)
+
+    print_results(results, baseline)
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'benchmarks': results
+            }, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/bin/python3
+
+# Breaks the cost of starting PEACH down into phases: importing the
+# interpreter's Python modules, registering builtins, lexing and parsing
+# every std file, and running them. Run it in a fresh process; module
+# import times are only meaningful the first time.
+#
+#   python3 bench/startup.py
+#   python3 bench/startup.py script.peach      bootstrap plus a script
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+class PhaseTimer:
+    def __init__(self):
+        # filename -> seconds, exclusive of nested imports
+        self.lex = {}
+        self.parse = {}
+        self.execute = {}
+        self.order = []
+
+        self._parse_stack = []
+        self._execute_stack = []
+
+    def _add(self, table, filename, seconds):
+        if filename not in self.order:
+            self.order.append(filename)
+
+        table[filename] = table.get(filename, 0.0) + seconds
+
+    def wrap_parser(self, lexer_class, parser_class):
+        timer = self
+        lex = lexer_class.lex
+        import_file = parser_class.import_file
+
+        def timed_lex(lexer):
+            start = time.perf_counter()
+            tokens = lex(lexer)
+            elapsed = time.perf_counter() - start
+
+            timer._add(timer.lex, lexer.source_location.filename, elapsed)
+
+            # lexing is reported separately, keep it out of parse time
+            if len(timer._parse_stack) > 0:
+                timer._parse_stack[-1][1] += elapsed
+
+            return tokens
+
+        def timed_import_file(parser, filename, filename_token=None):
+            timer._parse_stack.append([filename, 0.0])
+            start = time.perf_counter()
+
+            try:
+                return import_file(parser, filename, filename_token)
+            finally:
+                elapsed = time.perf_counter() - start
+                (_, excluded) = timer._parse_stack.pop()
+
+                timer._add(timer.parse, filename, elapsed - excluded)
+
+                if len(timer._parse_stack) > 0:
+                    timer._parse_stack[-1][1] += elapsed
+
+        lexer_class.lex = timed_lex
+        parser_class.import_file = timed_import_file
+
+    def wrap_interpreter(self, interpreter_class):
+        timer = self
+        visit_import = interpreter_class.visit_Import
+
+        def timed_visit_import(interpreter, node):
+            filename = node.source_location.filename
+            timer._execute_stack.append([filename, 0.0])
+            start = time.perf_counter()
+
+            try:
+                return visit_import(interpreter, node)
+            finally:
+                elapsed = time.perf_counter() - start
+                (_, nested) = timer._execute_stack.pop()
+
+                timer._add(timer.execute, filename, elapsed - nested)
+
+                if len(timer._execute_stack) > 0:
+                    timer._execute_stack[-1][1] += elapsed
+
+        interpreter_class.visit_Import = timed_visit_import
+
+def timed_import(module_name):
+    start = time.perf_counter()
+    __import__(module_name)
+
+    return time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Time each phase of the PEACH bootstrap.')
+    arg_parser.add_argument('script', nargs='?', help='a script to run after the bootstrap (default: an empty one)')
+    args = arg_parser.parse_args()
+
+    script_data = None
+
+    if args.script is not None:
+        with open(args.script) as f:
+            script_data = f.read()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    total_start = time.perf_counter()
+
+    # in dependency order, so each line is the cost that module adds
+    module_times = [(name, timed_import(name)) for name in ('lexer', 'parser.parser', 'interpreter.interpreter', 'peach')]
+
+    from lexer import Lexer
+    from parser.parser import Parser
+    from interpreter.interpreter import Interpreter
+    from interpreter.env.globals import Globals
+    from interpreter.scope import Scope
+    from peach import Peach
+
+    start = time.perf_counter()
+    Globals().apply_to_scope(Scope(None))
+    globals_time = time.perf_counter() - start
+
+    timer = PhaseTimer()
+    timer.wrap_parser(Lexer, Parser)
+    timer.wrap_interpreter(Interpreter)
+
+    start = time.perf_counter()
+    Peach().eval(data=script_data if script_data is not None else '')
+    eval_time = time.perf_counter() - start
+
+    total_time = time.perf_counter() - total_start
+
+    print('Python module imports:')
+
+    for (name, seconds) in module_times:
+        print('  {:>8.1f} ms  {}'.format(seconds * 1000, name))
+
+    print()
+    print('  {:>8.1f} ms  Globals().apply_to_scope'.format(globals_time * 1000))
+    print()
+    print('Per file (exclusive of nested imports):')
+    print('  {:>8} {:>8} {:>8}  {}'.format('lex ms', 'parse ms', 'exec ms', 'file'))
+
+    for filename in timer.order:
+        print('  {:>8.1f} {:>8.1f} {:>8.1f}  {}'.format(
+            timer.lex.get(filename, 0.0) * 1000,
+            timer.parse.get(filename, 0.0) * 1000,
+            timer.execute.get(filename, 0.0) * 1000,
+            filename
+        ))
+
+    lex_total = sum(timer.lex.values())
+    parse_total = sum(timer.parse.values())
+    execute_total = sum(timer.execute.values())
+
+    print('  {:>8.1f} {:>8.1f} {:>8.1f}  total'.format(lex_total * 1000, parse_total * 1000, execute_total * 1000))
+    print()
+    print('Peach.eval: {:.1f} ms, of which {:.1f} ms outside the phases above'.format(eval_time * 1000, (eval_time - lex_total - parse_total - execute_total) * 1000))
+    print('Everything: {:.1f} ms'.format(total_time * 1000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/bin/python3
+
+# Runs many PEACH evaluations at once in a thread pool, all sharing one
+# Runtime, and checks that each one printed exactly what it should have.
+# Every other job patches `Int.instance.to_str`; if that leaked into
+# another job's copy of the std library, its output would be wrong.
+#
+#   python3 bench/thread_stress.py
+#   python3 bench/thread_stress.py --jobs 400 --threads 16
+
+import argparse
+import io
+import os
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+JOB_SOURCE = '''
+let total = 0;
+let k = 0;
+
+while k < 40 {{
+    total += (k * {job}) % 7;
+    k += 1;
+}}
+
+let Counter = Type.extend({{
+    name = 'Counter'
+
+    instance = {{
+        count = 0
+    }}
+
+    func __construct__(self, count) {{
+        self.count = count;
+    }}
+}});
+
+if {patch} {{
+    Int.instance.to_str = func (self) {{
+        return "patched";
+    }};
+}}
+
+print("job {job}: " + total.to_str() + " " + Counter.new({job}).count);
+'''
+
+def expected_output(job):
+    if job % 2 == 1:
+        return 'job {}: patched patched\n'.format(job)
+
+    total = sum((k * job) % 7 for k in range(40))
+
+    return 'job {}: {} {}\n'.format(job, total, job)
+
+def run_job(runtime, job):
+    from peach import Peach
+
+    output = io.StringIO()
+    peach = Peach(runtime=runtime, output=output)
+    peach.eval(data=JOB_SOURCE.format(job=job, patch='true' if job % 2 == 1 else 'false'))
+
+    return output.getvalue()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Evaluate PEACH scripts concurrently and check their output.')
+    arg_parser.add_argument('--jobs', type=int, default=200, help='scripts to evaluate')
+    arg_parser.add_argument('--threads', type=int, default=8, help='worker threads')
+    args = arg_parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    from interpreter.runtime import Runtime
+
+    start = time.perf_counter()
+    runtime = Runtime()
+    bootstrap = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        outputs = list(executor.map(lambda job: run_job(runtime, job), range(args.jobs)))
+
+    elapsed = time.perf_counter() - start
+
+    failures = [
+        (job, output) for (job, output) in enumerate(outputs)
+        if output != expected_output(job)
+    ]
+
+    for (job, output) in failures[:10]:
+        print('job {} printed {!r}, expected {!r}'.format(job, output, expected_output(job)))
+
+    print('bootstrap: {:.3f}s'.format(bootstrap))
+    print('{} jobs on {} threads: {:.3f}s, {:.1f} jobs/s, {} wrong'.format(args.jobs, args.threads, elapsed, args.jobs / elapsed, len(failures)))
+
+    if len(failures) > 0:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,10 @@ class ErrorType(Enum):
     MultipleDefinition = auto()
     ArgumentError = auto()
     MacroExpansionError = auto()
+    IOError = auto()
+    ExtensionError = auto()
+    WorkerError = auto()
+    LimitExceeded = auto()
 
 class Error():
     def __init__(self, type, location, message, filename):
@@ -55,9 +59,10 @@ class ErrorList():
     def push_error(self, error):
         self.errors.append(error)
         
-    def print_errors(self):
+    def print_errors(self, stream=None):
+        # None means sys.stdout
         for error in self.errors:
-            print(error)
+            print(error, file=stream)
         
     def get_errors(self):
         return self.errors
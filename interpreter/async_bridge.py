@@ -0,0 +1,83 @@
+from interpreter.step_counter import StepCounter
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+class EvalCancelled(BaseException):
+    # raised in the interpreter thread when the task awaiting eval_async is
+    # cancelled; a BaseException, like asyncio.CancelledError, so nothing
+    # on the way out mistakes it for an error in the script
+    pass
+
+class AsyncBridge:
+    # Connects an interpreter running on its own thread to an asyncio event
+    # loop. Every `interval` steps the interpreter waits for the loop to go
+    # round once, so a busy script can't starve the loop's other tasks.
+    # Sleeping, console input and file I/O are awaited on the loop, with
+    # the interpreter thread waiting for the result.
+
+    # a shorter interval lowers the loop's latency while scripts are busy
+    # and makes them slower, see bench/async_eval.py
+    DEFAULT_INTERVAL = StepCounter.DEFAULT_INTERVAL
+
+    def __init__(self, loop, interval=DEFAULT_INTERVAL, read_line=None):
+        self.loop = loop
+        self.interval = interval
+        # async function returning the next line of input, instead of input()
+        self.read_line_callback = read_line
+        self.cancelled = False
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def attach(self, interpreter):
+        # an eval cancelled before it got this far doesn't start
+        if self.cancelled:
+            raise EvalCancelled()
+
+        interpreter.async_bridge = self
+        StepCounter.of(interpreter, self.interval).add(self.checkpoint)
+
+    def wait(self, coroutine):
+        # runs `coroutine` on the loop and blocks this thread until it is done
+        with self._lock:
+            if self.cancelled:
+                coroutine.close()
+                raise EvalCancelled()
+
+            future = self._pending = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise EvalCancelled()
+        finally:
+            self._pending = None
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+
+            if self._pending is not None:
+                self._pending.cancel()
+
+    def checkpoint(self, node):
+        self.wait(asyncio.sleep(0))
+
+    def sleep(self, seconds):
+        self.wait(asyncio.sleep(seconds))
+
+    def read_line(self):
+        if self.read_line_callback is not None:
+            return self.wait(self.read_line_callback())
+
+        return self.run_blocking(input)
+
+    def run_blocking(self, fn, *values):
+        # on the loop's default executor, so a cancelled eval stops waiting
+        # for it straight away
+        return self.wait(self._in_executor(functools.partial(fn, *values)))
+
+    async def _in_executor(self, fn):
+        return await self.loop.run_in_executor(None, fn)
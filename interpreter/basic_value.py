@@ -1,5 +1,7 @@
 from parser.node import NodeFunctionExpression, NodeMacro
 from interpreter.function import BuiltinFunction
+from interpreter.str_rope import StrRope
+from interpreter.native_value import NativeValue
 
 class BasicValue:
     def __init__(self, value):
@@ -21,6 +23,10 @@ class BasicValue:
         if isinstance(self.value, BasicValue):
             return self.value.extract_value()
 
+        # ropes are only flattened once something reads them
+        if type(self.value) is StrRope:
+            return self.value.flatten()
+
         return self.value
 
     def lookup_type(self, global_scope):
@@ -32,18 +38,21 @@ class BasicValue:
             return global_scope.find_variable_value('Func')
         elif isinstance(self.value, NodeMacro):
             return global_scope.find_variable_value('Macro')
-        elif type(self.value) is str:
+        elif type(self.value) is str or type(self.value) is StrRope:
             return global_scope.find_variable_value('Str')
         elif type(self.value) is int:
             return global_scope.find_variable_value('Int')
         elif type(self.value) is float:
             return global_scope.find_variable_value('Float')
-        elif type(self.value) is list:
+        elif isinstance(self.value, list):
+            # including arrays shared with Python code, see HostList
             return global_scope.find_variable_value('Array')
         elif type(self.value) is bool:
             return global_scope.find_variable_value('Bool')
         elif self.value is None:
             return global_scope.find_variable_value('Null')
+        elif isinstance(self.value, NativeValue):
+            return global_scope.find_variable_value(self.value.type_name)
         else:
             raise Exception('could not get type for {}'.format(self))
 
@@ -0,0 +1,168 @@
+from interpreter.basic_value import BasicValue
+from interpreter.basic_object import BasicObject
+from interpreter.file_handle import FileHandle, MappedFile
+from interpreter.iterator import NativeIterator
+from error import ErrorType
+
+def _file_call(arguments, fn, *values):
+    bridge = arguments.interpreter.async_bridge
+
+    try:
+        if bridge is not None:
+            return bridge.run_blocking(fn, *values)
+
+        return fn(*values)
+    except (OSError, ValueError, UnicodeError) as e:
+        arguments.interpreter.error(arguments.node, ErrorType.IOError, str(e))
+        return None
+
+def _native_file_argument(interpreter, node, value, expected_type):
+    value = BasicValue(value).extract_value()
+
+    # boxed FileHandle/MappedFile instances keep the native value in `_value`
+    if isinstance(value, BasicObject):
+        member = value.lookup_member('_value')
+
+        if member is not None:
+            value = BasicValue(member.value).extract_value()
+
+    if not isinstance(value, expected_type):
+        interpreter.error(node, ErrorType.TypeError, 'expected a {}, got {}'.format(expected_type.type_name, value))
+        return None
+
+    return value
+
+def _handle_argument(arguments, index=0):
+    return _native_file_argument(arguments.interpreter, arguments.node, arguments.arguments[index], FileHandle)
+
+def _mapped_argument(arguments, index=0):
+    return _native_file_argument(arguments.interpreter, arguments.node, arguments.arguments[index], MappedFile)
+
+def _write_file(file_path, mode, value):
+    with open(file_path, mode) as f:
+        f.write(value)
+
+def _read_file(file_path):
+    with open(file_path, 'r') as f:
+        return f.read()
+
+def builtin_file_read(arguments):
+    file_path = arguments.arguments[0].extract_value()
+
+    return BasicValue(_file_call(arguments, _read_file, file_path))
+
+def builtin_file_write(arguments):
+    file_path = arguments.arguments[0]
+    write_value = arguments.arguments[1]
+
+    _file_call(arguments, _write_file, file_path.extract_value(), 'w', str(write_value.extract_value()))
+
+    return BasicValue(file_path)
+
+def builtin_file_append(arguments):
+    file_path = arguments.arguments[0]
+    write_value = arguments.arguments[1]
+
+    _file_call(arguments, _write_file, file_path.extract_value(), 'a', str(write_value.extract_value()))
+
+    return BasicValue(file_path)
+
+def builtin_file_open(arguments):
+    file_path = arguments.arguments[0].extract_value()
+    mode = arguments.arguments[1].extract_value()
+    buffer_size = arguments.arguments[2].extract_value()
+
+    # 0 asks for the default buffering; text files cannot be unbuffered
+    if buffer_size <= 0:
+        buffer_size = -1
+
+    return BasicValue(_file_call(arguments, FileHandle, file_path, mode, buffer_size))
+
+def builtin_file_read_line(arguments):
+    handle = _handle_argument(arguments)
+
+    return BasicValue(_file_call(arguments, handle.read_line))
+
+def builtin_file_read_chunk(arguments):
+    handle = _handle_argument(arguments)
+    size = arguments.arguments[1].extract_value()
+
+    return BasicValue(_file_call(arguments, handle.read_chunk, int(size)))
+
+def iterate_file(interpreter, node, handle_object):
+    handle = _native_file_argument(interpreter, node, handle_object, FileHandle)
+
+    try:
+        for line in handle.lines():
+            yield BasicValue(line)
+    except (OSError, ValueError, UnicodeError) as e:
+        interpreter.error(node, ErrorType.IOError, str(e))
+
+def builtin_file_lines(arguments):
+    return BasicValue(NativeIterator(iterate_file(arguments.interpreter, arguments.node, arguments.arguments[0])))
+
+def builtin_file_handle_write(arguments):
+    handle = _handle_argument(arguments)
+    value = arguments.arguments[1].extract_value()
+
+    return BasicValue(_file_call(arguments, handle.write, str(value)))
+
+def builtin_file_flush(arguments):
+    handle = _handle_argument(arguments)
+
+    _file_call(arguments, handle.flush)
+
+    return BasicValue(None)
+
+def builtin_file_close(arguments):
+    handle = _handle_argument(arguments)
+
+    _file_call(arguments, handle.close)
+
+    return BasicValue(None)
+
+def builtin_file_map(arguments):
+    file_path = arguments.arguments[0].extract_value()
+
+    return BasicValue(_file_call(arguments, MappedFile.open, file_path))
+
+def builtin_mapped_len(arguments):
+    return BasicValue(len(_mapped_argument(arguments)))
+
+def builtin_mapped_slice(arguments):
+    mapped = _mapped_argument(arguments)
+    start = arguments.arguments[1].extract_value()
+    stop = arguments.arguments[2].extract_value()
+
+    return BasicValue(mapped.slice(start, stop))
+
+def builtin_mapped_find(arguments):
+    mapped = _mapped_argument(arguments)
+    needle = arguments.arguments[1].extract_value()
+    offset = arguments.arguments[2].extract_value()
+
+    return BasicValue(mapped.find(str(needle), offset))
+
+def iterate_mapped(interpreter, node, mapped_object):
+    mapped = _native_file_argument(interpreter, node, mapped_object, MappedFile)
+
+    try:
+        for line in mapped.lines():
+            yield BasicValue(line)
+    except (ValueError, UnicodeError) as e:
+        interpreter.error(node, ErrorType.IOError, str(e))
+
+def builtin_mapped_lines(arguments):
+    return BasicValue(NativeIterator(iterate_mapped(arguments.interpreter, arguments.node, arguments.arguments[0])))
+
+def builtin_mapped_to_str(arguments):
+    mapped = _mapped_argument(arguments)
+
+    return BasicValue(_file_call(arguments, mapped.to_str))
+
+def builtin_mapped_close(arguments):
+    mapped = _mapped_argument(arguments)
+
+    _file_call(arguments, mapped.close)
+
+    return BasicValue(None)
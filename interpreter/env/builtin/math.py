@@ -0,0 +1,108 @@
+from interpreter.basic_value import BasicValue
+from error import ErrorType
+
+import math
+
+def _number_values(arguments):
+    interpreter = arguments.interpreter
+    node = arguments.node
+
+    values = []
+
+    for arg in arguments.arguments:
+        v = arg.extract_value()
+
+        # a single array argument is treated as the list of values
+        if isinstance(v, list):
+            values.extend(BasicValue(item).extract_value() for item in v)
+        else:
+            values.append(v)
+
+    for v in values:
+        if type(v) not in (int, float):
+            interpreter.error(node, ErrorType.TypeError, 'expected a number, got {}'.format(v))
+            return None
+
+    if len(values) == 0:
+        interpreter.error(node, ErrorType.ArgumentError, 'expected at least one number')
+        return None
+
+    return values
+
+def _number_argument(arguments, index):
+    v = arguments.arguments[index].extract_value()
+
+    if type(v) not in (int, float):
+        arguments.interpreter.error(arguments.node, ErrorType.TypeError, 'expected a number, got {}'.format(v))
+        return None
+
+    return v
+
+def _math_call(arguments, fn, *values):
+    try:
+        result = fn(*values)
+    except (ValueError, OverflowError, ZeroDivisionError) as e:
+        arguments.interpreter.error(arguments.node, ErrorType.ArgumentError, 'math error: {}'.format(e))
+        return None
+
+    # such as pow of a negative number to a fractional power
+    if type(result) is complex:
+        arguments.interpreter.error(arguments.node, ErrorType.ArgumentError, 'math error: result is not a real number')
+        return None
+
+    return BasicValue(result)
+
+def builtin_math_max(arguments):
+    values = _number_values(arguments)
+
+    return BasicValue(max(values))
+
+def builtin_math_min(arguments):
+    values = _number_values(arguments)
+
+    return BasicValue(min(values))
+
+def builtin_math_clamp(arguments):
+    value = _number_argument(arguments, 0)
+    min_value = _number_argument(arguments, 1)
+    max_value = _number_argument(arguments, 2)
+
+    return BasicValue(min(max(value, min_value), max_value))
+
+def builtin_math_sqrt(arguments):
+    return _math_call(arguments, math.sqrt, _number_argument(arguments, 0))
+
+def builtin_math_pow(arguments):
+    return _math_call(arguments, pow, _number_argument(arguments, 0), _number_argument(arguments, 1))
+
+def builtin_math_floor(arguments):
+    return _math_call(arguments, math.floor, _number_argument(arguments, 0))
+
+def builtin_math_ceil(arguments):
+    return _math_call(arguments, math.ceil, _number_argument(arguments, 0))
+
+def builtin_math_abs(arguments):
+    return BasicValue(abs(_number_argument(arguments, 0)))
+
+def builtin_math_sin(arguments):
+    return _math_call(arguments, math.sin, _number_argument(arguments, 0))
+
+def builtin_math_cos(arguments):
+    return _math_call(arguments, math.cos, _number_argument(arguments, 0))
+
+def builtin_math_tan(arguments):
+    return _math_call(arguments, math.tan, _number_argument(arguments, 0))
+
+def builtin_math_atan(arguments):
+    return _math_call(arguments, math.atan, _number_argument(arguments, 0))
+
+def builtin_math_exp(arguments):
+    return _math_call(arguments, math.exp, _number_argument(arguments, 0))
+
+def builtin_math_log(arguments):
+    value = _number_argument(arguments, 0)
+
+    if len(arguments.arguments) > 1 and arguments.arguments[1].extract_value() is not None:
+        return _math_call(arguments, math.log, value, _number_argument(arguments, 1))
+
+    return _math_call(arguments, math.log, value)
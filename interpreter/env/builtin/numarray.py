@@ -0,0 +1,225 @@
+from interpreter.basic_value import BasicValue
+from interpreter.basic_object import BasicObject
+from interpreter.numeric_array import NumericArray
+from interpreter.str_rope import StrRope
+from error import ErrorType
+
+def numeric_operand(interpreter, node, value):
+    value = BasicValue(value).extract_value()
+
+    # boxed FloatArray/IntArray instances keep the buffer in `_value`
+    if isinstance(value, BasicObject):
+        member = value.lookup_member('_value')
+
+        if member is not None:
+            value = BasicValue(member.value).extract_value()
+
+    if isinstance(value, NumericArray) or type(value) in (int, float):
+        return value
+
+    if isinstance(value, list):
+        values = [BasicValue(item).extract_value() for item in value]
+
+        if all(type(v) in (int, float) for v in values):
+            kind = 'float' if any(type(v) is float for v in values) else 'int'
+            return NumericArray.from_values(kind, values)
+
+    interpreter.error(node, ErrorType.TypeError, 'expected a number or numeric array, got {}'.format(value))
+    return None
+
+# raw values that can't be numeric arrays, looked at without extracting
+# them: extract_value flattens a StrRope, and as_numarray is tried on the
+# operands of every binary operator, `result += piece` included
+_NOT_NUMARRAY_TYPES = (str, StrRope, int, float, list)
+
+def _raw_value(value):
+    value = BasicValue(value).extract_basicvalue()
+
+    if isinstance(value, BasicObject):
+        return value
+
+    return value.value
+
+def as_numarray(value):
+    value = _raw_value(value)
+
+    if type(value) in _NOT_NUMARRAY_TYPES:
+        return None
+
+    if isinstance(value, BasicObject):
+        member = value.lookup_member('_value')
+
+        if member is None:
+            return None
+
+        value = _raw_value(member.value)
+
+    if isinstance(value, NumericArray):
+        return value
+
+    return None
+
+def numarray_operator(interpreter, node, op_name, lhs, rhs):
+    # `lhs <op> rhs` evaluated elementwise when either side is a numeric
+    # array and the other is a number or numeric array, or a plain Array
+    # on the right; None means the usual method dispatch applies
+    lhs_numarray = as_numarray(lhs)
+
+    if lhs_numarray is not None:
+        (numarray, other, reverse) = (lhs_numarray, rhs, False)
+        other_value = BasicValue(other).extract_value()
+
+        if type(other_value) not in (int, float, list) and as_numarray(other_value) is None:
+            return None
+    else:
+        rhs_numarray = as_numarray(rhs)
+
+        if rhs_numarray is None:
+            return None
+
+        # `array + x` keeps meaning append for a plain Array on the left
+        (numarray, other, reverse) = (rhs_numarray, lhs, True)
+        other_value = BasicValue(other).extract_value()
+
+        if type(other_value) not in (int, float):
+            return None
+
+    other = numeric_operand(interpreter, node, other_value)
+
+    try:
+        return BasicValue(numarray.binary_op(op_name, other, reverse))
+    except (ValueError, TypeError, OverflowError, ZeroDivisionError) as e:
+        interpreter.error(node, ErrorType.ArgumentError, 'numeric array error: {}'.format(e))
+        return None
+
+def _numarray_argument(arguments, index=0):
+    value = numeric_operand(arguments.interpreter, arguments.node, arguments.arguments[index])
+
+    if not isinstance(value, NumericArray):
+        arguments.interpreter.error(arguments.node, ErrorType.TypeError, 'expected a numeric array, got {}'.format(value))
+        return None
+
+    return value
+
+def _numarray_call(arguments, fn, *values):
+    try:
+        return BasicValue(fn(*values))
+    except (IndexError, ValueError, TypeError, OverflowError, ZeroDivisionError) as e:
+        arguments.interpreter.error(arguments.node, ErrorType.ArgumentError, 'numeric array error: {}'.format(e))
+        return None
+
+def iterate_numarray(interpreter, node, numarray_object):
+    numarray = numeric_operand(interpreter, node, numarray_object)
+
+    for value in numarray.to_list():
+        yield BasicValue(value)
+
+def builtin_numarray_new(arguments):
+    interpreter = arguments.interpreter
+    kind = arguments.arguments[0].extract_value()
+    value = BasicValue(arguments.arguments[1]).extract_value()
+
+    if kind not in NumericArray.TYPE_NAMES:
+        interpreter.error(arguments.node, ErrorType.ArgumentError, 'unknown numeric array kind {}'.format(kind))
+        return None
+
+    if value is None:
+        value = 0
+
+    if type(value) is int:
+        return _numarray_call(arguments, NumericArray.allocate, kind, value)
+
+    numarray = numeric_operand(interpreter, arguments.node, value)
+
+    if not isinstance(numarray, NumericArray):
+        interpreter.error(arguments.node, ErrorType.TypeError, 'cannot create a numeric array from {}'.format(value))
+        return None
+
+    if numarray.kind == kind:
+        return BasicValue(numarray)
+
+    return _numarray_call(arguments, NumericArray.from_values, kind, numarray.to_list())
+
+def builtin_numarray_len(arguments):
+    return BasicValue(len(_numarray_argument(arguments)))
+
+def builtin_numarray_at(arguments):
+    numarray = _numarray_argument(arguments)
+    index = arguments.arguments[1].extract_value()
+
+    return _numarray_call(arguments, numarray.at, index)
+
+def builtin_numarray_set(arguments):
+    numarray = _numarray_argument(arguments)
+    index = arguments.arguments[1].extract_value()
+    value = arguments.arguments[2].extract_value()
+
+    _numarray_call(arguments, numarray.set, index, value)
+
+    return BasicValue(numarray)
+
+def builtin_numarray_fill(arguments):
+    numarray = _numarray_argument(arguments)
+    value = arguments.arguments[1].extract_value()
+
+    _numarray_call(arguments, numarray.fill, value)
+
+    return BasicValue(numarray)
+
+def builtin_numarray_slice(arguments):
+    numarray = _numarray_argument(arguments)
+    start = arguments.arguments[1].extract_value()
+    stop = arguments.arguments[2].extract_value()
+
+    return _numarray_call(arguments, numarray.slice, start, stop)
+
+def builtin_numarray_to_array(arguments):
+    return BasicValue(_numarray_argument(arguments).to_list())
+
+def builtin_numarray_to_str(arguments):
+    return BasicValue(str(_numarray_argument(arguments).to_list()))
+
+def builtin_numarray_sum(arguments):
+    return _numarray_call(arguments, _numarray_argument(arguments).sum)
+
+def builtin_numarray_min(arguments):
+    return _numarray_call(arguments, _numarray_argument(arguments).min)
+
+def builtin_numarray_max(arguments):
+    return _numarray_call(arguments, _numarray_argument(arguments).max)
+
+def builtin_numarray_mean(arguments):
+    return _numarray_call(arguments, _numarray_argument(arguments).mean)
+
+def _numarray_binary(arguments, op_name):
+    numarray = _numarray_argument(arguments)
+    other = numeric_operand(arguments.interpreter, arguments.node, arguments.arguments[1])
+
+    return _numarray_call(arguments, numarray.binary_op, op_name, other)
+
+def builtin_numarray_add(arguments):
+    return _numarray_binary(arguments, 'add')
+
+def builtin_numarray_sub(arguments):
+    return _numarray_binary(arguments, 'sub')
+
+def builtin_numarray_mul(arguments):
+    return _numarray_binary(arguments, 'mul')
+
+def builtin_numarray_div(arguments):
+    return _numarray_binary(arguments, 'div')
+
+def builtin_numarray_mod(arguments):
+    return _numarray_binary(arguments, 'mod')
+
+def builtin_numarray_lt(arguments):
+    return _numarray_binary(arguments, 'lt')
+
+def builtin_numarray_lte(arguments):
+    return _numarray_binary(arguments, 'lte')
+
+def builtin_numarray_gt(arguments):
+    return _numarray_binary(arguments, 'gt')
+
+def builtin_numarray_gte(arguments):
+    return _numarray_binary(arguments, 'gte')
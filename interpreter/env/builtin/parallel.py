@@ -0,0 +1,101 @@
+from interpreter.basic_value import BasicValue
+from interpreter.marshalling import to_peach, to_peach_element, from_peach_copy
+from parser.node import NodeFunctionExpression
+from parser.source_location import SourceLocation
+from error import ErrorType, InterpreterError
+
+from concurrent.futures import ProcessPoolExecutor
+
+import math
+import os
+import threading
+
+# chunks per worker when no chunk size is given; more than one so a slow
+# chunk doesn't leave the other workers idle at the end
+CHUNKS_PER_WORKER = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# set in each worker process by _init_worker
+_worker_runtime = None
+
+def _init_worker():
+    from interpreter.runtime import Runtime
+
+    global _worker_runtime
+    _worker_runtime = Runtime()
+
+def _run_chunk(function_node, items):
+    # runs in a worker; each chunk gets a fresh copy of the std library
+    interpreter = _worker_runtime.new_interpreter(SourceLocation(function_node.filename))
+
+    try:
+        return [
+            from_peach_copy(interpreter.call_value(function_node, None, [to_peach(item)], function_node))
+            for item in items
+        ]
+    finally:
+        interpreter.output.flush(sync=True)
+
+def worker_count():
+    return os.cpu_count() or 1
+
+def _worker_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=worker_count(), initializer=_init_worker)
+
+        return _pool
+
+def builtin_parallel_map(arguments):
+    interpreter = arguments.interpreter
+    node = arguments.node
+
+    values = arguments.arguments[0].extract_value()
+    function_node = BasicValue(arguments.arguments[1]).extract_value()
+    chunk_size = arguments.arguments[2].extract_value()
+
+    if not isinstance(values, list):
+        interpreter.error(node, ErrorType.TypeError, 'parallel.map expects an array, got {}'.format(values))
+        return None
+
+    if not isinstance(function_node, NodeFunctionExpression):
+        interpreter.error(node, ErrorType.TypeError, 'parallel.map expects a function, got {}'.format(function_node))
+        return None
+
+    if len(values) == 0:
+        return BasicValue([])
+
+    if chunk_size <= 0:
+        chunk_size = math.ceil(len(values) / (worker_count() * CHUNKS_PER_WORKER))
+
+    try:
+        items = [from_peach_copy(value) for value in values]
+    except TypeError as e:
+        interpreter.error(node, ErrorType.TypeError, 'parallel.map: {}'.format(e))
+        return None
+
+    pool = _worker_pool()
+    futures = [
+        pool.submit(_run_chunk, function_node, items[start:start + chunk_size])
+        for start in range(0, len(items), chunk_size)
+    ]
+
+    results = []
+
+    for future in futures:
+        try:
+            results.extend(future.result())
+        except InterpreterError:
+            # the worker printed the error itself
+            interpreter.error(node, ErrorType.WorkerError, 'parallel.map: the function failed in a worker process')
+        except Exception as e:
+            interpreter.error(node, ErrorType.WorkerError, 'parallel.map: {}'.format(e))
+
+    return BasicValue([to_peach_element(result) for result in results])
+
+def builtin_parallel_workers(arguments):
+    return BasicValue(worker_count())
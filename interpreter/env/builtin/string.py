@@ -0,0 +1,75 @@
+from interpreter.basic_value import BasicValue
+from error import ErrorType
+from functools import lru_cache
+
+@lru_cache(maxsize=256)
+def compile_format(format_str):
+    # split once per format string; placeholders sit between the segments
+    return tuple(format_str.split('%'))
+
+def builtin_str_to_int(arguments):
+    str_value = str(arguments.arguments[0].extract_value())
+
+    digits = str_value.lstrip('-')
+    negative = (len(str_value) - len(digits)) % 2
+
+    if len(digits) == 0:
+        return BasicValue(0)
+
+    for ch in digits:
+        if ch not in '0123456789':
+            # not fatal, as before the builtin; goes wherever print does
+            arguments.interpreter.output.write("Error: Non-integer character in string\n")
+            return BasicValue(0)
+
+    value = int(digits)
+
+    if negative:
+        return BasicValue(-value)
+
+    return BasicValue(value)
+
+def builtin_str_reverse(arguments):
+    str_value = str(arguments.arguments[0].extract_value())
+
+    return BasicValue(str_value[::-1])
+
+def builtin_str_repeat(arguments):
+    str_value = str(arguments.arguments[0].extract_value())
+    times = int(arguments.arguments[1].extract_value())
+
+    return BasicValue(str_value * max(times, 0))
+
+def builtin_str_find(arguments):
+    str_value = str(arguments.arguments[0].extract_value())
+    value = arguments.arguments[1].extract_value()
+
+    if not isinstance(value, str):
+        return BasicValue(-1)
+
+    return BasicValue(str_value.find(value))
+
+def builtin_str_format(arguments):
+    from interpreter.env.builtins import obj_to_string
+
+    interpreter = arguments.interpreter
+    node = arguments.node
+
+    if len(arguments.arguments) == 0:
+        interpreter.error(node, ErrorType.ArgumentError, 'Str.format expects a format string')
+        return None
+
+    segments = compile_format(str(obj_to_string(interpreter, node, arguments.arguments[0])))
+    format_args = arguments.arguments[1:]
+
+    if len(format_args) < len(segments) - 1:
+        interpreter.error(node, ErrorType.ArgumentError, 'Str.format expected {} arguments, {} given'.format(len(segments) - 1, len(format_args)))
+        return None
+
+    parts = [segments[0]]
+
+    for index in range(1, len(segments)):
+        parts.append(str(obj_to_string(interpreter, node, format_args[index - 1])))
+        parts.append(segments[index])
+
+    return BasicValue(''.join(parts))
@@ -5,9 +5,18 @@ import time
 
 def builtin_time_sleep(arguments):
     length = arguments.arguments[0].extract_value()
-    time.sleep(int(length))
+    bridge = arguments.interpreter.async_bridge
+
+    # under eval_async, other tasks on the event loop run meanwhile
+    if bridge is not None:
+        bridge.sleep(int(length))
+    else:
+        time.sleep(int(length))
     return BasicValue(length)
     
 def builtin_time_now(arguments):
     time_epoch = time.mktime(datetime.today().timetuple())
     return BasicValue(time_epoch)
+
+def builtin_time_clock(arguments):
+    return BasicValue(time.perf_counter())
@@ -2,13 +2,146 @@ from interpreter.typing.basic_type import BasicType
 from interpreter.basic_object import BasicObject
 from interpreter.basic_value import BasicValue
 from interpreter.function import BuiltinFunction
+from interpreter.str_rope import StrRope
+from interpreter.iterator import NativeIterator
 from interpreter.env.builtin.arith import *
 from interpreter.env.builtin.time import *
+from interpreter.env.builtin.string import *
+from interpreter.env.builtin.math import *
+from interpreter.env.builtin.numarray import *
+from interpreter.env.builtin.file import *
+from interpreter.env.builtin.parallel import *
 from parser.node import NodeFunctionExpression, NodeCall, NodeArgumentList, NodeMemberExpression, NodeNone
 from error import ErrorType
 from util import LogColour
 
+import itertools
+
+# raw values of these types are printed without boxing them, as long as
+# the instance `to_str` of their PEACH type is still the builtin one
+NATIVE_TO_STR_TYPES = {
+    int: 'Int',
+    float: 'Float',
+    str: 'Str',
+    StrRope: 'Str',
+    list: 'Array'
+}
+
+def _function_callback(value):
+    value = BasicValue(value).extract_value()
+
+    if isinstance(value, BuiltinFunction):
+        return value.callback
+
+    return None
+
+def _native_to_str(interpreter, value_type):
+    type_name = NATIVE_TO_STR_TYPES.get(value_type)
+
+    if type_name is None:
+        return None
+
+    type_info = interpreter.global_scope.find_variable_info(type_name)
+
+    if type_info is None:
+        return None
+
+    type_object = type_info.value_wrapper.extract_basicvalue()
+
+    if not isinstance(type_object, BasicObject):
+        return None
+
+    instance = type_object.members.get('instance')
+
+    if not isinstance(instance, BasicObject) or BasicType.REPR_FUNCTION_NAME not in instance.members:
+        return None
+
+    callback = _function_callback(instance.members[BasicType.REPR_FUNCTION_NAME])
+
+    if callback is builtin_primitive_to_str or callback is builtin_array_to_str:
+        return callback
+
+    return None
+
+def _array_value(obj):
+    # the list inside a boxed Array that still renders with the builtin
+    meth = obj.lookup_member(BasicType.REPR_FUNCTION_NAME)
+
+    if meth is None or _function_callback(meth.value) is not builtin_array_to_str:
+        return None
+
+    member = obj.lookup_member('_value')
+
+    if member is None:
+        return None
+
+    value = BasicValue(member.value).extract_value()
+
+    if not isinstance(value, list):
+        return None
+
+    return value
+
+def render_array(interpreter, node, values):
+    # iterative so deeply nested arrays don't recurse; an array that
+    # contains itself is shown as [...]
+    renderers = {}
+    parts = ['[']
+    active = {id(values)}
+    frames = [(values, 0)]
+
+    while len(frames) > 0:
+        (items, index) = frames.pop()
+
+        if index == len(items):
+            parts.append(']')
+            active.discard(id(items))
+            continue
+
+        if index > 0:
+            parts.append(', ')
+
+        frames.append((items, index + 1))
+
+        item = BasicValue(items[index]).extract_value()
+
+        if isinstance(item, BasicObject):
+            nested = _array_value(item)
+
+            if nested is not None:
+                item = nested
+
+        item_type = type(item)
+
+        if item_type not in renderers:
+            renderers[item_type] = _native_to_str(interpreter, item_type)
+
+        renderer = renderers[item_type]
+
+        if renderer is builtin_array_to_str:
+            if id(item) in active:
+                parts.append('[...]')
+            else:
+                parts.append('[')
+                active.add(id(item))
+                frames.append((item, 0))
+        elif renderer is builtin_primitive_to_str:
+            parts.append(str(item))
+        else:
+            parts.append(str(obj_to_string(interpreter, node, items[index])))
+
+    return ''.join(parts)
+
 def obj_to_string(interpreter, node, obj):
+    value = BasicValue(obj).extract_value()
+    renderer = _native_to_str(interpreter, type(value))
+
+    if renderer is builtin_primitive_to_str:
+        return str(value)
+
+    if renderer is builtin_array_to_str:
+        return render_array(interpreter, node, value)
+
     obj_str = str(obj)
 
     obj = interpreter.basic_value_to_object(node, obj)
@@ -35,7 +168,7 @@ def obj_to_string(interpreter, node, obj):
     return obj_str
 
 def _print_object(interpreter, node, obj, end='\n'):
-    print(obj_to_string(interpreter, node, obj), end=end)
+    interpreter.output.write(str(obj_to_string(interpreter, node, obj)) + end)
     
 def builtin_varinfo(arguments):
     interpreter = arguments.interpreter
@@ -70,25 +203,50 @@ def builtin_printn(arguments):
 
     return BasicValue(len(arguments.arguments))
 
+PRINT_COLORS = {
+    0: LogColour.Default,
+    1: LogColour.Error,
+    2: LogColour.Warning,
+    3: LogColour.Info,
+    4: LogColour.Bold
+}
+
 def builtin_print_color(arguments):
     color = arguments.arguments[0].extract_value()
-    if color == 0:
-        print(f"{LogColour.Default}", end="")
-    elif color == 1:
-        print(f"{LogColour.Error}", end="")
-    elif color == 2:
-        print(f"{LogColour.Warning}", end="")
-    elif color == 3:
-        print(f"{LogColour.Info}", end="")
-    elif color == 4:
-        print(f"{LogColour.Bold}", end="")
+
+    if color in PRINT_COLORS:
+        arguments.interpreter.output.write(PRINT_COLORS[color])
+
+    return BasicValue(0)
+
+def builtin_console_flush(arguments):
+    arguments.interpreter.output.flush(sync=True)
+
+    return BasicValue(0)
+
+def builtin_console_set_buffering(arguments):
+    interpreter = arguments.interpreter
+    mode = arguments.arguments[0].extract_value()
+    size = arguments.arguments[1].extract_value()
+
+    # 0 keeps the current buffer size
+    if size == 0:
+        size = None
+
+    try:
+        interpreter.output.set_policy(mode, size)
+    except ValueError as e:
+        interpreter.error(arguments.node, ErrorType.ArgumentError, str(e))
+        return None
+
     return BasicValue(0)
-    
 
 def builtin_exit(arguments):
     interpreter = arguments.interpreter
     node        = arguments.node
     return_code = arguments.arguments[0]
+
+    interpreter.output.flush(sync=True)
     
     exit(return_code)
     
@@ -135,6 +293,12 @@ def builtin_to_float(arguments):
     return BasicValue(float(arguments.arguments[0].extract_value()))
 
 def builtin_str_len(arguments):
+    str_value = arguments.arguments[0].extract_basicvalue().value
+
+    # a rope knows its length without being flattened
+    if isinstance(str_value, StrRope):
+        return BasicValue(len(str_value))
+
     return BasicValue(len(str(arguments.arguments[0].extract_value())))
 
 def builtin_array_len(arguments):
@@ -164,6 +328,192 @@ def builtin_array_at(arguments):
 
     return BasicValue(obj[index])
     
+def _call_callback(interpreter, node, callback, args):
+    if type(callback) is BasicValue:
+        callback = callback.extract_value()
+
+    if isinstance(callback, BuiltinFunction):
+        return interpreter.call_builtin_function(callback, None, args, node)
+
+    if not isinstance(callback, NodeFunctionExpression):
+        interpreter.error(node, ErrorType.TypeError, 'invalid callback {}: expected a function'.format(callback))
+        return None
+
+    for i in range(0, len(callback.argument_list.arguments)):
+        if i >= len(args):
+            interpreter.stack.push(BasicValue(None))
+        else:
+            interpreter.stack.push(args[i])
+
+    interpreter.call_function_expression(callback)
+
+    return interpreter.stack.pop()
+
+def iterate_range(interpreter, node, range_object):
+    bounds = []
+
+    for member_name in ('_start', '_end', '_step'):
+        member = range_object.lookup_member(member_name)
+        value = None
+
+        if member is not None:
+            value = BasicValue(member.value).extract_value()
+
+        if type(value) not in (int, float):
+            interpreter.error(node, ErrorType.TypeError, 'cannot iterate Range: {} must be a number, got {}'.format(member_name, value))
+            return
+
+        bounds.append(value)
+
+    (index, end, step) = bounds
+    # Int and Float arithmetic keep the type of the left hand side
+    index_type = type(index)
+
+    while index != end:
+        yield BasicValue(index)
+
+        index = index_type(index + step)
+
+def _native_member(interpreter, node, obj, expected_type, description):
+    member = obj.lookup_member('_value')
+    value = None
+
+    if member is not None:
+        value = BasicValue(member.value).extract_value()
+
+    if not isinstance(value, expected_type):
+        interpreter.error(node, ErrorType.TypeError, 'cannot iterate {}: expected {}'.format(value, description))
+        return None
+
+    return value
+
+def iterate_array(interpreter, node, array_object):
+    values = _native_member(interpreter, node, array_object, (list, str), 'an array value')
+
+    for index in range(0, len(values)):
+        yield BasicValue(values[index])
+
+def iterate_iterator(interpreter, node, iterator_object):
+    for value in _native_member(interpreter, node, iterator_object, NativeIterator, 'an iterator'):
+        yield value
+
+def _iterate_with_callback(arguments, iterator):
+    interpreter = arguments.interpreter
+    node = arguments.node
+    callback = arguments.arguments[0]
+
+    result = BasicValue(None)
+
+    for value in iterator(interpreter, node, arguments.this_object):
+        result = _call_callback(interpreter, node, callback, [value])
+
+    return result
+
+def builtin_range_iterate(arguments):
+    return _iterate_with_callback(arguments, iterate_range)
+
+def builtin_array_iterate(arguments):
+    return _iterate_with_callback(arguments, iterate_array)
+
+def builtin_iterator_iterate(arguments):
+    return _iterate_with_callback(arguments, iterate_iterator)
+
+def builtin_numarray_iterate(arguments):
+    return _iterate_with_callback(arguments, iterate_numarray)
+
+def builtin_file_iterate(arguments):
+    return _iterate_with_callback(arguments, iterate_file)
+
+def builtin_mapped_iterate(arguments):
+    return _iterate_with_callback(arguments, iterate_mapped)
+
+# `for` loops over an object whose __iterate__ is one of these builtins
+# skip the callback and run the block directly over the generator
+NATIVE_ITERATORS = {
+    builtin_range_iterate: iterate_range,
+    builtin_array_iterate: iterate_array,
+    builtin_iterator_iterate: iterate_iterator,
+    builtin_numarray_iterate: iterate_numarray,
+    builtin_file_iterate: iterate_file,
+    builtin_mapped_iterate: iterate_mapped
+}
+
+def builtin_range_iter(arguments):
+    return BasicValue(NativeIterator(iterate_range(arguments.interpreter, arguments.node, arguments.this_object)))
+
+def builtin_array_iter(arguments):
+    return BasicValue(NativeIterator(iterate_array(arguments.interpreter, arguments.node, arguments.this_object)))
+
+def builtin_numarray_iter(arguments):
+    return BasicValue(NativeIterator(iterate_numarray(arguments.interpreter, arguments.node, arguments.this_object)))
+
+def _iterator_argument(arguments, index=0):
+    iterator = arguments.arguments[index].extract_value()
+
+    # boxed Iterator instances keep the native iterator in `_value`
+    if isinstance(iterator, BasicObject):
+        member = iterator.lookup_member('_value')
+
+        if member is not None:
+            iterator = BasicValue(member.value).extract_value()
+
+    if not isinstance(iterator, NativeIterator):
+        arguments.interpreter.error(arguments.node, ErrorType.TypeError, 'expected an Iterator, got {}'.format(iterator))
+        return None
+
+    return iterator
+
+def builtin_iterator_next(arguments):
+    iterator = _iterator_argument(arguments)
+
+    # exhausted iterators yield null; use has_next() to tell the two apart
+    return BasicValue(next(iterator, None))
+
+def builtin_iterator_has_next(arguments):
+    iterator = _iterator_argument(arguments)
+
+    return BasicValue(int(iterator.has_next()))
+
+def builtin_iterator_map(arguments):
+    interpreter = arguments.interpreter
+    node = arguments.node
+    iterator = _iterator_argument(arguments)
+    callback = arguments.arguments[1]
+
+    return BasicValue(NativeIterator(
+        _call_callback(interpreter, node, callback, [value]) for value in iterator
+    ))
+
+def builtin_iterator_filter(arguments):
+    interpreter = arguments.interpreter
+    node = arguments.node
+    iterator = _iterator_argument(arguments)
+    callback = arguments.arguments[1]
+
+    return BasicValue(NativeIterator(
+        value for value in iterator
+        if interpreter.check_object_truthy(node, _call_callback(interpreter, node, callback, [value]))
+    ))
+
+def builtin_iterator_take(arguments):
+    iterator = _iterator_argument(arguments)
+    count = arguments.arguments[1].extract_value()
+
+    return BasicValue(NativeIterator(itertools.islice(iterator, max(int(count), 0))))
+
+def builtin_iterator_zip(arguments):
+    iterator = _iterator_argument(arguments)
+    other = _iterator_argument(arguments, 1)
+
+    return BasicValue(NativeIterator(
+        BasicValue([lhs, rhs]) for (lhs, rhs) in zip(iterator, other)
+    ))
+
+def builtin_iterator_to_array(arguments):
+    iterator = _iterator_argument(arguments)
+
+    return BasicValue(list(iterator))
+
 def builtin_array_append(arguments):
     interpreter = arguments.interpreter
     this_object = arguments.this_object
@@ -184,11 +534,15 @@ def builtin_str_append(arguments):
 
     str_value_start = arguments.arguments[0]
 
-    str_value = str(str_value_start.extract_value())
+    # keep an existing rope as-is so appending to it stays amortized O(1)
+    str_value = str_value_start.extract_basicvalue().value
+
+    if not isinstance(str_value, StrRope):
+        str_value = str(str_value_start.extract_value())
 
     if len(arguments.arguments) > 1:
         for arg in arguments.arguments[1:]:
-            str_value = str_value + str(arg.extract_value())
+            str_value = StrRope.concat(str_value, str(arg.extract_value()))
 
     return BasicValue(str_value)
 
@@ -318,6 +672,21 @@ def builtin_value_to_str(arguments):
 
     return BasicValue(str(passed_arg))
 
+def builtin_primitive_to_str(arguments):
+    member = arguments.this_object.lookup_member('_value')
+
+    return BasicValue(str(BasicValue(member.value).extract_value()))
+
+def builtin_array_to_str(arguments):
+    interpreter = arguments.interpreter
+    member = arguments.this_object.lookup_member('_value')
+    value = BasicValue(member.value).extract_value()
+
+    if not isinstance(value, list):
+        return BasicValue(str(value))
+
+    return BasicValue(render_array(interpreter, arguments.node, value))
+
 def builtin_num_to_str(arguments):
     return builtin_value_to_str(arguments)
 
@@ -366,37 +735,17 @@ def builtin_type_to_str(arguments):
     return BasicValue(repr(this_object))
 
 def builtin_console_input(arguments):
-    input_result = input()
-
-    return BasicValue(input_result)
-
-def builtin_file_read(arguments):
-    interpreter = arguments.interpreter
-    this_object = arguments.this_object
-
-    file_path = arguments.arguments[0]
-
-    # TODO better exception handling - throw internal exception
-    try:
-        f = open(file_path.extract_value(), 'r')
-        s = f.read()
-    except:
-        s = ""
-
-    return BasicValue(s)
-
-def builtin_file_write(arguments):
-    interpreter = arguments.interpreter
-    this_object = arguments.this_object
+    # a prompt written with io.write must be visible before blocking
+    arguments.interpreter.output.flush(sync=True)
 
-    file_path = arguments.arguments[0]
-    write_value = arguments.arguments[1]
+    bridge = arguments.interpreter.async_bridge
 
-    f = open(file_path.extract_value(), 'w')
-    f.write(str(write_value.extract_value()))
-    f.close()
+    if bridge is not None:
+        input_result = bridge.read_line()
+    else:
+        input_result = input()
 
-    return BasicValue(file_path)
+    return BasicValue(input_result)
 
 def builtin_func_call(arguments):
     interpreter = arguments.interpreter
@@ -420,36 +769,6 @@ def builtin_func_call(arguments):
 
     return basic_value_resp
 
-def builtin_math_max(arguments):
-    interpreter = arguments.interpreter
-    this_object = arguments.this_object
-    node = arguments.node
-
-    values = []
-
-    for arg in arguments.arguments:
-        v = arg.extract_value()
-        values.append(v)
-
-    max_value = max(values)
-
-    return BasicValue(max_value)
-
-def builtin_math_min(arguments):
-    interpreter = arguments.interpreter
-    this_object = arguments.this_object
-    node = arguments.node
-
-    values = []
-
-    for arg in arguments.arguments:
-        v = arg.extract_value()
-        values.append(v)
-
-    min_value = min(values)
-
-    return BasicValue(min_value)
-
 def builtin_macro_expand(arguments):
     from lexer import Lexer
     from parser.parser import Parser
@@ -49,9 +49,23 @@ class Globals:
             ('__intern_object_patch__', VariableType.Function, BuiltinFunction("__intern_object_patch__", None, builtin_object_patch)),
             ('__intern_math_max__', VariableType.Function, BuiltinFunction("__intern_math_max__", None, builtin_math_max)),
             ('__intern_math_min__', VariableType.Function, BuiltinFunction("__intern_math_min__", None, builtin_math_min)),
+            ('__intern_math_clamp__', VariableType.Function, BuiltinFunction("__intern_math_clamp__", None, builtin_math_clamp)),
+            ('__intern_math_sqrt__', VariableType.Function, BuiltinFunction("__intern_math_sqrt__", None, builtin_math_sqrt)),
+            ('__intern_math_pow__', VariableType.Function, BuiltinFunction("__intern_math_pow__", None, builtin_math_pow)),
+            ('__intern_math_floor__', VariableType.Function, BuiltinFunction("__intern_math_floor__", None, builtin_math_floor)),
+            ('__intern_math_ceil__', VariableType.Function, BuiltinFunction("__intern_math_ceil__", None, builtin_math_ceil)),
+            ('__intern_math_abs__', VariableType.Function, BuiltinFunction("__intern_math_abs__", None, builtin_math_abs)),
+            ('__intern_math_sin__', VariableType.Function, BuiltinFunction("__intern_math_sin__", None, builtin_math_sin)),
+            ('__intern_math_cos__', VariableType.Function, BuiltinFunction("__intern_math_cos__", None, builtin_math_cos)),
+            ('__intern_math_tan__', VariableType.Function, BuiltinFunction("__intern_math_tan__", None, builtin_math_tan)),
+            ('__intern_math_atan__', VariableType.Function, BuiltinFunction("__intern_math_atan__", None, builtin_math_atan)),
+            ('__intern_math_exp__', VariableType.Function, BuiltinFunction("__intern_math_exp__", None, builtin_math_exp)),
+            ('__intern_math_log__', VariableType.Function, BuiltinFunction("__intern_math_log__", None, builtin_math_log)),
             ('__intern_print__', VariableType.Function, BuiltinFunction("__intern_print__", None, builtin_printn)),
             ('__intern_console_write__', VariableType.Function, BuiltinFunction("__intern_console_write__", None, builtin_console_write)),
             ('__intern_print_color__', VariableType.Function, BuiltinFunction("__intern_print_color__", None, builtin_print_color)),
+            ('__intern_console_flush__', VariableType.Function, BuiltinFunction("__intern_console_flush__", None, builtin_console_flush)),
+            ('__intern_console_set_buffering__', VariableType.Function, BuiltinFunction("__intern_console_set_buffering__", None, builtin_console_set_buffering)),
             ('__intern_type_compare__', VariableType.Function, BuiltinFunction("__intern_type_compare__", None, builtin_type_compare)),
             ('__intern_default_compare__', VariableType.Function, BuiltinFunction("__intern_default_compare__", None, builtin_default_compare)),
             ('__intern_int_negate__', VariableType.Function, BuiltinFunction("__intern_int_negate__", None, builtin_int_negate)),
@@ -60,18 +74,80 @@ class Globals:
             ('__intern_to_int__', VariableType.Function, BuiltinFunction("__intern_to_int__", None, builtin_to_int)),
             ('__intern_to_float__', VariableType.Function, BuiltinFunction("__intern_to_float__", None, builtin_to_float)),
             ('__intern_num_to_str__', VariableType.Function, BuiltinFunction("__intern_num_to_str__", None, builtin_num_to_str)),
+            ('__intern_primitive_to_str__', VariableType.Function, BuiltinFunction("__intern_primitive_to_str__", None, builtin_primitive_to_str)),
+            ('__intern_array_to_str__', VariableType.Function, BuiltinFunction("__intern_array_to_str__", None, builtin_array_to_str)),
             ('__intern_str_len__', VariableType.Function, BuiltinFunction("__intern_str_len__", None, builtin_str_len)),
             ('__intern_str_append__', VariableType.Function, BuiltinFunction("__intern_str_append__", None, builtin_str_append)),
+            ('__intern_str_to_int__', VariableType.Function, BuiltinFunction("__intern_str_to_int__", None, builtin_str_to_int)),
+            ('__intern_str_reverse__', VariableType.Function, BuiltinFunction("__intern_str_reverse__", None, builtin_str_reverse)),
+            ('__intern_str_repeat__', VariableType.Function, BuiltinFunction("__intern_str_repeat__", None, builtin_str_repeat)),
+            ('__intern_str_find__', VariableType.Function, BuiltinFunction("__intern_str_find__", None, builtin_str_find)),
+            ('__intern_str_format__', VariableType.Function, BuiltinFunction("__intern_str_format__", None, builtin_str_format)),
 
             ('__intern_array_len__', VariableType.Function, BuiltinFunction("__intern_array_len__", None, builtin_array_len)),
             ('__intern_array_at__', VariableType.Function, BuiltinFunction("__intern_array_at__", None, builtin_array_at)),
             ('__intern_array_append__', VariableType.Function, BuiltinFunction("__intern_array_append__", None, builtin_array_append)),
             ('__intern_array_set__', VariableType.Function, BuiltinFunction("__intern_array_set__", None, builtin_array_set)),
             ('__intern_array_clone__', VariableType.Function, BuiltinFunction("__intern_array_clone__", None, builtin_array_clone)),
+            ('__intern_array_iterate__', VariableType.Function, BuiltinFunction("__intern_array_iterate__", None, builtin_array_iterate)),
+            ('__intern_range_iterate__', VariableType.Function, BuiltinFunction("__intern_range_iterate__", None, builtin_range_iterate)),
+            ('__intern_array_iter__', VariableType.Function, BuiltinFunction("__intern_array_iter__", None, builtin_array_iter)),
+            ('__intern_range_iter__', VariableType.Function, BuiltinFunction("__intern_range_iter__", None, builtin_range_iter)),
+            ('__intern_iterator_iterate__', VariableType.Function, BuiltinFunction("__intern_iterator_iterate__", None, builtin_iterator_iterate)),
+            ('__intern_iterator_next__', VariableType.Function, BuiltinFunction("__intern_iterator_next__", None, builtin_iterator_next)),
+            ('__intern_iterator_has_next__', VariableType.Function, BuiltinFunction("__intern_iterator_has_next__", None, builtin_iterator_has_next)),
+            ('__intern_iterator_map__', VariableType.Function, BuiltinFunction("__intern_iterator_map__", None, builtin_iterator_map)),
+            ('__intern_iterator_filter__', VariableType.Function, BuiltinFunction("__intern_iterator_filter__", None, builtin_iterator_filter)),
+            ('__intern_iterator_take__', VariableType.Function, BuiltinFunction("__intern_iterator_take__", None, builtin_iterator_take)),
+            ('__intern_iterator_zip__', VariableType.Function, BuiltinFunction("__intern_iterator_zip__", None, builtin_iterator_zip)),
+            ('__intern_iterator_to_array__', VariableType.Function, BuiltinFunction("__intern_iterator_to_array__", None, builtin_iterator_to_array)),
+
+            ('__intern_numarray_new__', VariableType.Function, BuiltinFunction("__intern_numarray_new__", None, builtin_numarray_new)),
+            ('__intern_numarray_len__', VariableType.Function, BuiltinFunction("__intern_numarray_len__", None, builtin_numarray_len)),
+            ('__intern_numarray_at__', VariableType.Function, BuiltinFunction("__intern_numarray_at__", None, builtin_numarray_at)),
+            ('__intern_numarray_set__', VariableType.Function, BuiltinFunction("__intern_numarray_set__", None, builtin_numarray_set)),
+            ('__intern_numarray_fill__', VariableType.Function, BuiltinFunction("__intern_numarray_fill__", None, builtin_numarray_fill)),
+            ('__intern_numarray_slice__', VariableType.Function, BuiltinFunction("__intern_numarray_slice__", None, builtin_numarray_slice)),
+            ('__intern_numarray_to_array__', VariableType.Function, BuiltinFunction("__intern_numarray_to_array__", None, builtin_numarray_to_array)),
+            ('__intern_numarray_to_str__', VariableType.Function, BuiltinFunction("__intern_numarray_to_str__", None, builtin_numarray_to_str)),
+            ('__intern_numarray_sum__', VariableType.Function, BuiltinFunction("__intern_numarray_sum__", None, builtin_numarray_sum)),
+            ('__intern_numarray_min__', VariableType.Function, BuiltinFunction("__intern_numarray_min__", None, builtin_numarray_min)),
+            ('__intern_numarray_max__', VariableType.Function, BuiltinFunction("__intern_numarray_max__", None, builtin_numarray_max)),
+            ('__intern_numarray_mean__', VariableType.Function, BuiltinFunction("__intern_numarray_mean__", None, builtin_numarray_mean)),
+            ('__intern_numarray_add__', VariableType.Function, BuiltinFunction("__intern_numarray_add__", None, builtin_numarray_add)),
+            ('__intern_numarray_sub__', VariableType.Function, BuiltinFunction("__intern_numarray_sub__", None, builtin_numarray_sub)),
+            ('__intern_numarray_mul__', VariableType.Function, BuiltinFunction("__intern_numarray_mul__", None, builtin_numarray_mul)),
+            ('__intern_numarray_div__', VariableType.Function, BuiltinFunction("__intern_numarray_div__", None, builtin_numarray_div)),
+            ('__intern_numarray_mod__', VariableType.Function, BuiltinFunction("__intern_numarray_mod__", None, builtin_numarray_mod)),
+            ('__intern_numarray_lt__', VariableType.Function, BuiltinFunction("__intern_numarray_lt__", None, builtin_numarray_lt)),
+            ('__intern_numarray_lte__', VariableType.Function, BuiltinFunction("__intern_numarray_lte__", None, builtin_numarray_lte)),
+            ('__intern_numarray_gt__', VariableType.Function, BuiltinFunction("__intern_numarray_gt__", None, builtin_numarray_gt)),
+            ('__intern_numarray_gte__', VariableType.Function, BuiltinFunction("__intern_numarray_gte__", None, builtin_numarray_gte)),
+            ('__intern_numarray_iterate__', VariableType.Function, BuiltinFunction("__intern_numarray_iterate__", None, builtin_numarray_iterate)),
+            ('__intern_numarray_iter__', VariableType.Function, BuiltinFunction("__intern_numarray_iter__", None, builtin_numarray_iter)),
             
             ('__intern_console_input__', VariableType.Function, BuiltinFunction("__intern_console_input__", None, builtin_console_input)),
             ('__intern_file_read__', VariableType.Function, BuiltinFunction("__intern_file_read__", None, builtin_file_read)),
             ('__intern_file_write__', VariableType.Function, BuiltinFunction("__intern_file_write__", None, builtin_file_write)),
+            ('__intern_file_append__', VariableType.Function, BuiltinFunction("__intern_file_append__", None, builtin_file_append)),
+            ('__intern_file_open__', VariableType.Function, BuiltinFunction("__intern_file_open__", None, builtin_file_open)),
+            ('__intern_file_read_line__', VariableType.Function, BuiltinFunction("__intern_file_read_line__", None, builtin_file_read_line)),
+            ('__intern_file_read_chunk__', VariableType.Function, BuiltinFunction("__intern_file_read_chunk__", None, builtin_file_read_chunk)),
+            ('__intern_file_lines__', VariableType.Function, BuiltinFunction("__intern_file_lines__", None, builtin_file_lines)),
+            ('__intern_file_handle_write__', VariableType.Function, BuiltinFunction("__intern_file_handle_write__", None, builtin_file_handle_write)),
+            ('__intern_file_flush__', VariableType.Function, BuiltinFunction("__intern_file_flush__", None, builtin_file_flush)),
+            ('__intern_file_close__', VariableType.Function, BuiltinFunction("__intern_file_close__", None, builtin_file_close)),
+            ('__intern_file_iterate__', VariableType.Function, BuiltinFunction("__intern_file_iterate__", None, builtin_file_iterate)),
+            ('__intern_file_map__', VariableType.Function, BuiltinFunction("__intern_file_map__", None, builtin_file_map)),
+            ('__intern_mapped_len__', VariableType.Function, BuiltinFunction("__intern_mapped_len__", None, builtin_mapped_len)),
+            ('__intern_mapped_slice__', VariableType.Function, BuiltinFunction("__intern_mapped_slice__", None, builtin_mapped_slice)),
+            ('__intern_mapped_find__', VariableType.Function, BuiltinFunction("__intern_mapped_find__", None, builtin_mapped_find)),
+            ('__intern_mapped_lines__', VariableType.Function, BuiltinFunction("__intern_mapped_lines__", None, builtin_mapped_lines)),
+            ('__intern_mapped_to_str__', VariableType.Function, BuiltinFunction("__intern_mapped_to_str__", None, builtin_mapped_to_str)),
+            ('__intern_mapped_close__', VariableType.Function, BuiltinFunction("__intern_mapped_close__", None, builtin_mapped_close)),
+            ('__intern_mapped_iterate__', VariableType.Function, BuiltinFunction("__intern_mapped_iterate__", None, builtin_mapped_iterate)),
+            ('__intern_parallel_map__', VariableType.Function, BuiltinFunction("__intern_parallel_map__", None, builtin_parallel_map)),
+            ('__intern_parallel_workers__', VariableType.Function, BuiltinFunction("__intern_parallel_workers__", None, builtin_parallel_workers)),
 
             ('__intern_int_add__', VariableType.Function, BuiltinFunction("__intern_int_add__", None, builtin_int_add)),
             ('__intern_int_sub__', VariableType.Function, BuiltinFunction("__intern_int_sub__", None, builtin_int_sub)),
@@ -90,6 +166,7 @@ class Globals:
             
             ('__intern_time_sleep__', VariableType.Function, BuiltinFunction("__intern_time_sleep__", None, builtin_time_sleep)),
             ('__intern_time_now__',   VariableType.Function, BuiltinFunction("__intern_time_now__", None, builtin_time_now)),
+            ('__intern_time_clock__', VariableType.Function, BuiltinFunction("__intern_time_clock__", None, builtin_time_clock)),
 
             ('__intern_macro_expand__', VariableType.Function, BuiltinFunction("__intern_macro_expand__", None, builtin_macro_expand))
         ]
@@ -0,0 +1,232 @@
+from interpreter.basic_value import BasicValue
+from interpreter.basic_object import BasicObject
+from interpreter.typing.basic_type import BasicType
+from interpreter.function import BuiltinFunction
+from interpreter.marshalling import to_peach, from_peach
+from error import ErrorType, InterpreterError
+
+import importlib.util
+import inspect
+import os
+import threading
+
+# PEACH operator methods and the Python methods they map to
+OPERATOR_METHODS = {
+    '__add__': '__add__',
+    '__sub__': '__sub__',
+    '__mul__': '__mul__',
+    '__div__': '__truediv__',
+    '__mod__': '__mod__',
+    '__lt__': '__lt__',
+    '__lte__': '__le__',
+    '__gt__': '__gt__',
+    '__gte__': '__ge__'
+}
+
+# results of pure functions are only cached when they can't be changed
+# through the cache
+CACHEABLE_TYPES = (int, float, str, bool, type(None))
+
+# name of the PeachModule a Python file must define to be imported from PEACH
+MODULE_ATTRIBUTE = 'peach_module'
+
+class PeachModule:
+    # Python functions and classes exposed to PEACH as one object, such as
+    #
+    #   fastmath = PeachModule('fastmath')
+    #
+    #   @fastmath.function(pure=True)
+    #   def hypot(x, y):
+    #       return (x * x + y * y) ** 0.5
+    #
+    # and used from PEACH as `fastmath.hypot(3.0, 4.0)` once installed.
+    # Without a namespace, members are declared as variables of their own.
+
+    def __init__(self, name, namespace=True):
+        self.name = name
+        self.namespace = namespace
+        self.functions = {}
+        self.classes = {}
+        self.values = {}
+
+    def function(self, name=None, pure=False):
+        def register(fn):
+            self.functions[name if name is not None else fn.__name__] = (fn, pure)
+            return fn
+
+        return register
+
+    def cls(self, name=None):
+        # public methods become instance methods; `Name.new(...)` calls the
+        # Python constructor
+        def register(python_class):
+            self.classes[name if name is not None else python_class.__name__] = python_class
+            return python_class
+
+        return register
+
+    def value(self, name, value):
+        self.values[name] = value
+
+    def qualified_name(self, name):
+        if not self.namespace:
+            return name
+
+        return '{}.{}'.format(self.name, name)
+
+    def install(self, interpreter, scope=None):
+        if scope is None:
+            scope = interpreter.global_scope
+
+        type_object = interpreter.global_scope.find_variable_value('Type').extract_basicvalue()
+        binding = ExtensionBinding()
+
+        members = {}
+
+        for (name, python_class) in self.classes.items():
+            members[name] = binding.make_type(type_object, self.qualified_name(name), python_class)
+
+        for (name, (fn, pure)) in self.functions.items():
+            members[name] = binding.make_function(self.qualified_name(name), fn, pure)
+
+        for (name, value) in self.values.items():
+            members[name] = to_peach(value)
+
+        if not self.namespace:
+            for (name, value) in members.items():
+                scope.declare_variable(name, None).assign_value(value)
+
+            return None
+
+        module_object = BasicType(type_object, {'name': BasicValue(self.name), **members})
+
+        scope.declare_variable(self.name, None).assign_value(module_object)
+
+        return module_object
+
+class ExtensionBinding:
+    # converts values for the functions and classes of one installed module
+
+    def __init__(self):
+        # Python class -> PEACH type, so instances can be wrapped again
+        self.types = {}
+
+    def to_python(self, value):
+        return from_peach(value)
+
+    def to_peach(self, value):
+        type_object = self.types.get(type(value))
+
+        if type_object is not None:
+            instance = type_object.members['instance'].clone(parent_override=type_object)
+            instance.members['_value'] = BasicValue(value)
+
+            return instance
+
+        return to_peach(value)
+
+    def call(self, arguments, name, fn, python_arguments):
+        try:
+            return fn(*python_arguments)
+        except InterpreterError:
+            raise
+        except Exception as e:
+            arguments.interpreter.error(arguments.node, ErrorType.ExtensionError, '{}: {}'.format(name, e))
+
+    def make_function(self, name, fn, pure=False):
+        cache = {} if pure else None
+
+        def callback(arguments):
+            python_arguments = [self.to_python(argument) for argument in arguments.arguments]
+
+            if cache is None:
+                return self.to_peach(self.call(arguments, name, fn, python_arguments))
+
+            try:
+                # 1, 1.0 and True are equal and hash alike, but a function
+                # may well tell them apart
+                key = tuple((type(argument), argument) for argument in python_arguments)
+                hash(key)
+            except TypeError:
+                return self.to_peach(self.call(arguments, name, fn, python_arguments))
+
+            if key in cache:
+                return self.to_peach(cache[key])
+
+            result = self.call(arguments, name, fn, python_arguments)
+
+            if type(result) in CACHEABLE_TYPES:
+                cache[key] = result
+
+            return self.to_peach(result)
+
+        return BuiltinFunction(name, None, callback)
+
+    def make_method(self, name, method_name):
+        def callback(arguments):
+            this_value = self.to_python(arguments.this_object)
+            python_arguments = [self.to_python(argument) for argument in arguments.arguments]
+
+            return self.to_peach(self.call(arguments, name, getattr(this_value, method_name), python_arguments))
+
+        return BuiltinFunction(name, None, callback)
+
+    def make_type(self, type_object, name, python_class):
+        instance_members = {'_value': BasicValue(None)}
+
+        for (method_name, member) in inspect.getmembers(python_class, callable):
+            if not method_name.startswith('_'):
+                instance_members[method_name] = self.make_method('{}.{}'.format(name, method_name), method_name)
+
+        for (peach_name, python_name) in OPERATOR_METHODS.items():
+            if getattr(python_class, python_name, None) is not getattr(object, python_name, None):
+                instance_members[peach_name] = self.make_method('{}.{}'.format(name, peach_name), python_name)
+
+        def to_str(arguments):
+            return BasicValue(str(self.to_python(arguments.this_object)))
+
+        instance_members[BasicType.REPR_FUNCTION_NAME] = BuiltinFunction('{}.to_str'.format(name), None, to_str)
+
+        def new(arguments):
+            python_arguments = [self.to_python(argument) for argument in arguments.arguments]
+
+            return self.to_peach(self.call(arguments, name, python_class, python_arguments))
+
+        type_object = BasicType(type_object, {
+            'name': BasicValue(name),
+            'instance': BasicObject(members=instance_members),
+            'new': BuiltinFunction('{}.new'.format(name), None, new)
+        })
+
+        # lets from_peach unwrap instances wherever they turn up
+        type_object.python_class = python_class
+
+        self.types[python_class] = type_object
+
+        return type_object
+
+# Python files imported from PEACH, by absolute path; each one is executed
+# once per process, and installed into every interpreter that imports it
+_loaded_extensions = {}
+_loaded_extensions_lock = threading.Lock()
+
+def load_extension(filename):
+    path = os.path.abspath(filename)
+
+    # imports from several threads at once load the file only once
+    with _loaded_extensions_lock:
+        module = _loaded_extensions.get(path)
+
+        if module is None:
+            spec = importlib.util.spec_from_file_location('peach_extension_{}'.format(len(_loaded_extensions)), path)
+            python_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(python_module)
+
+            module = getattr(python_module, MODULE_ATTRIBUTE, None)
+
+            if not isinstance(module, PeachModule):
+                raise ImportError("'{}' does not define a PeachModule named `{}`".format(filename, MODULE_ATTRIBUTE))
+
+            _loaded_extensions[path] = module
+
+    return module
@@ -0,0 +1,139 @@
+from interpreter.native_value import NativeValue
+
+import io
+import mmap
+
+class FileHandle(NativeValue):
+    type_name = 'FileHandle'
+
+    MODES = {
+        'r': 'r',
+        'w': 'w',
+        'a': 'a'
+    }
+
+    def __init__(self, filename, mode, buffer_size=-1):
+        if mode not in FileHandle.MODES:
+            raise ValueError("unknown file mode '{}', expected one of r, w, a".format(mode))
+
+        self.filename = filename
+        self.mode = mode
+        # `buffer_size` only matters for writers: writes are collected in
+        # memory and reach the file once that many bytes are pending
+        self.file = open(filename, FileHandle.MODES[mode], buffering=buffer_size, newline='')
+
+    def check_open(self, reading):
+        if self.file.closed:
+            raise ValueError("file '{}' is closed".format(self.filename))
+
+        if reading and self.mode != 'r':
+            raise io.UnsupportedOperation("file '{}' was not opened for reading".format(self.filename))
+
+        if not reading and self.mode == 'r':
+            raise io.UnsupportedOperation("file '{}' was not opened for writing".format(self.filename))
+
+    def read_line(self):
+        self.check_open(True)
+
+        line = self.file.readline()
+
+        # an empty string only ever means end of file; blank lines are '\n'
+        if line == '':
+            return None
+
+        return line.rstrip('\r\n')
+
+    def read_chunk(self, size):
+        self.check_open(True)
+
+        chunk = self.file.read(size)
+
+        if chunk == '':
+            return None
+
+        return chunk
+
+    def lines(self):
+        self.check_open(True)
+
+        for line in self.file:
+            yield line.rstrip('\r\n')
+
+    def write(self, value):
+        self.check_open(False)
+
+        return self.file.write(value)
+
+    def flush(self):
+        self.check_open(False)
+
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __repr__(self):
+        return "FileHandle({}, {})".format(repr(self.filename), repr(self.mode))
+
+class MappedFile(NativeValue):
+    type_name = 'MappedFile'
+
+    def __init__(self, buffer, start, end, filename=None):
+        # `buffer` is the mmap shared by every slice of the same file
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.filename = filename
+
+    @staticmethod
+    def open(filename):
+        with open(filename, 'rb') as f:
+            size = f.seek(0, io.SEEK_END)
+
+            # mmap refuses zero length mappings
+            if size == 0:
+                return MappedFile(b'', 0, 0, filename)
+
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return MappedFile(buffer, 0, size, filename)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def slice(self, start, stop):
+        # clamped like Python slicing; shares the mapping, nothing is copied
+        (start, stop, _) = slice(start, stop).indices(len(self))
+
+        return MappedFile(self.buffer, self.start + start, self.start + max(start, stop), self.filename)
+
+    def find(self, needle, offset=0):
+        index = self.buffer.find(needle.encode('utf-8'), self.start + offset, self.end)
+
+        if index == -1:
+            return -1
+
+        return index - self.start
+
+    def lines(self):
+        position = self.start
+
+        while position < self.end:
+            newline = self.buffer.find(b'\n', position, self.end)
+
+            if newline == -1:
+                newline = self.end
+
+            yield self.buffer[position:newline].decode('utf-8').rstrip('\r')
+
+            position = newline + 1
+
+    def to_str(self):
+        return self.buffer[self.start:self.end].decode('utf-8')
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __repr__(self):
+        return "MappedFile({}, {}, {})".format(repr(self.filename), self.start, self.end)
@@ -27,6 +27,9 @@ class BuiltinFunction(Function):
     def compare_value(self, other):
         return self == other
 
+    def __deepcopy__(self, memo):
+        return self
+
     def __repr__(self):
         return "BuiltinFunction[{}]".format(self.name)
     __str__ = __repr__
@@ -0,0 +1,133 @@
+from interpreter.basic_value import BasicValue
+from interpreter.marshalling import to_peach, from_peach
+from interpreter.scope import Scope
+from parser.node import NodeVariable, NodeMemberExpression, NodeCall, NodeArgumentList, NodeFunctionExpression
+from lexer import LexerToken, TokenType
+from error import ErrorType, InterpreterError
+
+from contextlib import contextmanager
+
+class FunctionHandle:
+    # a PEACH function looked up once by name, callable from Python as often
+    # as needed without going through the lexer or parser again
+
+    def __init__(self, interpreter, name):
+        self.interpreter = interpreter
+        self.name = name
+
+        token = LexerToken(name, TokenType.Identifier)
+        parts = name.split('.')
+
+        # `a.b.c` -> the nodes the parser would have built for it
+        lhs = NodeVariable(LexerToken(parts[0], TokenType.Identifier))
+
+        for part in parts[1:]:
+            lhs = NodeMemberExpression(lhs, LexerToken(part, TokenType.Identifier), token)
+
+        # errors raised while calling point at this node
+        self.node = NodeCall(lhs, NodeArgumentList([], token))
+
+        # a name that can't be found is an error like any other call's
+        with self._recovering():
+            if isinstance(lhs, NodeMemberExpression):
+                (self.this_object, member) = interpreter.walk_member_expression(lhs)
+                self.target = member.value
+            else:
+                self.this_object = None
+                self.target = interpreter.visit(lhs)
+
+            if self.target is None:
+                interpreter.error(self.node, ErrorType.TypeError, "invalid call: '{}' is not callable".format(name))
+
+    def call(self, arguments):
+        # like __call__, but takes BasicValues and returns one
+        return self.interpreter.call_value(self.target, self.this_object, arguments, self.node)
+
+    def __call__(self, *arguments):
+        with self._recovering():
+            result = self.call([to_peach(argument) for argument in arguments])
+
+        return from_peach(result)
+
+    @contextmanager
+    def _recovering(self):
+        interpreter = self.interpreter
+        scope = interpreter._top_level_scope
+        stack_depth = len(interpreter.stack.stack)
+
+        try:
+            yield
+        except InterpreterError:
+            # the error has been printed; put the interpreter back the way
+            # it was so the next call starts clean
+            interpreter.error_list.clear_errors()
+            interpreter._top_level_scope = scope
+            del interpreter.stack.stack[stack_depth:]
+
+            raise
+        finally:
+            interpreter.output.flush(sync=True)
+
+    def call_many(self, argument_lists):
+        # a generator of results, one per list of arguments
+        with self._recovering():
+            if isinstance(self.target, NodeFunctionExpression):
+                results = self._call_function_expression_many(argument_lists)
+            else:
+                results = (self.call(arguments) for arguments in self._converted(argument_lists))
+
+            for result in results:
+                # keep PEACH output in order with whatever the caller prints
+                # between results
+                self.interpreter.output.flush()
+
+                yield from_peach(result)
+
+    def _converted(self, argument_lists):
+        for arguments in argument_lists:
+            if type(arguments) not in (list, tuple):
+                raise Exception("Arguments type is not list!")
+
+            yield [to_peach(argument) for argument in arguments]
+
+    def _call_function_expression_many(self, argument_lists):
+        interpreter = self.interpreter
+        target = self.target
+        declarations = target.argument_list.arguments
+
+        # resolve argument types once for the whole batch
+        decltypes = [
+            interpreter.visit(declaration.type_node) if declaration.type_node is not None else None
+            for declaration in declarations
+        ]
+
+        # one scope is reused for every call; it is cleared and the
+        # arguments are bound straight into it, without the stack
+        function_scope = Scope(None)
+
+        for arguments in self._converted(argument_lists):
+            if self.this_object is not None:
+                arguments = [self.this_object, *arguments]
+
+            if len(arguments) != len(declarations):
+                interpreter.error(self.node, ErrorType.ArgumentError, 'method expected {} arguments, {} given'.format(len(declarations), len(arguments)))
+
+            function_scope.variables.clear()
+
+            for (declaration, decltype, argument) in zip(declarations, decltypes, arguments):
+                if decltype is not None:
+                    interpreter.assignment_typecheck(declaration, decltype, argument)
+
+                function_scope.declare_variable(declaration.name.value, decltype).assign_value(argument)
+
+            interpreter.call_function_expression(target, function_scope)
+
+            result = interpreter.stack.pop()
+
+            if not isinstance(result, BasicValue):
+                interpreter.error(self.node, ErrorType.TypeError, 'expected method to return an instance of BasicValue, got {}'.format(result))
+
+            yield result
+
+    def __repr__(self):
+        return 'FunctionHandle({})'.format(self.name)
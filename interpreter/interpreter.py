@@ -5,13 +5,16 @@ from parser.node import *
 
 from interpreter.scope import *
 from interpreter.stack import Stack
+from interpreter.output_buffer import OutputBuffer
+from interpreter.function_handle import FunctionHandle
+from interpreter.extension import load_extension
 from interpreter.function import BuiltinFunction, BuiltinFunctionArguments
 from interpreter.typing.basic_type import BasicType
 from interpreter.basic_object import BasicObject
 from interpreter.basic_value import BasicValue
 from interpreter.env.globals import Globals
 from interpreter.variable import VariableType
-from interpreter.env.builtins import builtin_object_new, obj_to_string
+from interpreter.env.builtins import builtin_object_new, obj_to_string, NATIVE_ITERATORS, numarray_operator
 from lexer import TokenType, LexerToken
 
 from error import InterpreterError, ErrorList, ErrorType, Error
@@ -19,17 +22,51 @@ from error import InterpreterError, ErrorList, ErrorType, Error
 class ReturnJump(Exception):
     pass
 
+# binary operators that work elementwise on FloatArray/IntArray operands
+VECTOR_OPERATORS = {
+    TokenType.Plus: 'add',
+    TokenType.Minus: 'sub',
+    TokenType.Multiply: 'mul',
+    TokenType.Divide: 'div',
+    TokenType.Modulus: 'mod',
+    TokenType.LessThan: 'lt',
+    TokenType.LessThanEqual: 'lte',
+    TokenType.GreaterThan: 'gt',
+    TokenType.GreaterThanEqual: 'gte',
+    TokenType.Compare: 'eql',
+    TokenType.NotCompare: 'noteql'
+}
+
 class Interpreter():
-    def __init__(self, source_location):
+    def __init__(self, source_location, global_scope=None):
         self.source_location = source_location
         self.error_list = ErrorList()
         # declare scopes + global scope
         self.stack = Stack()
         
-        self.global_scope = Scope(None)
         self._top_level_scope = None
 
-        Globals().apply_to_scope(self.global_scope)
+        # print/io.write go through here rather than straight to stdout
+        self.output = OutputBuffer()
+
+        # set while a Profiler is attached, see Profiler.start()
+        self.profiler = None
+        # set while InterpreterStats are attached, see InterpreterStats.attach()
+        self.stats = None
+        # set once something needs to run every so many steps, see StepCounter
+        self.step_counter = None
+        # set when running under Peach.eval_async, see AsyncBridge
+        self.async_bridge = None
+        # set while ExecutionLimits are attached, see ExecutionLimits.attach()
+        self.limits = None
+
+        # a global scope copied from a Runtime already has the globals and
+        # the std library in it
+        if global_scope is None:
+            global_scope = Scope(None)
+            Globals().apply_to_scope(global_scope)
+
+        self.global_scope = global_scope
 
     @property
     def current_scope(self):
@@ -54,8 +91,11 @@ class Interpreter():
         if node is not None:
             location = node.location
 
+        # errors go after whatever the script printed so far, to the same
+        # stream, and are visible right away
         self.error_list.push_error(Error(type, location, message, self.source_location.filename))
-        self.error_list.print_errors()
+        self.error_list.print_errors(self.output)
+        self.output.flush(sync=True)
 
         raise InterpreterError('Interpreter error')
         
@@ -140,15 +180,34 @@ class Interpreter():
             funstr = '__eql__'
         elif node.token.type == TokenType.NotCompare:
             funstr = '__noteql__'
+
+        left = node.left
+        right = node.right
+
+        if node.token.type in VECTOR_OPERATORS:
+            left = self.visit(left)
+            right = self.visit(right)
+
+            result = numarray_operator(self, node, VECTOR_OPERATORS[node.token.type], left, right)
+
+            if result is not None:
+                return result
+
+            # already evaluated; visiting a BasicValue gives it back as is
+            if not isinstance(left, BasicValue):
+                left = BasicValue(left)
+
+            if not isinstance(right, BasicValue):
+                right = BasicValue(right)
             
         member_access_call_node = NodeCall(
             NodeMemberExpression(
-                node.left,
+                left,
                 LexerToken(funstr, TokenType.Identifier),
                 node.token
             ),
             NodeArgumentList(
-                [node.right],
+                [right],
                 node.token
             )
         )
@@ -175,6 +234,10 @@ class Interpreter():
         # acts like a block and visits the statements inside. This means that if we
         # import inside a function, any variables should only be available to that
         # scope.
+        if node.extension_path is not None:
+            self.import_extension(node)
+            return
+
         old_source_location = self.source_location
         self.source_location = node.source_location
 
@@ -183,6 +246,15 @@ class Interpreter():
 
         self.source_location = old_source_location
     
+    def import_extension(self, node):
+        try:
+            module = load_extension(node.extension_path)
+        except Exception as e:
+            self.error(node, ErrorType.ExtensionError, "could not load extension '{}': {}".format(node.extension_path, e))
+            return
+
+        module.install(self, self.current_scope)
+
     def visit_FunctionReturn(self, node):
         value = self.visit(node.value_node)
         self.stack.push(value)
@@ -299,143 +371,81 @@ class Interpreter():
 
         return collected_args
 
-    def wrap_arg_in_node(self, name, arg):
-        if type(arg) == str:
-            return NodeString(LexerToken('"{}"'.format(arg)))
-        elif type(arg) in (float, int):
-            return NodeNumber(LexerToken(str(arg)))
-        elif type(arg) == list:
-            return NodeArrayExpression(
-                map(lambda x: self.wrap_arg_in_node(name, x), arg),
-                LexerToken(name, TokenType.Identifier)
-            )
-        else:
-            raise Exception("Invalid argument {} type({}) not supported".format(arg, type(arg)))
+    def get_function(self, name):
+        return FunctionHandle(self, name)
 
     def call_function(self, name, args):
-        from peach import Peach
-
-        retval = 0
-        node_args = []
-        for arg in args:
-            node_args.append(self.wrap_arg_in_node(name, arg))
-
-        peach = Peach()
-        peach.eval(data="{};".format(name), interpret=False, default_imports=[])
-        lhs = peach.ast[0]
-        name_token = LexerToken(name, TokenType.Identifier)
-        
+        return self.get_function(name)(*args)
 
-        if isinstance(lhs, NodeMemberExpression):
-            parent, member = self.walk_member_expression(lhs)
-            target = member.value
-            node_args = [parent]+node_args
-        else:
-            target = lhs
-
-        call_node = NodeCall(
-            target,
-            NodeArgumentList(
-                node_args,
-                name_token
-            )
-        )
-        return self.visit_Call(call_node).extract_value()
-    
     def visit_Call(self, node):
         this_arg = None
-        is_member_call = False
-
         target = None
 
         # for `a.b()`, pass in `a` as the this value.
         if isinstance(node.lhs, NodeMemberExpression):
-            t, m = self.walk_member_expression(node.lhs)
-            target = m.value
-            this_arg = t
-
-            is_member_call = True
+            this_arg, member = self.walk_member_expression(node.lhs)
+            target = member.value
         else:
             target = self.visit(node.lhs)
-        return_value = 0
 
-        if target is not None:
+        if target is None:
+            self.error(node, ErrorType.TypeError, 'invalid call: {} is not callable'.format(target))
 
-            if isinstance(target, BuiltinFunction):
-                collected_args = self.collect_args(node)
-                
-                this_value = None
-                
-                if this_arg is not None:
-                    this_value = this_arg
-                
-                return self.call_builtin_function(target, this_value, collected_args, node)
-            # user-defined function
-            elif isinstance(target, NodeFunctionExpression):
-                collected_args = self.collect_args(node)
-                if is_member_call: # a.b('test') -> pass 'a' in as first argument
-                    if this_arg is not None:
-                        this_value = this_arg
-                        if this_value is not None:
-                            collected_args = [this_value, *collected_args]
-
-                expected_arg_count = len(target.argument_list.arguments)
-                given_arg_count = len(collected_args)
-
-                if expected_arg_count != given_arg_count:
-                    self.error(node, ErrorType.ArgumentError, 'method expected {} arguments, {} given'.format(expected_arg_count, given_arg_count))
-                    return None
+        return self.call_value(target, this_arg, self.collect_args(node), node)
 
-                # typecheck args
-                for i in range(0, expected_arg_count):
-                    target_arg = target.argument_list.arguments[i]
-                    call_arg = collected_args[i]
+    def call_value(self, target, this_arg, collected_args, node):
+        # calls `target` with arguments that have already been evaluated.
+        # `this_arg` is the object a member call was made on, or None
+        if isinstance(target, BuiltinFunction):
+            return self.call_builtin_function(target, this_arg, collected_args, node)
+        # user-defined function
+        elif isinstance(target, NodeFunctionExpression):
+            if this_arg is not None: # a.b('test') -> pass 'a' in as first argument
+                collected_args = [this_arg, *collected_args]
 
-                    type_node = target_arg.type_node
+            expected_arg_count = len(target.argument_list.arguments)
+            given_arg_count = len(collected_args)
 
-                    if type_node is not None:
-                        decltype = self.visit(type_node)
+            if expected_arg_count != given_arg_count:
+                self.error(node, ErrorType.ArgumentError, 'method expected {} arguments, {} given'.format(expected_arg_count, given_arg_count))
+                return None
 
-                        self.assignment_typecheck(target_arg, decltype, call_arg)
+            # typecheck args
+            for i in range(0, expected_arg_count):
+                target_arg = target.argument_list.arguments[i]
+                call_arg = collected_args[i]
 
-                # push arguments to stack
-                for arg in collected_args:
-                    self.stack.push(arg)
-                
-                self.call_function_expression(target)
-                # the return value is pushed onto the stack at end of block or return
-                # statement. Pop it off and return as a value
+                type_node = target_arg.type_node
 
-                result = self.stack.pop()
+                if type_node is not None:
+                    decltype = self.visit(type_node)
 
-                if not isinstance(result, BasicValue):
-                    self.error(node, ErrorType.TypeError, 'expected method to return an instance of BasicValue, got {}'.format(result))
-                    return None
+                    self.assignment_typecheck(target_arg, decltype, call_arg)
 
-                return result
-            else: # objects......
-                if this_arg is None:
-                    this_arg = NodeNone(node.token)
-
-                member_access_call_node = NodeCall(
-                    NodeMemberExpression(
-                        target,
-                        LexerToken('__call__', TokenType.Identifier),
-                        node.token
-                    ),
-                    NodeArgumentList(
-                        [
-                            NodeArrayExpression(
-                                [this_arg]+node.argument_list.arguments,
-                                node.token
-                            )
-                        ],
-                        node.token
-                    )
-                )
-                return self.visit(member_access_call_node)
+            # push arguments to stack
+            for arg in collected_args:
+                self.stack.push(arg)
+
+            self.call_function_expression(target)
+            # the return value is pushed onto the stack at end of block or return
+            # statement. Pop it off and return as a value
 
-        self.error(node, ErrorType.TypeError, 'invalid call: {} is not callable'.format(target))
+            result = self.stack.pop()
+
+            if not isinstance(result, BasicValue):
+                self.error(node, ErrorType.TypeError, 'expected method to return an instance of BasicValue, got {}'.format(result))
+                return None
+
+            return result
+        else: # objects......
+            # obj(a, b) -> obj.__call__([this, a, b])
+            call_object = self.basic_value_to_object(node, target)
+            call_member = call_object.lookup_member('__call__')
+
+            if call_member is None:
+                self.error(node, ErrorType.TypeError, '{} has no direct or inherited member `__call__`'.format(obj_to_string(self, node, call_object)))
+
+            return self.call_value(call_member.value, call_object, [BasicValue([this_arg, *collected_args])], node)
 
     def walk_variable(self, node):
         var = self.current_scope.find_variable_info(node.value)
@@ -453,10 +463,15 @@ class Interpreter():
 
         return None
 
-    def check_object_truthy(self, node):
+    def check_object_truthy(self, node, target=None):
+        # `target` is an already evaluated value; by default `node` itself
+        # is the expression to test
+        if target is None:
+            target = node
+
         member_access_call_node = NodeCall(
             NodeMemberExpression(
-                node,
+                target,
                 LexerToken('__bool__', TokenType.Identifier),
                 node.token
             ),
@@ -500,6 +515,18 @@ class Interpreter():
             truthy_result = self.check_object_truthy(node.expr)
 
     def visit_For(self, node):
+        iterable = self.basic_value_to_object(node, self.visit(node.expr))
+
+        # unmodified Array/Range iteration: run the block in place instead
+        # of calling back into a function per item
+        iterate_member = iterable.lookup_member('__iterate__')
+
+        if iterate_member is not None and isinstance(iterate_member.value, BuiltinFunction):
+            native_iterator = NATIVE_ITERATORS.get(iterate_member.value.callback)
+
+            if native_iterator is not None:
+                return self.run_for_block(node, native_iterator(self, node, iterable))
+
         # call __iterate__ passing in a function expression
         # as a callback for each item in the iterable.
 
@@ -510,11 +537,11 @@ class Interpreter():
             node.token
         )
         
-        fnexpr_node = NodeFunctionExpression(argument_list, node.block)
+        fnexpr_node = NodeFunctionExpression(argument_list, node.block, self.source_location.filename, 'for')
 
         member_access_call_node = NodeCall(
             NodeMemberExpression(
-                node.expr,
+                iterable,
                 LexerToken('__iterate__', TokenType.Identifier),
                 node.token
             ),
@@ -526,6 +553,29 @@ class Interpreter():
 
         self.visit(member_access_call_node)
 
+    def run_for_block(self, node, values):
+        # one scope is reused for every iteration; it is emptied before the
+        # loop variable is bound so `let` inside the block stays legal
+        self.open_scope()
+        loop_scope = self.current_scope
+        var_name = node.var_token.value
+
+        for value in values:
+            loop_scope.variables.clear()
+            loop_scope.declare_variable(var_name, None).assign_value(value)
+
+            try:
+                self.visit_Block(node.block, create_scope=False)
+            except ReturnJump:
+                # as with the __iterate__ callback, `return` only ends the
+                # current iteration; discard the value it pushed
+                while self.current_scope != loop_scope:
+                    self.close_scope()
+
+                self.stack.pop()
+
+        self.close_scope()
+
     def visit_SplatArgument(self, node):
         # get variable
         value = self.visit(node.expr)
@@ -600,12 +650,29 @@ class Interpreter():
 
         return basic_value_result
 
-    def call_function_expression(self, node):
-        # create our scope before block so argument variables are contained
-        self.open_scope()
-        function_scope = self.current_scope
-        # visit our arguments
-        self.visit(node.argument_list)
+    def call_function_expression(self, node, function_scope=None):
+        if self.profiler is None:
+            return self.run_function_expression(node, function_scope)
+
+        self.profiler.enter_function(node)
+
+        try:
+            return self.run_function_expression(node, function_scope)
+        finally:
+            self.profiler.exit_function()
+
+    def run_function_expression(self, node, function_scope=None):
+        if function_scope is None:
+            # create our scope before block so argument variables are contained
+            self.open_scope()
+            function_scope = self.current_scope
+            # visit our arguments
+            self.visit(node.argument_list)
+        else:
+            # arguments were already bound in the given scope, which may be
+            # reused across calls (see FunctionHandle.call_many)
+            function_scope.parent = self.current_scope
+            self._top_level_scope = function_scope
         # self.visit would normally be used here, but we need create_scope
         try:
             self.visit_Block(node.block, create_scope=False)
@@ -0,0 +1,34 @@
+from interpreter.native_value import NativeValue
+
+class NativeIterator(NativeValue):
+    type_name = 'Iterator'
+
+    _EMPTY = object()
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._peeked = NativeIterator._EMPTY
+
+    def has_next(self):
+        if self._peeked is NativeIterator._EMPTY:
+            try:
+                self._peeked = next(self._iterator)
+            except StopIteration:
+                return False
+
+        return True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._peeked is not NativeIterator._EMPTY:
+            value = self._peeked
+            self._peeked = NativeIterator._EMPTY
+
+            return value
+
+        return next(self._iterator)
+
+    def __repr__(self):
+        return "NativeIterator({})".format(repr(self._iterator))
@@ -0,0 +1,330 @@
+from interpreter.basic_object import BasicObject
+from interpreter.basic_value import BasicValue
+from interpreter.memory import MemoryReport
+from interpreter.step_counter import StepCounter
+from interpreter.str_rope import StrRope
+from interpreter.script_nodes import script_node_ids, innermost_script_node
+from error import ErrorType
+
+import sys
+import time
+
+class ExecutionLimits:
+    # Bounds on one evaluation: how many nodes it may visit, how many
+    # seconds it may run, how deeply the script's functions may call each
+    # other and how many bytes of PEACH values it may keep, see MemoryQuota.
+    # None leaves that bound off. Going over a bound is reported
+    # as a LimitExceeded error, which ends the evaluation. Nothing is
+    # checked for bounds that are off, and steps and time are only checked
+    # every so many steps, so a builtin that blocks (Time.sleep, io.read)
+    # isn't interrupted.
+    #
+    # Bounds are noticed at whatever node is visited next, often one inside
+    # the std library. Given the nodes parsed from the script, errors are
+    # reported at the innermost node of the script being run instead, or
+    # without a location when there is none, and only calls of functions
+    # the script defines count towards max_depth, so calls into the std
+    # library (operator methods, print) don't use it up.
+
+    def __init__(self, max_steps=None, timeout=None, max_depth=None, max_memory=None):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.max_memory = max_memory
+        self.memory = None
+        # the nodes parsed from the script, see attach
+        self.script = None
+        self._script_nodes = None
+
+        self.depth = 0
+        self.deadline = None
+        # wrappers already on the interpreter, put back on detach
+        self._shadowed = {}
+        self._start_steps = 0
+        self._counter = None
+        self._interpreter = None
+
+    def __repr__(self):
+        return 'ExecutionLimits(max_steps={}, timeout={}, max_depth={}, max_memory={})'.format(self.max_steps, self.timeout, self.max_depth, self.max_memory)
+
+    def attach(self, interpreter, script=None):
+        interpreter.limits = self
+        self._interpreter = interpreter
+        self.script = script
+        self._script_nodes = None
+
+        if self.max_steps is not None or self.timeout is not None:
+            self._counter = StepCounter.of(interpreter)
+            self._counter.add(self.check)
+            self._start_steps = self._counter.steps
+
+            if self.max_steps is not None:
+                # stop right at the step over the budget
+                self._counter.checkpoint_within(self.max_steps + 1)
+
+        if self.timeout is not None:
+            self.deadline = time.perf_counter() + self.timeout
+
+        if self.max_depth is not None:
+            self.depth = 0
+            self._wrap_calls(interpreter)
+
+        if self.max_memory is not None:
+            self.memory = MemoryQuota(self.max_memory, self.error)
+            self.memory.attach(interpreter)
+
+    def detach(self, interpreter):
+        if self._counter is not None:
+            self._counter.remove(self.check)
+
+            if len(self._counter.callbacks) == 0:
+                self._counter.detach(interpreter)
+
+            self._counter = None
+
+        if self.max_depth is not None:
+            restore_method(interpreter, 'call_function_expression', self._shadowed)
+
+        if self.memory is not None:
+            self.memory.detach(interpreter)
+
+        interpreter.limits = None
+        self._interpreter = None
+
+    def error(self, node, message):
+        self._interpreter.error(self.script_node(node), ErrorType.LimitExceeded, message)
+
+    def script_nodes(self):
+        # ids of the script's nodes, or None when not given the script
+        if self.script is None:
+            return None
+
+        if self._script_nodes is None:
+            self._script_nodes = script_node_ids(self.script)
+
+        return self._script_nodes
+
+    def script_node(self, node):
+        # the innermost node being visited that is part of the script, from
+        # the interpreter's own frames; only looked for once a bound is hit
+        script_nodes = self.script_nodes()
+
+        if script_nodes is None:
+            return node
+
+        return innermost_script_node(script_nodes, node, sys._getframe(1))
+
+    def check(self, node):
+        steps = self._counter.steps - self._start_steps
+
+        if self.max_steps is not None:
+            if steps > self.max_steps:
+                self.error(node, 'step limit of {} exceeded'.format(self.max_steps))
+
+            self._counter.checkpoint_within(self.max_steps + 1 - steps)
+
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.error(node, 'time limit of {}s exceeded after {} steps'.format(self.timeout, steps))
+
+    def _wrap_calls(self, interpreter):
+        self._shadowed = shadowed_methods(interpreter, ('call_function_expression',))
+        call_function_expression = interpreter.call_function_expression
+        script_nodes = self.script_nodes()
+
+        def limited_call_function_expression(node, function_scope=None):
+            if script_nodes is not None and id(node) not in script_nodes:
+                return call_function_expression(node, function_scope)
+
+            self.depth += 1
+
+            try:
+                if self.depth > self.max_depth:
+                    self.error(node, 'call depth limit of {} exceeded'.format(self.max_depth))
+
+                return call_function_expression(node, function_scope)
+            except RecursionError:
+                # Python's own limit came first; reported from the first
+                # call on the way out with enough stack left to do so
+                self.error(node, 'call depth limit exceeded at depth {}'.format(self.depth))
+            finally:
+                self.depth -= 1
+
+        interpreter.call_function_expression = limited_call_function_expression
+
+def shadowed_methods(interpreter, names):
+    # wrappers of other tools already set on the instance
+    return {name: interpreter.__dict__[name] for name in names if name in interpreter.__dict__}
+
+def restore_method(interpreter, name, shadowed):
+    del interpreter.__dict__[name]
+
+    if name in shadowed:
+        setattr(interpreter, name, shadowed[name])
+
+def estimate_size(value):
+    # roughly what `value` adds to MemoryReport's total, without walking
+    # further than its own elements or members
+    if isinstance(value, BasicObject):
+        return sys.getsizeof(value) + sys.getsizeof(value.__dict__) + sys.getsizeof(value.members) + sum(estimate_member_size(member) for member in value.members.values())
+
+    if isinstance(value, BasicValue):
+        value = value.value
+
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(sys.getsizeof(element) for element in value)
+
+    if type(value) is StrRope:
+        return sys.getsizeof(value) + len(value)
+
+    return sys.getsizeof(value)
+
+def estimate_member_size(member):
+    if isinstance(member, BasicValue) and not isinstance(member, BasicObject):
+        return sys.getsizeof(member) + sys.getsizeof(member.__dict__) + sys.getsizeof(member.value)
+
+    return sys.getsizeof(member)
+
+def raw_value(value):
+    if type(value) is BasicValue:
+        return value.value
+
+    return value
+
+class MemoryQuota:
+    # Bounds the size of the PEACH values an evaluation keeps, counted the
+    # way MemoryReport counts them, over what was there when it started.
+    #
+    # Walking everything reachable is too slow to do often, so arrays,
+    # strings and objects made by builtins and literals are charged an
+    # estimate of their size instead, as is the growth of arrays changed
+    # in place. Charges can't tell when a value becomes garbage, so once
+    # they add up to the room left, the reachable values are counted for
+    # real; only when those are over the limit is it an error. The limit
+    # may be overshot by about what one builtin allocates at once, or by
+    # MIN_ROOM of it close to the limit.
+
+    # charges never wait for less room than this share of the limit, so a
+    # script close to its limit doesn't walk the heap at every allocation
+    MIN_ROOM = 1 / 16
+
+    WRAPPED_METHODS = ('call_builtin_function', 'visit_ArrayExpression', 'visit_ObjectExpression')
+
+    def __init__(self, limit, error=None):
+        self.limit = limit
+        # called with the node and message when the limit is exceeded;
+        # ExecutionLimits passes its own, which reports it in the script
+        self.error = error
+        self.baseline = 0
+        self.charged = 0
+        self.room = limit
+        # bytes in use at the last count, and how often they were counted
+        self.in_use = 0
+        self.recounts = 0
+        self._shadowed = {}
+        self._interpreter = None
+
+    def attach(self, interpreter):
+        self._interpreter = interpreter
+        self.baseline = self.reachable_size()
+        self._shadowed = shadowed_methods(interpreter, MemoryQuota.WRAPPED_METHODS)
+
+        self._wrap_builtins(interpreter)
+        self._wrap_literal(interpreter, 'visit_ArrayExpression')
+        self._wrap_literal(interpreter, 'visit_ObjectExpression')
+
+    def detach(self, interpreter):
+        for name in MemoryQuota.WRAPPED_METHODS:
+            restore_method(interpreter, name, self._shadowed)
+
+        self._interpreter = None
+
+    def charge(self, size, node):
+        self.charged += size
+
+        if self.charged > self.room:
+            self.recount(node)
+
+    def reachable_size(self):
+        interpreter = self._interpreter
+        report = MemoryReport()
+
+        report.walk([interpreter.global_scope, interpreter.current_scope, *interpreter.stack.stack])
+
+        return report.total_size
+
+    def recount(self, node):
+        self.recounts += 1
+        self.in_use = self.reachable_size() - self.baseline
+        self.charged = 0
+        self.room = max(self.limit - self.in_use, self.limit * MemoryQuota.MIN_ROOM)
+
+        if self.in_use > self.limit:
+            message = 'memory limit of {} bytes exceeded, {} bytes in use'.format(self.limit, self.in_use)
+
+            if self.error is not None:
+                self.error(node, message)
+            else:
+                self._interpreter.error(node, ErrorType.LimitExceeded, message)
+
+    def _wrap_builtins(self, interpreter):
+        call_builtin_function = interpreter.call_builtin_function
+
+        def charged_call_builtin_function(fun, this_object, arguments, node):
+            # most builtins take and return numbers; only arrays and
+            # strings are looked at more closely
+            arrays = None
+
+            for argument in arguments:
+                value = raw_value(argument)
+
+                if isinstance(value, list):
+                    if arrays is None:
+                        arrays = []
+
+                    arrays.append((value, len(value)))
+
+            result = call_builtin_function(fun, this_object, arguments, node)
+            value = raw_value(result)
+
+            size = 0
+
+            # arrays grown in place are charged for their new elements
+            if arrays is not None:
+                for (array, length) in arrays:
+                    if len(array) > length:
+                        size += sys.getsizeof(array) // len(array) * (len(array) - length)
+                        size += sum(sys.getsizeof(element) for element in array[length:])
+
+            if type(value) in (str, StrRope):
+                # a string built from another is mostly new bytes on top of
+                # it; for ropes, it shares the other's storage
+                longest = 0
+
+                for argument in arguments:
+                    operand = raw_value(argument)
+
+                    if type(operand) in (str, StrRope):
+                        longest = max(longest, len(operand))
+
+                size += max(estimate_size(value) - longest, 0)
+            elif isinstance(value, (list, BasicObject)):
+                if value is not raw_value(this_object) and not any(value is array for (array, _) in arrays or ()):
+                    size += estimate_size(value)
+
+            if size > 0:
+                self.charge(size, node)
+
+            return result
+
+        interpreter.call_builtin_function = charged_call_builtin_function
+
+    def _wrap_literal(self, interpreter, name):
+        visit_literal = getattr(interpreter, name)
+
+        def charged_visit_literal(node):
+            result = visit_literal(node)
+            self.charge(estimate_size(result), node)
+
+            return result
+
+        setattr(interpreter, name, charged_visit_literal)
@@ -0,0 +1,321 @@
+from interpreter.basic_value import BasicValue
+from interpreter.basic_object import BasicObject
+from interpreter.function import BuiltinFunction
+from interpreter.native_value import NativeValue
+from interpreter.numeric_array import NumericArray, numpy
+from interpreter.str_rope import StrRope
+from parser.node import NodeFunctionExpression
+
+from collections.abc import Mapping, MutableMapping, Sequence
+
+# Converts values between Python and PEACH without copying where the two
+# representations already agree. PEACH arrays are Python lists, so lists
+# of plain values are shared; dicts become objects whose members read and
+# write the dict; lists holding dicts or lists become arrays that pass
+# every change on to the Python list; bytes and memoryviews become
+# IntArray/FloatArray views over the same buffer. Going back, objects and
+# arrays holding objects come out as views that convert members only when
+# they are read.
+
+PRIMITIVE_TYPES = (int, float, str, bool, StrRope, type(None))
+
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+# struct format characters of memoryviews that can back a numeric array
+BUFFER_KINDS = {
+    'b': 'int', 'B': 'int', 'h': 'int', 'H': 'int', 'i': 'int', 'I': 'int',
+    'l': 'int', 'L': 'int', 'q': 'int', 'Q': 'int', 'f': 'float', 'd': 'float'
+}
+
+def is_shareable(value):
+    # true if PEACH can use `value` as it is, inside an array
+    if type(value) in PRIMITIVE_TYPES or isinstance(value, (BasicValue, NativeValue)):
+        return True
+
+    if type(value) is list:
+        return all(is_shareable(item) for item in value)
+
+    return False
+
+def to_peach(value):
+    if isinstance(value, BasicValue):
+        return value
+
+    if type(value) in PRIMITIVE_TYPES or isinstance(value, NativeValue):
+        return BasicValue(value)
+
+    # functions are stored in members and variables unwrapped
+    if isinstance(value, (NodeFunctionExpression, BuiltinFunction)):
+        return value
+
+    if isinstance(value, (ObjectView, ArrayView)):
+        return value.peach_value
+
+    if type(value) is HostList:
+        return BasicValue(value)
+
+    if type(value) is list:
+        if is_shareable(value):
+            return BasicValue(value)
+
+        return BasicValue(HostList(value))
+
+    if type(value) is tuple:
+        return BasicValue([to_peach_element(item) for item in value])
+
+    if isinstance(value, Mapping):
+        return BasicObject(parent=None, members=DictMembers(value))
+
+    if isinstance(value, BUFFER_TYPES) or (numpy is not None and isinstance(value, numpy.ndarray)):
+        return BasicValue(buffer_to_numarray(value))
+
+    raise TypeError("cannot pass {} (type {}) to PEACH".format(value, type(value).__name__))
+
+def to_peach_element(value):
+    # arrays hold their elements unwrapped, except for objects
+    return to_peach(value).extract_basicvalue()
+
+def buffer_to_numarray(value):
+    if numpy is not None:
+        if isinstance(value, (bytes, bytearray)):
+            data = numpy.frombuffer(value, dtype=numpy.uint8)
+        else:
+            data = numpy.asarray(value)
+
+        kinds = {'i': 'int', 'u': 'int', 'f': 'float'}
+
+        if data.ndim != 1 or data.dtype.kind not in kinds:
+            raise TypeError('only one-dimensional numeric buffers can be passed to PEACH, got {}'.format(data.dtype))
+
+        return NumericArray(kinds[data.dtype.kind], data)
+
+    data = memoryview(value)
+
+    if data.ndim != 1 or data.format not in BUFFER_KINDS:
+        raise TypeError("only one-dimensional numeric buffers can be passed to PEACH, got format '{}'".format(data.format))
+
+    return NumericArray(BUFFER_KINDS[data.format], data)
+
+def from_peach(value):
+    if isinstance(value, BasicValue) and not isinstance(value, BasicObject):
+        value = value.extract_value()
+
+    if type(value) is StrRope:
+        return str(value)
+
+    if isinstance(value, BasicObject):
+        if isinstance(value.members, DictMembers):
+            return value.members.mapping
+
+        # instances of classes registered by extensions wrap the Python object
+        if getattr(value.parent, 'python_class', None) is not None:
+            return value.members['_value'].extract_value()
+
+        return ObjectView(value)
+
+    if type(value) is HostList:
+        return value.host
+
+    if type(value) is list:
+        if all(type(item) in PRIMITIVE_TYPES and type(item) is not StrRope for item in value):
+            return value
+
+        return ArrayView(value)
+
+    if isinstance(value, NumericArray):
+        return value.data
+
+    return value
+
+def from_peach_copy(value):
+    # like from_peach, but converted all the way down into plain Python
+    # values that no longer refer to the interpreter, so they can be
+    # pickled and sent to another process
+    value = from_peach(value)
+
+    if type(value) in PRIMITIVE_TYPES:
+        return value
+
+    if isinstance(value, Mapping):
+        return {key: from_peach_copy(item) for (key, item) in value.items()}
+
+    if isinstance(value, (list, ArrayView)):
+        return [from_peach_copy(item) for item in value]
+
+    if isinstance(value, memoryview):
+        return value.tolist()
+
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return value
+
+    raise TypeError("cannot copy {} out of PEACH".format(value))
+
+class HostList(list):
+    # A PEACH array made from a Python list that holds dicts or lists. It
+    # holds the converted items, and every change made to it from PEACH is
+    # made to the Python list as well, so both keep the same items.
+
+    def __init__(self, host):
+        super().__init__(to_peach_element(item) for item in host)
+        self.host = host
+
+    def _sync(self):
+        # for changes that don't map onto the Python list one to one
+        self.host[:] = [from_peach(item) for item in self]
+
+    def append(self, item):
+        super().append(item)
+        self.host.append(from_peach(item))
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        self.host.extend(from_peach(item) for item in items)
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self.host.insert(index, from_peach(item))
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self.host.pop(index)
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._sync()
+
+    def clear(self):
+        super().clear()
+        self.host.clear()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._sync()
+
+    def reverse(self):
+        super().reverse()
+        self.host.reverse()
+
+    def __setitem__(self, index, item):
+        super().__setitem__(index, item)
+
+        if isinstance(index, slice):
+            self._sync()
+        else:
+            self.host[index] = from_peach(item)
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        del self.host[index]
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._sync()
+        return self
+
+class DictMembers(MutableMapping):
+    # the members of an object made from a Python dict
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        # key -> (the Python value, what it was converted to), so reading a
+        # member twice gives the same object or array both times
+        self.converted = {}
+
+    def __getitem__(self, key):
+        value = self.mapping[key]
+
+        if type(value) in PRIMITIVE_TYPES:
+            return to_peach(value)
+
+        cached = self.converted.get(key)
+
+        if cached is not None and cached[0] is value:
+            return cached[1]
+
+        converted = to_peach(value)
+        self.converted[key] = (value, converted)
+
+        return converted
+
+    def __setitem__(self, key, value):
+        self.converted.pop(key, None)
+        self.mapping[key] = from_peach(value)
+
+    def __delitem__(self, key):
+        self.converted.pop(key, None)
+        del self.mapping[key]
+
+    def __contains__(self, key):
+        return key in self.mapping
+
+    def __iter__(self):
+        return iter(self.mapping)
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def __repr__(self):
+        return 'DictMembers({})'.format(self.mapping)
+
+class ObjectView(Mapping):
+    # a PEACH object seen from Python; methods are left out
+
+    def __init__(self, obj):
+        self.peach_value = obj
+
+    def _is_data(self, value):
+        return not isinstance(value, (NodeFunctionExpression, BuiltinFunction))
+
+    def __getitem__(self, key):
+        value = self.peach_value.members[key]
+
+        if not self._is_data(value):
+            raise KeyError(key)
+
+        return from_peach(value)
+
+    def __contains__(self, key):
+        return key in self.peach_value.members and self._is_data(self.peach_value.members[key])
+
+    def __iter__(self):
+        return (key for (key, value) in self.peach_value.members.items() if self._is_data(value))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return 'ObjectView({})'.format(dict(self))
+
+class ArrayView(Sequence):
+    # a PEACH array holding objects, seen from Python
+
+    def __init__(self, array):
+        self.array = array
+
+    @property
+    def peach_value(self):
+        return BasicValue(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ArrayView(self.array[index])
+
+        return from_peach(self.array[index])
+
+    def __len__(self):
+        return len(self.array)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        return len(self) == len(other) and all(a == b for (a, b) in zip(self, other))
+
+    def __repr__(self):
+        return 'ArrayView({})'.format(list(self))
@@ -0,0 +1,311 @@
+from interpreter.basic_object import BasicObject
+from interpreter.basic_value import BasicValue
+from interpreter.typing.basic_type import BasicType
+from interpreter.function import BuiltinFunction
+from interpreter.native_value import NativeValue
+from interpreter.numeric_array import NumericArray
+from interpreter.str_rope import StrRope
+from interpreter.scope import Scope
+from interpreter.script_nodes import script_node_ids, innermost_script_node
+from parser.node import AstNode
+
+from collections import Counter
+
+import sys
+import tracemalloc
+
+class MemoryReport:
+    # rows shown per table in report()
+    REPORT_LIMIT = 20
+
+    RAW_TYPE_NAMES = {
+        int: 'Int (unboxed)',
+        float: 'Float (unboxed)',
+        bool: 'Bool (unboxed)',
+        str: 'Str (unboxed)',
+        StrRope: 'Str (rope)',
+        list: 'Array (unboxed)',
+        type(None): 'null (unboxed)'
+    }
+
+    def __init__(self, sites=None):
+        self.counts = Counter()
+        # shallow sizes: each object's own storage, counted once even when
+        # it is reachable from several places
+        self.sizes = Counter()
+        # shallow sizes plus those of the boxed and unboxed values each
+        # object holds directly; not a retained size, which would follow
+        # every reference
+        self.with_members = Counter()
+        # AllocationSites.sites; counts and shallow sizes of arrays and
+        # objects by (kind, site) are only kept when given
+        self.sites = sites
+        self.site_counts = Counter()
+        self.site_sizes = Counter()
+        self.traced_current = None
+        self.traced_peak = None
+
+    @staticmethod
+    def start_tracing(frames=1):
+        # allocation sites are only known for memory allocated after this
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    @staticmethod
+    def roots(interpreter):
+        return [interpreter.global_scope, interpreter.current_scope, *interpreter.stack.stack]
+
+    @staticmethod
+    def collect(interpreter, sites=None):
+        report = MemoryReport(sites)
+        report.walk(MemoryReport.roots(interpreter))
+
+        if tracemalloc.is_tracing():
+            report.add_tracemalloc()
+
+        return report
+
+    @staticmethod
+    def type_name(obj):
+        if isinstance(obj, BasicType):
+            return 'Type'
+
+        parent = obj.parent
+
+        if isinstance(parent, BasicType) and 'name' in parent.members:
+            return parent.friendly_typename
+
+        return 'Object'
+
+    def add(self, category, size, owner):
+        self.counts[category] += 1
+        self.sizes[category] += size
+
+        # values held directly by an object (its BasicValue wrappers and
+        # unboxed primitives) are charged to that object's kind as well
+        self.with_members[owner if owner is not None else category] += size
+
+    def add_site(self, category, item, size):
+        if self.sites is None:
+            return
+
+        key = (category, self.sites.get(id(item), AllocationSites.UNKNOWN))
+        self.site_counts[key] += 1
+        self.site_sizes[key] += size
+
+    def walk(self, roots):
+        seen = set()
+        pending = [(root, None) for root in roots]
+
+        while len(pending) > 0:
+            (item, owner) = pending.pop()
+
+            if id(item) in seen:
+                continue
+
+            seen.add(id(item))
+            self.visit(item, owner, pending)
+
+        return seen
+
+    def visit(self, item, owner, pending):
+        if isinstance(item, Scope):
+            size = sys.getsizeof(item) + sys.getsizeof(item.variables)
+
+            for info in item.variables.values():
+                size += sys.getsizeof(info)
+                pending.append((info.value_wrapper, None))
+
+            self.add('Scope', size, None)
+
+            if item.parent is not None:
+                pending.append((item.parent, None))
+        elif isinstance(item, BasicObject):
+            category = MemoryReport.type_name(item)
+            size = sys.getsizeof(item) + sys.getsizeof(item.__dict__) + sys.getsizeof(item.members)
+            self.add(category, size, None)
+            self.add_site(category, item, size)
+
+            if item.parent is not None:
+                pending.append((item.parent, None))
+
+            pending.extend((member, category) for member in item.members.values())
+        elif isinstance(item, BasicValue):
+            self.add('BasicValue', sys.getsizeof(item) + sys.getsizeof(item.__dict__), owner)
+            pending.append((item.value, owner))
+        elif type(item) in MemoryReport.RAW_TYPE_NAMES or isinstance(item, list):
+            # arrays shared with Python code are list subclasses
+            kind = list if isinstance(item, list) else type(item)
+            size = sys.getsizeof(item)
+
+            if kind is list:
+                # an array's elements belong to the array, not whoever holds it
+                owner = MemoryReport.RAW_TYPE_NAMES[list]
+                pending.extend((element, owner) for element in item)
+            elif kind is StrRope:
+                size += sum(sys.getsizeof(part) for part in item.builder.parts)
+
+            self.add(MemoryReport.RAW_TYPE_NAMES[kind], size, owner)
+
+            if kind is list:
+                self.add_site(MemoryReport.RAW_TYPE_NAMES[kind], item, size)
+        elif isinstance(item, NumericArray):
+            self.add('{} (native)'.format(item.type_name), sys.getsizeof(item) + item.data.nbytes, owner)
+        elif isinstance(item, NativeValue):
+            self.add('{} (native)'.format(item.type_name), sys.getsizeof(item), owner)
+        elif isinstance(item, AstNode):
+            self.add('AST node', sys.getsizeof(item) + sys.getsizeof(item.__dict__), None)
+
+            for value in item.__dict__.values():
+                if isinstance(value, AstNode):
+                    pending.append((value, None))
+                elif isinstance(value, list):
+                    pending.extend((child, None) for child in value if isinstance(child, AstNode))
+        elif isinstance(item, BuiltinFunction):
+            self.add('Builtin function', sys.getsizeof(item), None)
+        else:
+            self.add(type(item).__name__, sys.getsizeof(item), owner)
+
+    def add_tracemalloc(self):
+        (self.traced_current, self.traced_peak) = tracemalloc.get_traced_memory()
+
+    @property
+    def total_size(self):
+        return sum(self.sizes.values())
+
+    def as_dict(self):
+        return {
+            'counts': dict(self.counts),
+            'sizes': dict(self.sizes),
+            'with_members': dict(self.with_members),
+            'sites': [
+                {'kind': kind, 'site': site, 'count': count, 'size': self.site_sizes[(kind, site)]}
+                for ((kind, site), count) in self.site_counts.items()
+            ],
+            'total_size': self.total_size,
+            'traced_current': self.traced_current,
+            'traced_peak': self.traced_peak
+        }
+
+    def report(self):
+        lines = [
+            'PEACH memory: {} objects reachable, {:.1f} KiB'.format(sum(self.counts.values()), self.total_size / 1024.0),
+            '',
+            '{:>10} {:>12} {:>16}  {}'.format('count', 'own KiB', '+ members KiB', 'kind')
+        ]
+
+        by_size = sorted(self.counts, key=lambda category: (self.with_members[category], self.sizes[category]), reverse=True)
+
+        for category in by_size[:MemoryReport.REPORT_LIMIT]:
+            lines.append('{:>10} {:>12.1f} {:>16.1f}  {}'.format(self.counts[category], self.sizes[category] / 1024.0, self.with_members[category] / 1024.0, category))
+
+        if self.sites is not None:
+            lines += [
+                '',
+                'Arrays and objects by where the script made them:',
+                '{:>10} {:>12}  {:<24} {}'.format('count', 'own KiB', 'kind', 'site')
+            ]
+
+            by_site_size = sorted(self.site_counts, key=lambda key: (self.site_sizes[key], self.site_counts[key]), reverse=True)
+
+            for key in by_site_size[:MemoryReport.REPORT_LIMIT]:
+                lines.append('{:>10} {:>12.1f}  {:<24} {}'.format(self.site_counts[key], self.site_sizes[key] / 1024.0, key[0], key[1]))
+
+        if self.traced_current is not None:
+            lines += [
+                '',
+                'Python allocations: {:.1f} KiB live, {:.1f} KiB peak'.format(self.traced_current / 1024.0, self.traced_peak / 1024.0)
+            ]
+
+        return '\n'.join(lines)
+
+class AllocationSites:
+    # Where the script made its arrays and objects, for MemoryReport: the
+    # line of the script being run when an array or object literal was
+    # evaluated, or when a builtin returned a new array or object. Values
+    # made inside the std library are put down to the line of the script
+    # that called into it. Sites are remembered by id, so a value made in
+    # a way not seen here may show up at the site of a freed one.
+
+    # values made before attach, or with no line of the script running
+    UNKNOWN = '<std library>'
+
+    WRAPPED_METHODS = ('call_builtin_function', 'visit_ArrayExpression', 'visit_ObjectExpression')
+
+    def __init__(self):
+        # id of a raw list or BasicObject -> 'file:line'
+        self.sites = {}
+        self._script_nodes = None
+        self._filename = None
+        # ids of what was reachable at attach, which builtins such as
+        # type_of may hand back but didn't make
+        self._existing = set()
+        self._shadowed = {}
+
+    def attach(self, interpreter, script):
+        self._script_nodes = script_node_ids(script)
+        self._filename = interpreter.source_location.filename
+        self._existing = MemoryReport().walk(MemoryReport.roots(interpreter))
+
+        # wrappers already on the instance, such as a MemoryQuota's, are put
+        # back on detach
+        self._shadowed = {
+            name: interpreter.__dict__[name]
+            for name in AllocationSites.WRAPPED_METHODS if name in interpreter.__dict__
+        }
+
+        call_builtin_function = interpreter.call_builtin_function
+        visit_array_expression = interpreter.visit_ArrayExpression
+        visit_object_expression = interpreter.visit_ObjectExpression
+
+        def sited_call_builtin_function(fun, this_object, arguments, node):
+            result = call_builtin_function(fun, this_object, arguments, node)
+            value = AllocationSites.raw_value(result)
+
+            # builtins that hand back one of their operands made nothing
+            if isinstance(value, (list, BasicObject)):
+                if value is not AllocationSites.raw_value(this_object) and not any(value is AllocationSites.raw_value(argument) for argument in arguments):
+                    self.record(value, node)
+
+            return result
+
+        def sited_visit_array_expression(node):
+            result = visit_array_expression(node)
+            self.record(AllocationSites.raw_value(result), node)
+
+            return result
+
+        def sited_visit_object_expression(node):
+            result = visit_object_expression(node)
+            self.record(AllocationSites.raw_value(result), node)
+
+            return result
+
+        interpreter.call_builtin_function = sited_call_builtin_function
+        interpreter.visit_ArrayExpression = sited_visit_array_expression
+        interpreter.visit_ObjectExpression = sited_visit_object_expression
+
+    def detach(self, interpreter):
+        for name in AllocationSites.WRAPPED_METHODS:
+            del interpreter.__dict__[name]
+
+        interpreter.__dict__.update(self._shadowed)
+
+    @staticmethod
+    def raw_value(value):
+        if type(value) is BasicValue:
+            return value.value
+
+        return value
+
+    def record(self, value, node):
+        if id(value) in self._existing:
+            return
+
+        # the frame of the wrapper that saw `value` made, and outwards
+        node = innermost_script_node(self._script_nodes, node, sys._getframe(2))
+
+        if node is None:
+            self.sites.pop(id(value), None)
+        else:
+            self.sites[id(value)] = '{}:{}'.format(self._filename, node.location[1])
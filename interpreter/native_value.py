@@ -0,0 +1,4 @@
+class NativeValue:
+    # name of the global PEACH type used to box this value,
+    # the same way a Python str is boxed into `Str`
+    type_name = None
@@ -0,0 +1,220 @@
+from interpreter.native_value import NativeValue
+
+import array
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class NumericArray(NativeValue):
+    TYPE_NAMES = {
+        'float': 'FloatArray',
+        'int': 'IntArray'
+    }
+
+    TYPECODES = {
+        'float': 'd',
+        'int': 'q'
+    }
+
+    CASTS = {
+        'float': float,
+        'int': int
+    }
+
+    OPERATORS = {
+        'add': operator.add,
+        'sub': operator.sub,
+        'mul': operator.mul,
+        'mod': operator.mod
+    }
+
+    # comparisons give an IntArray mask of 0s and 1s
+    COMPARISONS = {
+        'lt': operator.lt,
+        'lte': operator.le,
+        'gt': operator.gt,
+        'gte': operator.ge,
+        'eql': operator.eq,
+        'noteql': operator.ne
+    }
+
+    def __init__(self, kind, data):
+        # `data` is a memoryview over an array.array, or an ndarray when
+        # numpy is available; slicing either one gives a view, not a copy
+        self.kind = kind
+        self.data = data
+
+    @property
+    def type_name(self):
+        return NumericArray.TYPE_NAMES[self.kind]
+
+    @staticmethod
+    def use_numpy():
+        return numpy is not None
+
+    @staticmethod
+    def from_values(kind, values):
+        cast = NumericArray.CASTS[kind]
+
+        if NumericArray.use_numpy():
+            return NumericArray(kind, numpy.array([cast(v) for v in values], dtype=NumericArray.TYPECODES[kind]))
+
+        return NumericArray(kind, memoryview(array.array(NumericArray.TYPECODES[kind], [cast(v) for v in values])))
+
+    @staticmethod
+    def allocate(kind, size, fill=0):
+        cast = NumericArray.CASTS[kind]
+
+        if NumericArray.use_numpy():
+            return NumericArray(kind, numpy.full(size, cast(fill), dtype=NumericArray.TYPECODES[kind]))
+
+        return NumericArray(kind, memoryview(array.array(NumericArray.TYPECODES[kind], [cast(fill)]) * size))
+
+    @staticmethod
+    def result_kind(lhs, rhs):
+        for operand in (lhs, rhs):
+            if isinstance(operand, NumericArray):
+                if operand.kind == 'float':
+                    return 'float'
+            elif isinstance(operand, float):
+                return 'float'
+
+        return 'int'
+
+    def __len__(self):
+        return len(self.data)
+
+    def check_index(self, index):
+        if index < 0:
+            index += len(self.data)
+
+        if index < 0 or index >= len(self.data):
+            raise IndexError('index {} out of range for array of length {}'.format(index, len(self.data)))
+
+        return index
+
+    def at(self, index):
+        return NumericArray.CASTS[self.kind](self.data[self.check_index(index)])
+
+    def set(self, index, value):
+        self.data[self.check_index(index)] = NumericArray.CASTS[self.kind](value)
+
+    def fill(self, value):
+        value = NumericArray.CASTS[self.kind](value)
+
+        if NumericArray.use_numpy():
+            self.data.fill(value)
+        else:
+            self.data[:] = memoryview(array.array(self.data.format, [value]) * len(self.data))
+
+    def slice(self, start, stop):
+        # clamp like Python slicing; the result shares storage with self
+        return NumericArray(self.kind, self.data[start:stop])
+
+    def to_list(self):
+        return self.data.tolist()
+
+    def sum(self):
+        if NumericArray.use_numpy():
+            return NumericArray.CASTS[self.kind](self.data.sum())
+
+        return sum(self.data)
+
+    def min(self):
+        return NumericArray.CASTS[self.kind](min(self.data))
+
+    def max(self):
+        return NumericArray.CASTS[self.kind](max(self.data))
+
+    def mean(self):
+        if len(self.data) == 0:
+            raise ValueError('mean of an empty array')
+
+        return float(self.sum()) / len(self.data)
+
+    def operand_values(self, other):
+        if isinstance(other, NumericArray):
+            # a single element broadcasts like a scalar
+            if len(other.data) == 1 and len(self.data) != 1:
+                return NumericArray.CASTS[other.kind](other.data[0])
+
+            if len(other.data) != len(self.data):
+                raise ValueError('array lengths differ ({} and {})'.format(len(self.data), len(other.data)))
+
+            return other.data
+
+        return other
+
+    def binary_op(self, op_name, other, reverse=False):
+        if isinstance(other, NumericArray) and len(self.data) == 1 and len(other.data) != 1:
+            return other.binary_op(op_name, NumericArray.CASTS[self.kind](self.data[0]), not reverse)
+
+        if op_name in NumericArray.COMPARISONS:
+            kind = 'int'
+            op = NumericArray.COMPARISONS[op_name]
+        elif op_name == 'div':
+            # Int division floors, as `__intern_int_div__` does
+            kind = NumericArray.result_kind(self, other)
+            op = operator.truediv if kind == 'float' else operator.floordiv
+        else:
+            kind = NumericArray.result_kind(self, other)
+            op = NumericArray.OPERATORS[op_name]
+
+        lhs = self.data
+        rhs = self.operand_values(other)
+
+        if reverse:
+            (lhs, rhs) = (rhs, lhs)
+
+        if NumericArray.use_numpy():
+            with numpy.errstate(divide='raise', invalid='raise', over='ignore'):
+                try:
+                    result = op(lhs, rhs)
+                except FloatingPointError as e:
+                    raise ZeroDivisionError(str(e))
+
+                if kind == 'int' and NumericArray.int_overflowed(op_name, lhs, rhs, result):
+                    # what array.array raises for the same values
+                    raise OverflowError('int too big to convert')
+
+            return NumericArray(kind, numpy.asarray(result, dtype=NumericArray.TYPECODES[kind]))
+
+        if isinstance(lhs, memoryview) and isinstance(rhs, memoryview):
+            values = [op(a, b) for (a, b) in zip(lhs, rhs)]
+        elif isinstance(lhs, memoryview):
+            values = [op(a, rhs) for a in lhs]
+        else:
+            values = [op(lhs, b) for b in rhs]
+
+        return NumericArray.from_values(kind, values)
+
+    @staticmethod
+    def int_overflowed(op_name, lhs, rhs, result):
+        # numpy wraps int64 arithmetic around instead of raising, so whether
+        # it did is worked out from the operands and the wrapped result
+        lhs = numpy.asarray(lhs, dtype=NumericArray.TYPECODES['int'])
+        rhs = numpy.asarray(rhs, dtype=NumericArray.TYPECODES['int'])
+        smallest = numpy.iinfo(lhs.dtype).min
+
+        if op_name == 'add':
+            # the result's sign differs from both operands'
+            overflowed = ((lhs ^ result) & (rhs ^ result)) < 0
+        elif op_name == 'sub':
+            overflowed = ((lhs ^ rhs) & (lhs ^ result)) < 0
+        elif op_name == 'mul':
+            # an exact product divides back to the other operand
+            nonzero = lhs != 0
+            overflowed = nonzero & (result // numpy.where(nonzero, lhs, 1) != rhs)
+            overflowed |= (lhs == -1) & (rhs == smallest)
+        elif op_name == 'div':
+            overflowed = (lhs == smallest) & (rhs == -1)
+        else:
+            return False
+
+        return bool(numpy.any(overflowed))
+
+    def __repr__(self):
+        return "{}({})".format(self.type_name, self.to_list())
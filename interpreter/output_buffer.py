@@ -0,0 +1,62 @@
+import sys
+
+class OutputBuffer:
+    # flush policies: at each newline, once `size` characters are pending,
+    # or only on an explicit flush (io.flush(), input, exit, errors)
+    LINE = 'line'
+    SIZE = 'size'
+    EXPLICIT = 'explicit'
+
+    POLICIES = (LINE, SIZE, EXPLICIT)
+
+    DEFAULT_SIZE = 8192
+
+    def __init__(self, policy=LINE, size=DEFAULT_SIZE, stream=None):
+        self.parts = []
+        self.pending = 0
+        # None means whatever sys.stdout is at the time of each flush
+        self.stream = stream
+        self.set_policy(policy, size)
+
+    def set_policy(self, policy, size=None):
+        if policy not in OutputBuffer.POLICIES:
+            raise ValueError("unknown buffering mode '{}', expected one of {}".format(policy, ', '.join(OutputBuffer.POLICIES)))
+
+        if size is not None:
+            if size <= 0:
+                raise ValueError('buffer size must be positive, got {}'.format(size))
+
+            self.size = size
+
+        self.policy = policy
+        self.flush()
+
+    def write(self, text):
+        if len(text) == 0:
+            return
+
+        self.parts.append(text)
+        self.pending += len(text)
+
+        # line mode still flushes a long line once it outgrows the buffer
+        if self.policy == OutputBuffer.LINE:
+            if '\n' in text or self.pending >= self.size:
+                self.flush()
+        elif self.policy == OutputBuffer.SIZE:
+            if self.pending >= self.size:
+                self.flush()
+
+    def flush(self, sync=False):
+        # `sync` also flushes the underlying stream, for when output must be
+        # visible right away (before reading input, at exit, on io.flush())
+        stream = self.stream if self.stream is not None else sys.stdout
+
+        if self.pending > 0:
+            text = ''.join(self.parts)
+            self.parts = []
+            self.pending = 0
+
+            stream.write(text)
+
+        if sync:
+            stream.flush()
@@ -0,0 +1,171 @@
+from parser.node import NodeFunctionExpression, NodeType
+
+from collections import Counter
+
+import sys
+import threading
+import time
+
+class FunctionProfile:
+    def __init__(self, node):
+        self.node = node
+        self.calls = 0
+        # `total` includes callees, `own` does not
+        self.total = 0.0
+        self.own = 0.0
+
+class Profiler:
+    DEFAULT_INTERVAL = 0.001
+
+    # rows shown per table in report()
+    REPORT_LIMIT = 20
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+
+        self.functions = {}
+        self.line_samples = Counter()
+        self.stack_samples = Counter()
+        self.sample_count = 0
+        self.elapsed = 0.0
+
+        self._call_stack = []
+        self._active = Counter()
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def function_label(node):
+        name = node.name if node.name is not None else '<anonymous>'
+
+        return '{} ({}:{})'.format(name, node.filename, node.location[1])
+
+    def start(self, interpreter):
+        interpreter.profiler = self
+
+        self._default_filename = interpreter.source_location.filename
+        self._visit_code = type(interpreter).visit.__code__
+        self._call_code = type(interpreter).call_function_expression.__code__
+        self._target_thread = threading.get_ident()
+        self._started = time.perf_counter()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name='peach-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self, interpreter):
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.elapsed = time.perf_counter() - self._started
+        interpreter.profiler = None
+
+    # deterministic part: called around every PEACH function call
+
+    def enter_function(self, node):
+        self._active[node] += 1
+        self._call_stack.append([node, time.perf_counter(), 0.0])
+
+    def exit_function(self):
+        (node, started, in_callees) = self._call_stack.pop()
+        elapsed = time.perf_counter() - started
+
+        profile = self.functions.get(node)
+
+        if profile is None:
+            profile = self.functions[node] = FunctionProfile(node)
+
+        profile.calls += 1
+        profile.own += elapsed - in_callees
+
+        # recursive calls are already inside the outermost one's total
+        self._active[node] -= 1
+
+        if self._active[node] == 0:
+            profile.total += elapsed
+
+        if len(self._call_stack) > 0:
+            self._call_stack[-1][2] += elapsed
+
+    # sampling part: a background thread looks at the interpreter thread's
+    # Python stack and reads the PEACH nodes being visited from it
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread)
+
+            if frame is not None:
+                self._record_sample(frame)
+
+    def _record_sample(self, frame):
+        nodes = []
+
+        while frame is not None:
+            if frame.f_code is self._visit_code or frame.f_code is self._call_code:
+                node = frame.f_locals.get('node')
+
+                if node is not None:
+                    nodes.append((frame.f_code is self._call_code, node))
+
+            frame = frame.f_back
+
+        filename = self._default_filename
+        stack = ['<main>']
+        line = None
+
+        for (is_call, node) in reversed(nodes):
+            if is_call and isinstance(node, NodeFunctionExpression):
+                if node.filename is not None:
+                    filename = node.filename
+
+                stack.append(Profiler.function_label(node))
+            elif getattr(node, 'type', None) == NodeType.Import:
+                filename = node.source_location.filename
+
+            location = getattr(node, 'location', None)
+
+            if location is not None and location[1] > 0:
+                line = (filename, location[1])
+
+        if line is not None:
+            self.line_samples[line] += 1
+            stack.append('{}:{}'.format(*line))
+
+        self.stack_samples[';'.join(stack)] += 1
+        self.sample_count += 1
+
+    def write_collapsed(self, filename):
+        # one `frame;frame;...;file:line count` row per distinct stack, the
+        # input format of flamegraph.pl, speedscope and friends
+        with open(filename, 'w') as f:
+            for (stack, count) in sorted(self.stack_samples.items()):
+                f.write('{} {}\n'.format(stack, count))
+
+    def report(self):
+        lines = [
+            'PEACH profile: {:.3f}s, {} samples every {:.1f}ms'.format(self.elapsed, self.sample_count, self.interval * 1000),
+            '',
+            'Functions by own time:',
+            '{:>10} {:>10} {:>10}  {}'.format('calls', 'total s', 'own s', 'function')
+        ]
+
+        by_own = sorted(self.functions.values(), key=lambda profile: profile.own, reverse=True)
+
+        for profile in by_own[:Profiler.REPORT_LIMIT]:
+            lines.append('{:>10} {:>10.4f} {:>10.4f}  {}'.format(profile.calls, profile.total, profile.own, Profiler.function_label(profile.node)))
+
+        lines += [
+            '',
+            'Lines by samples:',
+            '{:>10} {:>7}  {}'.format('samples', '%', 'location')
+        ]
+
+        for ((filename, row), count) in self.line_samples.most_common(Profiler.REPORT_LIMIT):
+            percent = 100.0 * count / max(self.sample_count, 1)
+            lines.append('{:>10} {:>6.1f}%  {}:{}'.format(count, percent, filename, row))
+
+        return '\n'.join(lines)
@@ -0,0 +1,51 @@
+from lexer import Lexer
+from parser.parser import Parser
+from parser.source_location import SourceLocation
+from interpreter.interpreter import Interpreter
+from error import InterpreterError
+
+import copy
+import threading
+
+DEFAULT_IMPORTS = ['std/__core__.peach']
+
+class Runtime:
+    # The std library, bootstrapped once and shared between threads. It is
+    # never executed again after bootstrap: each interpreter made from it
+    # gets its own copy of the global scope, so a script patching `Int` or
+    # `Object` only changes its own copy. AST nodes and builtin functions
+    # are immutable and shared by every copy.
+
+    def __init__(self, default_imports=DEFAULT_IMPORTS):
+        source_location = SourceLocation('<bootstrap>')
+
+        parser = Parser(Lexer('', source_location).lex(), source_location)
+        import_nodes = [parser.import_file(path) for path in default_imports]
+
+        if len(parser.error_list.errors) > 0:
+            parser.error_list.print_errors()
+            raise InterpreterError('could not parse the std library')
+
+        interpreter = Interpreter(source_location)
+
+        for node in import_nodes:
+            interpreter.visit(node)
+
+        interpreter.output.flush(sync=True)
+
+        self.global_scope = interpreter.global_scope
+        self._local = threading.local()
+
+    def new_interpreter(self, source_location):
+        return Interpreter(source_location, global_scope=copy.deepcopy(self.global_scope))
+
+    def local(self):
+        # a Peach for the calling thread, created the first time it asks
+        from peach import Peach
+
+        peach = getattr(self._local, 'peach', None)
+
+        if peach is None:
+            peach = self._local.peach = Peach(runtime=self)
+
+        return peach
@@ -0,0 +1,50 @@
+from parser.node import AstNode, NodeImport
+
+# Telling the nodes of the script being run apart from those of the std
+# library. Nodes only know their row and column, not their file, and std
+# functions called from the script are reported against the script's
+# filename, so tools that point at a line of the script (ExecutionLimits,
+# AllocationSites) look for the innermost node of the script instead.
+
+def script_node_ids(nodes):
+    # ids of the nodes parsed from a script, leaving out what it imports
+    ids = set()
+    pending = list(nodes)
+
+    while len(pending) > 0:
+        node = pending.pop()
+
+        if not isinstance(node, AstNode) or id(node) in ids:
+            continue
+
+        ids.add(id(node))
+
+        if isinstance(node, NodeImport):
+            continue
+
+        for value in node.__dict__.values():
+            if isinstance(value, AstNode):
+                pending.append(value)
+            elif isinstance(value, list):
+                pending.extend(value)
+
+    return ids
+
+def innermost_script_node(script_nodes, node, frame):
+    # `node` if it is part of the script, or else the innermost one being
+    # visited in the interpreter's frames from `frame` out; None if none is
+    while node is not None:
+        # nodes made up by the parser have no location of their own
+        if isinstance(node, AstNode) and id(node) in script_nodes and node.location != AstNode.location:
+            return node
+
+        while frame is not None and 'node' not in frame.f_locals:
+            frame = frame.f_back
+
+        if frame is None:
+            return None
+
+        node = frame.f_locals['node']
+        frame = frame.f_back
+
+    return None
@@ -0,0 +1,372 @@
+from interpreter.basic_value import BasicValue
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+# Runs many independent scripts on a pool of warm worker processes. Each
+# worker bootstraps the std library once, then gives every job a fresh
+# copy of it, so jobs can't see each other's globals or patched types.
+#
+# A job is a dict with either a `path` to a script or its `source`, and
+# optionally an `id`, a `name` to report it under, `stdin` text for
+# `io.read`, and `max_steps`, `timeout`, `max_depth` and `max_memory` to
+# run it with ExecutionLimits; a pool's default limits fill in the ones a
+# job doesn't set. Its result is a dict with the job's id and name, `ok`,
+# `exit_code`, everything the script printed in `output`, the pid of the
+# worker that ran it, and `queued`, `run` and `total` times in seconds.
+#
+# `serve` accepts jobs over a Unix socket, one JSON object per line, and
+# answers with one JSON result per line as jobs finish. Imports inside
+# jobs are resolved against the server's working directory.
+
+DEFAULT_SOCKET = os.path.join(os.path.expanduser('~'), '.peach.sock')
+
+# job keys passed on to ExecutionLimits
+LIMIT_NAMES = ('max_steps', 'timeout', 'max_depth', 'max_memory')
+
+# set in each worker process by _init_worker
+_worker_runtime = None
+
+def _init_worker():
+    from interpreter.runtime import Runtime
+
+    # Ctrl-C stops the server, which shuts the workers down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    global _worker_runtime
+    _worker_runtime = Runtime()
+
+def job_name(job):
+    if 'name' in job:
+        return job['name']
+
+    if 'path' in job:
+        return job['path']
+
+    return '<job {}>'.format(job.get('id'))
+
+def with_default_limits(job, default_limits):
+    # a copy of `job` with the limits it doesn't set taken from the defaults
+    missing = {name: value for (name, value) in default_limits.items() if job.get(name) is None}
+
+    if len(missing) == 0:
+        return job
+
+    return {**job, **missing}
+
+def run_job(job, submitted=None):
+    # runs in a worker; `submitted` is when the job was handed to the pool
+    from peach import Peach
+    from interpreter.limits import ExecutionLimits
+
+    start = time.time()
+    output = io.StringIO()
+    exit_code = None
+
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(job.get('stdin', ''))
+
+    peach = Peach(runtime=_worker_runtime, output=output)
+    limits = None
+
+    if any(job.get(name) is not None for name in LIMIT_NAMES):
+        limits = ExecutionLimits(**{name: job.get(name) for name in LIMIT_NAMES})
+
+    try:
+        if 'path' in job:
+            peach.eval(filename=job['path'], limits=limits)
+        else:
+            peach.eval(data=job.get('source', ''), limits=limits)
+    except SystemExit as e:
+        # `exit(n)` raises with the BasicValue it was given
+        exit_code = e.code.extract_value() if isinstance(e.code, BasicValue) else e.code
+
+        if type(exit_code) is not int:
+            exit_code = 0 if exit_code is None else 1
+    except Exception as e:
+        # such as running out of stdin; the worker itself is fine
+        if peach.interpreter is not None:
+            peach.interpreter.output.flush()
+
+        output.write('{}: {}\n'.format(type(e).__name__, e))
+        exit_code = 1
+    finally:
+        sys.stdin = stdin
+
+        if peach.interpreter is not None:
+            peach.interpreter.output.flush()
+
+    end = time.time()
+
+    if exit_code is None:
+        exit_code = 1 if peach.failed else 0
+
+    if submitted is None:
+        submitted = start
+
+    return {
+        'id': job.get('id'),
+        'name': job_name(job),
+        'ok': exit_code == 0,
+        'exit_code': exit_code,
+        'output': output.getvalue(),
+        'worker': os.getpid(),
+        'queued': start - submitted,
+        'run': end - start,
+        'total': end - submitted
+    }
+
+def failed_result(job, submitted, message):
+    # a job that never got to run, such as when its worker died
+    return {
+        'id': job.get('id'),
+        'name': job_name(job),
+        'ok': False,
+        'exit_code': None,
+        'output': message + '\n',
+        'worker': None,
+        'queued': 0.0,
+        'run': 0.0,
+        'total': time.time() - submitted
+    }
+
+class JobPool:
+    # worker processes with the std library loaded, started up front so
+    # the first job doesn't pay for the bootstrap; `default_limits` maps
+    # names in LIMIT_NAMES to the bounds for jobs that don't set them
+
+    def __init__(self, workers=None, default_limits=None):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.default_limits = {name: value for (name, value) in (default_limits or {}).items() if value is not None}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._start()
+
+    def _start(self):
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        # wait until every worker has bootstrapped
+        for future in [self._executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def submit(self, job, callback):
+        # calls `callback(result)` from another thread once the job is done
+        submitted = time.time()
+        job = with_default_limits(job, self.default_limits)
+
+        with self._lock:
+            executor = self._executor
+
+            try:
+                future = executor.submit(run_job, job, submitted)
+            except BrokenProcessPool:
+                executor = self._restart(executor)
+                future = executor.submit(run_job, job, submitted)
+
+        def done(future):
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                result = failed_result(job, submitted, 'worker failed: {}'.format(e))
+
+                with self._lock:
+                    self._restart(executor)
+            except Exception as e:
+                result = failed_result(job, submitted, 'worker failed: {}'.format(e))
+
+            callback(result)
+
+        future.add_done_callback(done)
+
+        return future
+
+    def _restart(self, broken_executor):
+        # a worker that crashes takes the whole executor down with it; only
+        # the first job to notice starts a new one
+        if self._executor is broken_executor:
+            broken_executor.shutdown(wait=False, cancel_futures=True)
+            self._start()
+
+        return self._executor
+
+    def run(self, jobs):
+        # results in the order the jobs finish
+        results = []
+        finished = threading.Condition()
+
+        def collect(result):
+            with finished:
+                results.append(result)
+                finished.notify()
+
+        count = 0
+
+        for job in jobs:
+            self.submit(job, collect)
+            count += 1
+
+        for index in range(count):
+            with finished:
+                finished.wait_for(lambda: len(results) > index)
+
+            yield results[index]
+
+    def shutdown(self):
+        self._executor.shutdown()
+
+def parse_job(line, index):
+    # a line is a JSON job, or just the path of a script
+    line = line.strip()
+
+    if line.startswith('{'):
+        job = json.loads(line)
+
+        if not isinstance(job, dict) or ('path' not in job and 'source' not in job):
+            raise ValueError('a job needs a `path` or a `source`')
+    else:
+        job = {'path': line}
+
+    job.setdefault('id', index)
+
+    return job
+
+class JobRequestHandler(socketserver.StreamRequestHandler):
+    # one connection: jobs come in as lines, results go out as lines in the
+    # order they finish, and the connection is closed once the client has
+    # stopped sending and every job is done
+
+    def handle(self):
+        write_lock = threading.Lock()
+        finished = threading.Condition()
+        pending = 0
+
+        def send(result):
+            data = (json.dumps(result) + '\n').encode('utf-8')
+
+            with write_lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    # the client went away; the job's result is dropped
+                    pass
+
+        def send_finished(result):
+            nonlocal pending
+
+            send(result)
+
+            with finished:
+                pending -= 1
+                finished.notify()
+
+        for (index, line) in enumerate(self.rfile):
+            line = line.decode('utf-8')
+
+            if line.strip() == '':
+                continue
+
+            try:
+                job = parse_job(line, index)
+            except ValueError as e:
+                send({'id': index, 'ok': False, 'error': 'invalid job: {}'.format(e)})
+                continue
+
+            with finished:
+                pending += 1
+
+            self.server.pool.submit(job, send_finished)
+
+        with finished:
+            finished.wait_for(lambda: pending == 0)
+
+class JobServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, pool):
+        self.pool = pool
+        super().__init__(socket_path, JobRequestHandler)
+
+def serve(socket_path=DEFAULT_SOCKET, workers=None, default_limits=None):
+    if os.path.exists(socket_path):
+        # only remove a socket left behind by a server that is gone
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+        else:
+            raise OSError("a server is already listening on '{}'".format(socket_path))
+
+    pool = JobPool(workers, default_limits)
+    server = JobServer(socket_path, pool)
+
+    sys.stderr.write('serving on {} with {} workers\n'.format(socket_path, pool.workers))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+        pool.shutdown()
+
+def submit(jobs, socket_path=DEFAULT_SOCKET):
+    # sends jobs to a running server, yielding results as they come back
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+
+        def send_jobs():
+            with connection.makefile('w', encoding='utf-8') as stream:
+                for job in jobs:
+                    stream.write(json.dumps(job) + '\n')
+
+            connection.shutdown(socket.SHUT_WR)
+
+        sender = threading.Thread(target=send_jobs, daemon=True)
+        sender.start()
+
+        with connection.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                yield json.loads(line)
+
+        sender.join()
+
+def format_result(result):
+    if 'error' in result:
+        return '== job {}: {} ==\n'.format(result.get('id'), result['error'])
+
+    status = 'ok' if result['ok'] else 'failed (exit code {})'.format(result['exit_code'])
+    header = '== {}: {}, queued {:.3f}s, ran {:.3f}s ==\n'.format(result['name'], status, result['queued'], result['run'])
+
+    return header + result['output']
+
+def report_results(results, as_json=False, stream=sys.stdout):
+    # prints each result and returns a one-line summary of all of them
+    start = time.time()
+    count = 0
+    failed = 0
+    run_time = 0.0
+
+    for result in results:
+        count += 1
+        failed += 0 if result.get('ok') else 1
+        run_time += result.get('run', 0.0)
+
+        stream.write(json.dumps(result) + '\n' if as_json else format_result(result))
+        stream.flush()
+
+    elapsed = time.time() - start
+
+    return (failed, '{} jobs, {} failed, {:.3f}s wall, {:.3f}s in scripts'.format(count, failed, elapsed, run_time))
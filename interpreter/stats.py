@@ -0,0 +1,173 @@
+from interpreter.basic_object import BasicObject
+from interpreter.basic_value import BasicValue
+
+from collections import Counter
+
+class InterpreterStats:
+    # rows shown per table in report()
+    REPORT_LIMIT = 20
+
+    # Interpreter methods replaced by counting wrappers while attached
+    WRAPPED_METHODS = ('visit', 'open_scope', 'close_scope', 'basic_value_to_object', 'walk_member_expression', 'visit_FunctionReturn', 'call_builtin_function')
+
+    def __init__(self):
+        self.node_visits = Counter()
+        self.builtin_calls = Counter()
+        # how many prototype links a member expression followed to find
+        # its member; 0 means it was on the object itself
+        self.lookup_depths = Counter()
+
+        self.scope_opens = 0
+        self.scope_closes = 0
+        self.boxings = 0
+        self.return_jumps = 0
+        self.stack_pushes = 0
+        self.stack_pops = 0
+
+    def attach(self, interpreter):
+        # counting wrappers are set on the instance, shadowing the methods
+        # of Interpreter and Stack, so an interpreter without stats runs
+        # exactly the code it always did
+        interpreter.stats = self
+
+        # wrappers already on the instance, such as a StepCounter's, are put
+        # back on detach
+        self._shadowed = {
+            name: interpreter.__dict__[name]
+            for name in InterpreterStats.WRAPPED_METHODS if name in interpreter.__dict__
+        }
+
+        visit = interpreter.visit
+        open_scope = interpreter.open_scope
+        close_scope = interpreter.close_scope
+        basic_value_to_object = interpreter.basic_value_to_object
+        walk_member_expression = interpreter.walk_member_expression
+        visit_function_return = interpreter.visit_FunctionReturn
+        call_builtin_function = interpreter.call_builtin_function
+        stack_push = interpreter.stack.push
+        stack_pop = interpreter.stack.pop
+
+        def counted_visit(node):
+            if not isinstance(node, BasicValue):
+                self.node_visits[node.type.name] += 1
+
+            return visit(node)
+
+        def counted_open_scope():
+            self.scope_opens += 1
+            return open_scope()
+
+        def counted_close_scope():
+            self.scope_closes += 1
+            return close_scope()
+
+        def counted_basic_value_to_object(node, target):
+            if not isinstance(BasicValue(target).extract_basicvalue(), BasicObject):
+                self.boxings += 1
+
+            return basic_value_to_object(node, target)
+
+        def counted_walk_member_expression(node):
+            (target, member) = walk_member_expression(node)
+            self.lookup_depths[InterpreterStats.member_depth(target, node.identifier.value)] += 1
+
+            return (target, member)
+
+        def counted_visit_function_return(node):
+            self.return_jumps += 1
+            return visit_function_return(node)
+
+        def counted_call_builtin_function(fun, this_object, arguments, node):
+            self.builtin_calls[fun.name] += 1
+            return call_builtin_function(fun, this_object, arguments, node)
+
+        def counted_stack_push(value):
+            self.stack_pushes += 1
+            return stack_push(value)
+
+        def counted_stack_pop(expected_type=None):
+            self.stack_pops += 1
+            return stack_pop(expected_type)
+
+        interpreter.visit = counted_visit
+        interpreter.open_scope = counted_open_scope
+        interpreter.close_scope = counted_close_scope
+        interpreter.basic_value_to_object = counted_basic_value_to_object
+        interpreter.walk_member_expression = counted_walk_member_expression
+        interpreter.visit_FunctionReturn = counted_visit_function_return
+        interpreter.call_builtin_function = counted_call_builtin_function
+        interpreter.stack.push = counted_stack_push
+        interpreter.stack.pop = counted_stack_pop
+
+    def detach(self, interpreter):
+        for name in InterpreterStats.WRAPPED_METHODS:
+            del interpreter.__dict__[name]
+
+        interpreter.__dict__.update(self._shadowed)
+
+        del interpreter.stack.__dict__['push']
+        del interpreter.stack.__dict__['pop']
+
+        interpreter.stats = None
+
+    @staticmethod
+    def member_depth(obj, name):
+        depth = 0
+
+        # mirrors BasicObject.lookup_member, including its guard against
+        # a type that is its own grandparent
+        while obj is not None:
+            if name in obj.members:
+                return depth
+
+            if obj.parent is not None and obj.parent.parent == obj:
+                return depth + 1
+
+            obj = obj.parent
+            depth += 1
+
+        return depth
+
+    @property
+    def total_node_visits(self):
+        return sum(self.node_visits.values())
+
+    def as_dict(self):
+        return {
+            'node_visits': dict(self.node_visits),
+            'total_node_visits': self.total_node_visits,
+            'scope_opens': self.scope_opens,
+            'scope_closes': self.scope_closes,
+            'boxings': self.boxings,
+            'lookup_depths': dict(self.lookup_depths),
+            'return_jumps': self.return_jumps,
+            'stack_pushes': self.stack_pushes,
+            'stack_pops': self.stack_pops,
+            'builtin_calls': dict(self.builtin_calls)
+        }
+
+    def report(self):
+        lookups = sum(self.lookup_depths.values())
+        mean_depth = sum(depth * count for (depth, count) in self.lookup_depths.items()) / max(lookups, 1)
+
+        lines = [
+            'PEACH interpreter stats:',
+            '{:>12}  node visits'.format(self.total_node_visits),
+            '{:>12}  scopes opened ({} closed)'.format(self.scope_opens, self.scope_closes),
+            '{:>12}  primitives boxed'.format(self.boxings),
+            '{:>12}  member lookups (mean prototype depth {:.2f})'.format(lookups, mean_depth),
+            '{:>12}  return jumps'.format(self.return_jumps),
+            '{:>12}  stack pushes ({} pops)'.format(self.stack_pushes, self.stack_pops),
+            '',
+            'Node visits by type:'
+        ]
+
+        for (name, count) in self.node_visits.most_common(InterpreterStats.REPORT_LIMIT):
+            lines.append('{:>12}  {}'.format(count, name))
+
+        lines += ['', 'Builtin calls:']
+
+        for (name, count) in self.builtin_calls.most_common(InterpreterStats.REPORT_LIMIT):
+            lines.append('{:>12}  {}'.format(count, name))
+
+        return '\n'.join(lines)
@@ -0,0 +1,86 @@
+class StepCounter:
+    # Counts nodes visited by an interpreter and calls back every
+    # `interval` of them with the node about to be visited. Like
+    # InterpreterStats, the counting wrapper is set on the instance, so an
+    # interpreter without a step counter runs exactly the code it always
+    # did.
+
+    DEFAULT_INTERVAL = 1000
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        # steps from the last checkpoint to the next one, and how many of
+        # them are left
+        self.period = interval
+        self.countdown = interval
+        # steps taken up to the last checkpoint
+        self.checkpoint_steps = 0
+        self.callbacks = []
+        # a wrapper already on the interpreter, such as InterpreterStats',
+        # put back on detach
+        self._shadowed = None
+
+    @staticmethod
+    def of(interpreter, interval=DEFAULT_INTERVAL):
+        # the interpreter's step counter, attaching one if it has none;
+        # an existing counter keeps its interval if it is the shorter one
+        counter = interpreter.step_counter
+
+        if counter is None:
+            counter = StepCounter(interval)
+            counter.attach(interpreter)
+        elif interval < counter.interval:
+            counter.interval = interval
+            counter.checkpoint_within(interval)
+
+        return counter
+
+    @property
+    def steps(self):
+        return self.checkpoint_steps + (self.period - self.countdown)
+
+    def checkpoint_within(self, steps):
+        # makes sure the next checkpoint comes no later than `steps` from now
+        if steps >= self.countdown:
+            return
+
+        self.checkpoint_steps += self.period - self.countdown
+        self.period = self.countdown = max(steps, 1)
+
+    def add(self, callback):
+        self.callbacks.append(callback)
+
+    def remove(self, callback):
+        self.callbacks.remove(callback)
+
+    def attach(self, interpreter):
+        interpreter.step_counter = self
+        self._shadowed = interpreter.__dict__.get('visit')
+
+        visit = interpreter.visit
+
+        def counted_visit(node):
+            self.countdown -= 1
+
+            if self.countdown <= 0:
+                self.checkpoint(node)
+
+            return visit(node)
+
+        interpreter.visit = counted_visit
+
+    def detach(self, interpreter):
+        del interpreter.__dict__['visit']
+
+        if self._shadowed is not None:
+            interpreter.visit = self._shadowed
+            self._shadowed = None
+
+        interpreter.step_counter = None
+
+    def checkpoint(self, node):
+        self.checkpoint_steps += self.period - self.countdown
+        self.period = self.countdown = self.interval
+
+        for callback in self.callbacks:
+            callback(node)
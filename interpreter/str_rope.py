@@ -0,0 +1,64 @@
+class StrBuilder:
+    def __init__(self, initial=''):
+        self.parts = [initial]
+        self.length = len(initial)
+
+class StrRope:
+    # strings shorter than this are concatenated directly; past it,
+    # repeated appends share a builder instead of copying every time
+    THRESHOLD = 1024
+
+    def __init__(self, builder, length):
+        self.builder = builder
+        self.length = length
+        self._flat = None
+
+    @staticmethod
+    def concat(lhs, rhs):
+        if isinstance(lhs, StrRope):
+            return lhs.append(rhs)
+
+        if len(lhs) + len(rhs) < StrRope.THRESHOLD:
+            return lhs + rhs
+
+        return StrRope(StrBuilder(lhs), len(lhs)).append(rhs)
+
+    def append(self, value):
+        builder = self.builder
+
+        # a rope may only extend the builder in place if it is the newest
+        # view of it; `a + x` followed by `a + y` must not see each other.
+        if builder.length != self.length:
+            builder = StrBuilder(self.flatten())
+
+        builder.parts.append(value)
+        builder.length += len(value)
+
+        return StrRope(builder, builder.length)
+
+    def flatten(self):
+        if self._flat is None:
+            builder = self.builder
+
+            if len(builder.parts) > 1:
+                # every rope on this builder is a prefix of the joined value,
+                # so compacting the parts is safe for all of them
+                builder.parts = [''.join(builder.parts)]
+
+            joined = builder.parts[0]
+
+            if len(joined) != self.length:
+                joined = joined[:self.length]
+
+            self._flat = joined
+
+        return self._flat
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return self.flatten()
+
+    def __repr__(self):
+        return repr(self.flatten())
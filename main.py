@@ -3,18 +3,156 @@
 from peach import Peach
 from parser.parser import Parser
 from examples.embed import example_embed
+from interpreter import service
+from interpreter.limits import ExecutionLimits
 
+import argparse
+import os
 import sys
 
+SERVICE_COMMANDS = ('serve', 'batch', 'submit')
+
+# what `serve` bounds jobs by when they don't set bounds of their own
+DEFAULT_SERVE_TIMEOUT = 60.0
+
+def parse_args():
+    arg_parser = argparse.ArgumentParser(
+        description='Run a PEACH script, or start the REPL when no script is given.',
+        epilog='To run many scripts on a pool of warm workers, see `main.py {serve,batch,submit} -h`. A script named like one of these runs as a script.'
+    )
+    arg_parser.add_argument('filename', nargs='?', help='script to run')
+    arg_parser.add_argument('--profile', action='store_true', help='profile the script and print a report to stderr')
+    arg_parser.add_argument('--stats', action='store_true', help='count interpreter operations and print them to stderr')
+    arg_parser.add_argument('--memory', action='store_true', help='report what the PEACH objects left after the script use to stderr')
+    arg_parser.add_argument('--max-steps', type=int, metavar='N', help='stop the script after it has visited N nodes')
+    arg_parser.add_argument('--timeout', type=float, metavar='SECONDS', help='stop the script after it has run this long')
+    arg_parser.add_argument('--max-depth', type=int, metavar='N', help='stop the script when function calls nest deeper than N')
+    arg_parser.add_argument('--max-memory', type=float, metavar='MIB', help='stop the script when its values take up more than this many MiB')
+    arg_parser.add_argument('--profile-output', metavar='PATH', help='where to write collapsed stacks for flamegraph tools (default: <script>.folded)')
+
+    return arg_parser.parse_args()
+
+def parse_service_args():
+    arg_parser = argparse.ArgumentParser(prog='main.py', description='Run many PEACH scripts on a pool of warm worker processes.')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='run jobs sent to a local socket until interrupted')
+    serve.add_argument('--socket', default=service.DEFAULT_SOCKET, help='Unix socket to listen on (default: %(default)s)')
+    serve.add_argument('--workers', type=int, help='worker processes (default: one per CPU core)')
+    serve.add_argument('--timeout', type=float, default=DEFAULT_SERVE_TIMEOUT, metavar='SECONDS', help='stop jobs that set no timeout after this long (default: %(default)s)')
+    serve.add_argument('--max-steps', type=int, metavar='N', help='stop jobs that set no step limit after they have visited N nodes')
+
+    batch = commands.add_parser('batch', help='run scripts on a pool started just for them')
+    batch.add_argument('paths', nargs='*', help='scripts to run; without any, jobs are read from stdin, one per line')
+    batch.add_argument('--workers', type=int, help='worker processes (default: one per CPU core)')
+    batch.add_argument('--json', action='store_true', help='print one JSON result per line')
+    batch.add_argument('--timeout', type=float, metavar='SECONDS', help='stop jobs that set no timeout after this long')
+    batch.add_argument('--max-steps', type=int, metavar='N', help='stop jobs that set no step limit after they have visited N nodes')
+
+    submit = commands.add_parser('submit', help='run scripts on a running server')
+    submit.add_argument('paths', nargs='*', help='scripts to run; without any, jobs are read from stdin, one per line')
+    submit.add_argument('--socket', default=service.DEFAULT_SOCKET, help='Unix socket of the server (default: %(default)s)')
+    submit.add_argument('--json', action='store_true', help='print one JSON result per line')
+
+    return arg_parser.parse_args()
+
+def read_jobs(paths):
+    if len(paths) > 0:
+        return [{'id': index, 'path': path} for (index, path) in enumerate(paths)]
+
+    jobs = []
+
+    for (index, line) in enumerate(sys.stdin):
+        if line.strip() == '':
+            continue
+
+        try:
+            jobs.append(service.parse_job(line, index))
+        except ValueError as e:
+            sys.exit('line {}: invalid job: {}'.format(index + 1, e))
+
+    return jobs
+
+def is_service_command(argv):
+    # a script that happens to be called `serve` still runs as a script
+    return len(argv) > 1 and argv[1] in SERVICE_COMMANDS and not os.path.exists(argv[1])
+
+def default_limits(args):
+    return {'timeout': args.timeout, 'max_steps': args.max_steps}
+
+def run_service_command():
+    args = parse_service_args()
+
+    if args.command == 'serve':
+        try:
+            service.serve(args.socket, args.workers, default_limits(args))
+        except OSError as e:
+            sys.exit(str(e))
+
+        return
+
+    jobs = read_jobs(args.paths)
+
+    if args.command == 'batch':
+        pool = service.JobPool(args.workers, default_limits(args))
+        results = pool.run(jobs)
+    else:
+        # the server may be running somewhere else
+        for job in jobs:
+            if 'path' in job:
+                job['path'] = os.path.abspath(job['path'])
+
+        results = service.submit(jobs, args.socket)
+
+    try:
+        (failed, summary) = service.report_results(results, as_json=args.json)
+    except OSError as e:
+        sys.exit("could not reach a server on '{}': {}".format(args.socket, e))
+
+    if args.command == 'batch':
+        pool.shutdown()
+
+    sys.stderr.write(summary + '\n')
+
+    if failed > 0:
+        sys.exit(1)
+
 def main():
+    if is_service_command(sys.argv):
+        run_service_command()
+        return
+
+    args = parse_args()
     peach = Peach()
 
-    if len(sys.argv) <= 1:
+    if args.filename is None:
         peach.repl()
         return
 
-    filename = sys.argv[1]
-    peach.eval_file(filename)
+    limits = None
+
+    if any(limit is not None for limit in (args.max_steps, args.timeout, args.max_depth, args.max_memory)):
+        max_memory = int(args.max_memory * 1024 * 1024) if args.max_memory is not None else None
+        limits = ExecutionLimits(max_steps=args.max_steps, timeout=args.timeout, max_depth=args.max_depth, max_memory=max_memory)
+
+    peach.eval_file(args.filename, profile=args.profile, stats=args.stats, memory=args.memory, limits=limits)
+
+    if peach.profiler is not None:
+        collapsed_filename = args.profile_output
+
+        if collapsed_filename is None:
+            collapsed_filename = os.path.splitext(os.path.basename(args.filename))[0] + '.folded'
+
+        peach.profiler.write_collapsed(collapsed_filename)
+
+        sys.stderr.write(peach.profiler.report() + '\n')
+        sys.stderr.write('collapsed stacks written to {}\n'.format(collapsed_filename))
+
+    if peach.stats is not None:
+        sys.stderr.write(peach.stats.report() + '\n')
+
+    if peach.memory is not None:
+        sys.stderr.write(peach.memory.report() + '\n')
 
 if __name__ == '__main__':
     main()
@@ -39,6 +39,11 @@ class AstNode():
     def this_object(self):
         return self
 
+    def __deepcopy__(self, memo):
+        # the AST isn't changed after parsing, so copies of interpreter
+        # state (see Runtime) share it
+        return self
+
     def __str__(self):
         try:
             return "AstNode[{0}, {1}]".format(self.type.name, self.token)
@@ -110,6 +115,8 @@ class NodeImport(AstNode):
         AstNode.__init__(self, NodeType.Import, filename)
         self.children = []
         self.source_location = source_location
+        # set for `import "x.py"`, which loads a Python extension module
+        self.extension_path = None
 
 class NodeWhile(AstNode):
     def __init__(self, expr, block, token):
@@ -162,10 +169,13 @@ class NodeSplatArgument(AstNode):
         self.expr = expr
 
 class NodeFunctionExpression(AstNode):
-    def __init__(self, argument_list, block):
+    def __init__(self, argument_list, block, filename=None, name=None):
         AstNode.__init__(self, NodeType.FunctionExpression, block)
         self.argument_list = argument_list
         self.block = block
+        # where the function was defined, for profiles and reports
+        self.filename = filename
+        self.name = name
         
 class NodeFunctionReturn(AstNode):
     def __init__(self, value_node, token):
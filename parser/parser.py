@@ -3,6 +3,8 @@ from error import ErrorList, Error, ErrorType
 from parser.source_location import SourceLocation
 from parser.node import *
 
+import os
+
 # peter parser
 
 class Parser():
@@ -135,6 +137,9 @@ class Parser():
         return NodeArrayAccessExpression(lhs, access_expr, token)
         
     def import_file(self, filename, filename_token=None):
+        if filename.endswith('.py'):
+            return self.import_extension(filename, filename_token)
+
         try:
             fp = open(filename, 'r')
         except FileNotFoundError:
@@ -164,6 +169,21 @@ class Parser():
         
         return node
         
+    def import_extension(self, filename, filename_token=None):
+        # Python extensions are loaded when the import is executed; only
+        # check that the file is there
+        if not os.path.isfile(filename):
+            self.error('source file \'{}\' does not exist'.format(filename))
+            return None
+
+        if filename_token == None:
+            filename_token = LexerToken(f'"{filename}"')
+
+        node = NodeImport(filename_token, SourceLocation(filename))
+        node.extension_path = filename
+
+        return node
+
     def parse_while(self):
         # eat while keyword
         token = self.current_token
@@ -246,7 +266,7 @@ class Parser():
         else:
             argument_list.arguments = [macro_self_argument, *argument_list.arguments]
 
-        fun_expr = NodeFunctionExpression(argument_list, block)
+        fun_expr = NodeFunctionExpression(argument_list, block, self.filename, name.value)
         #macro_expr = NodeMacro(fun_expr, token)
 
         macro_var = NodeVariable(LexerToken('Macro', TokenType.Identifier))
@@ -609,7 +629,7 @@ class Parser():
         if block is None:
             return None
 
-        return NodeFunctionExpression(argument_list, block)
+        return NodeFunctionExpression(argument_list, block, self.filename)
 
     def parse_arrow_function(self, node):
         token = self.current_token
@@ -634,7 +654,8 @@ class Parser():
                 arguments,
                 token
             ),
-            block
+            block,
+            self.filename
         )
 
         return fun_expr
@@ -658,7 +679,7 @@ class Parser():
         if block is None:
             return None
 
-        fun_expr = NodeFunctionExpression(argument_list, block)
+        fun_expr = NodeFunctionExpression(argument_list, block, self.filename, name.value)
         
         # parse assignment, parenthesis, etc.
         val_node = NodeAssign(NodeVariable(name), fun_expr)
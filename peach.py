@@ -5,23 +5,48 @@ from parser.parser import Parser
 from parser.node import NodeImport
 from parser.source_location import SourceLocation
 from interpreter.interpreter import Interpreter
-from error import InterpreterError
+from interpreter.profiler import Profiler
+from interpreter.stats import InterpreterStats
+from interpreter.memory import MemoryReport, AllocationSites
+from interpreter.function_handle import FunctionHandle
+from interpreter.extension import PeachModule
+from interpreter.async_bridge import AsyncBridge, EvalCancelled
+from error import Error, ErrorType, InterpreterError
 
 from repl.repl import Repl
 from ast_printer import AstPrinter
 
+import asyncio
+import threading
+import tracemalloc
+
 class Peach():
-    def __init__(self):
-        pass
+    def __init__(self, runtime=None, output=None):
+        # with a Runtime, eval starts from a copy of its bootstrapped std
+        # library instead of parsing and running default_imports
+        self.runtime = runtime
+        # where print and error messages write; None means sys.stdout
+        self.output = output
+        self.interpreter = None
+        # PeachModules installed into every interpreter this creates
+        self.modules = []
+        self.builtins = None
+        self.profiler = None
+        self.stats = None
+        self.memory = None
+        # whether the last eval stopped on a parse or runtime error
+        self.failed = False
 
-    def eval(self, data=None, filename=None, interpret=True, default_imports=['std/__core__.peach']):
+    def eval(self, data=None, filename=None, interpret=True, default_imports=['std/__core__.peach'], profile=False, stats=False, memory=False, limits=None, async_bridge=None):
         debug_name = "<none>"
+        self.failed = False
 
         if filename != None:
             try:
                 self.file = open(filename, 'r')
             except FileNotFoundError:
-                print("Script '{}' could not be found".format(filename))
+                print("Script '{}' could not be found".format(filename), file=self.output)
+                self.failed = True
                 return None
             debug_name = filename
             self.data = self.file.read()
@@ -32,46 +57,200 @@ class Peach():
         else:
             self.data = ""
 
+        # trace from the start so the Python totals include the AST and the
+        # std bootstrap too
+        stop_tracing = memory and not tracemalloc.is_tracing()
+
+        if memory:
+            MemoryReport.start_tracing()
+
         self.lexer = Lexer(self.data, SourceLocation(debug_name))
         self.parser = Parser(self.lexer.lex(), self.lexer.source_location)
+
+        if self.runtime is not None:
+            default_imports = []
+
         # all default imports should be here
         global_import_nodes = []
         for path in default_imports:
             global_import_nodes.append(self.parser.import_file(path))
+        script_ast = self.parser.parse()
         # combine global imports and parser ast    
-        self.ast = global_import_nodes+self.parser.parse()
+        self.ast = global_import_nodes+script_ast
         error_list = self.parser.error_list
 
         if len(error_list.errors) > 0:
-            error_list.print_errors()
+            error_list.print_errors(self.output)
+            self.failed = True
+
+            if stop_tracing:
+                tracemalloc.stop()
+
             return
 
         return_code = None
         if interpret:
 
             # init interpreter and visit nodes
-            self.interpreter = Interpreter(self.parser.source_location)
+            if self.runtime is not None:
+                self.interpreter = self.runtime.new_interpreter(self.parser.source_location)
+            else:
+                self.interpreter = Interpreter(self.parser.source_location)
+
+            if self.output is not None:
+                self.interpreter.output.stream = self.output
+
+            for module in self.modules:
+                module.install(self.interpreter)
+
+            if async_bridge is not None:
+                async_bridge.attach(self.interpreter)
+
+            # the profile, stats and memory report stay available on
+            # self.profiler, self.stats and self.memory after eval returns
+            if profile:
+                self.profiler = Profiler()
+                self.profiler.start(self.interpreter)
+
+            if stats:
+                self.stats = InterpreterStats()
+                self.stats.attach(self.interpreter)
+
+            sites = None
 
             try:
-                for node in self.ast:
+                for node in global_import_nodes:
+                    return_code = self.interpreter.visit(node)
+
+                # limits bound the script, not the std library bootstrap
+                if limits is not None:
+                    limits.attach(self.interpreter, script_ast)
+
+                if memory:
+                    sites = AllocationSites()
+                    sites.attach(self.interpreter, script_ast)
+
+                for node in script_ast:
                     return_code = self.interpreter.visit(node)
             except InterpreterError:
                 # errors printed in interpreter
                 self.interpreter.error_list.clear_errors()
+                self.failed = True
+            except RecursionError:
+                # without a max_depth limit, Python's recursion limit is the
+                # first one a deeply recursive script runs into
+                print(Error(ErrorType.LimitExceeded, None, 'maximum recursion depth exceeded', self.parser.source_location.filename), file=self.interpreter.output)
+                self.failed = True
+            finally:
+                self.interpreter.output.flush(sync=True)
+
+                # attached last, so taken off first
+                if sites is not None:
+                    sites.detach(self.interpreter)
+
+                if limits is not None and self.interpreter.limits is limits:
+                    limits.detach(self.interpreter)
+
+                if profile:
+                    self.profiler.stop(self.interpreter)
+
+                if stats:
+                    self.stats.detach(self.interpreter)
+
+                if memory:
+                    self.memory = MemoryReport.collect(self.interpreter, sites.sites if sites is not None else None)
+
+        if stop_tracing:
+            tracemalloc.stop()
+
         return return_code
 
-    def eval_file(self, filename):
-        return self.eval(filename=filename)
+    async def eval_async(self, data=None, filename=None, interval=AsyncBridge.DEFAULT_INTERVAL, read_line=None, **kwargs):
+        # eval on a thread of its own, giving the event loop a turn every
+        # `interval` steps; sleep, Console.read and file I/O are awaited on
+        # the loop. `read_line` is an async function returning a line of
+        # input, used instead of stdin. Use one Peach per concurrent eval.
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def set_result(result, exception):
+            if future.done():
+                return
+
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+        bridge = AsyncBridge(loop, interval, read_line)
+
+        def run():
+            try:
+                result = self.eval(data=data, filename=filename, async_bridge=bridge, **kwargs)
+            except EvalCancelled:
+                return
+            except BaseException as e:
+                loop.call_soon_threadsafe(set_result, None, e)
+            else:
+                loop.call_soon_threadsafe(set_result, result, None)
+
+        threading.Thread(target=run, name='peach-eval', daemon=True).start()
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # the thread stops when it attaches the bridge, or at its next
+            # checkpoint or awaited call after that
+            bridge.cancel()
+            raise
+
+    def eval_file(self, filename, profile=False, stats=False, memory=False, limits=None):
+        return self.eval(filename=filename, profile=profile, stats=stats, memory=memory, limits=limits)
     def eval_data(self, data):
         return self.eval(data=data)
         
-    def call_function(self, function_name, arguments=[]):
+    def register_module(self, module):
+        self.modules.append(module)
+
+        if self.interpreter is not None:
+            module.install(self.interpreter)
+
+    def register_builtin(self, name, fn, pure=False):
+        # a single Python function, callable from PEACH as `name(...)`
+        if self.builtins is None:
+            self.builtins = PeachModule('builtins', namespace=False)
+            self.modules.append(self.builtins)
+
+        self.builtins.function(name, pure)(fn)
+
+        if self.interpreter is not None:
+            self.builtins.install(self.interpreter)
+
+    def get_function(self, function_name):
+        # resolve once, then call the handle as often as needed
         if self.interpreter == None:
             raise Exception("Peach not initialized! please run ")
+
+        return self.interpreter.get_function(function_name)
+
+    def call_function(self, function_name, arguments=[]):
         if type(arguments) != list:
             raise Exception("Arguments type is not list!")
 
-        return self.interpreter.call_function(function_name, arguments)
+        return self.get_function(function_name)(*arguments)
+
+    def call_many(self, function, argument_lists, lazy=False):
+        # `function` is a name or a handle from get_function; each item of
+        # `argument_lists` is a list of arguments for one call
+        if not isinstance(function, FunctionHandle):
+            function = self.get_function(function)
+
+        results = function.call_many(argument_lists)
+
+        if lazy:
+            return results
+
+        return list(results)
 
     def repl(self):
         repl = Repl()
@@ -40,6 +40,7 @@ class Repl:
         signal.signal(signal.SIGINT, self.at_exit)
         
     def at_exit(self, signal, frame):
+        self.interpreter.output.flush(sync=True)
         print('\nExiting...')
         exit(0)
         
@@ -129,6 +130,8 @@ class Repl:
                 self.interpreter.error_list.clear_errors()
                 continue
 
+        self.interpreter.output.flush(sync=True)
+
         if last_value is not None:
             obj_str = obj_to_string(self.interpreter, last_node, last_value)
             print(f"{LogColour.Info}{obj_str}{LogColour.Default}")
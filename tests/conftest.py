@@ -0,0 +1,31 @@
+import io
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# std imports are resolved against the working directory
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from interpreter.runtime import Runtime
+
+@pytest.fixture(scope='session')
+def runtime():
+    return Runtime()
+
+@pytest.fixture
+def run(runtime):
+    # evaluates a script and returns (peach, everything it printed)
+    from peach import Peach
+
+    def run(source, **kwargs):
+        output = io.StringIO()
+        peach = Peach(runtime=runtime, output=output)
+        peach.eval(data=source, **kwargs)
+
+        return (peach, output.getvalue())
+
+    return run
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from interpreter.async_bridge import AsyncBridge, EvalCancelled
+from interpreter.interpreter import Interpreter
+from parser.source_location import SourceLocation
+from peach import Peach
+
+FOREVER_SOURCE = '''
+let i = 0;
+
+while true {
+    i += 1;
+}
+'''
+
+def eval_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'peach-eval']
+
+def wait_for_eval_threads(timeout=10.0):
+    deadline = time.monotonic() + timeout
+
+    while len(eval_threads()) > 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    return len(eval_threads()) == 0
+
+def test_attach_after_cancel_raises():
+    bridge = AsyncBridge(asyncio.new_event_loop())
+    bridge.cancel()
+
+    with pytest.raises(EvalCancelled):
+        bridge.attach(Interpreter(SourceLocation('<none>')))
+
+    bridge.loop.close()
+
+@pytest.mark.parametrize('delay', [None, 0.2])
+def test_cancelled_eval_stops_its_thread(runtime, delay):
+    # with no delay the task is cancelled before the thread attaches the
+    # bridge; otherwise while the script is running
+    async def main():
+        task = asyncio.create_task(Peach(runtime=runtime).eval_async(data=FOREVER_SOURCE))
+
+        if delay is None:
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(delay)
+
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert wait_for_eval_threads()
+
+def test_eval_async_returns_like_eval(runtime):
+    async def main():
+        peach = Peach(runtime=runtime)
+        await peach.eval_async(data='let x = 1 + 2;')
+
+        return peach
+
+    peach = asyncio.run(main())
+
+    assert not peach.failed
@@ -0,0 +1,29 @@
+def test_math_pow_keeps_ints_exact(run):
+    (peach, output) = run('print(math.pow(2, 10));\nprint(math.pow(2.0, 0.5));')
+
+    assert not peach.failed
+    assert output.splitlines() == ['1024', str(2.0 ** 0.5)]
+
+def test_math_pow_without_real_result_is_an_argument_error(run):
+    (peach, output) = run('print(math.pow(-8.0, 0.5));')
+
+    assert peach.failed
+    assert 'ArgumentError' in output
+
+def test_iterator_zips_with_another_iterator(run):
+    (peach, output) = run('''
+let a = [1, 2, 3].__iter__();
+let b = ['x', 'y'].__iter__();
+print(a.zip(b).to_array());
+print([4, 5].__iter__().zip([6, 7]).to_array());
+''')
+
+    assert not peach.failed
+    assert output.splitlines() == ['[[1, x], [2, y]]', '[[4, 6], [5, 7]]']
+
+def test_str_to_int_reports_bad_characters_to_the_output(run, capsys):
+    (peach, output) = run('print("before");\nprint("12x".to_int());\nprint("-42".to_int());')
+
+    assert not peach.failed
+    assert output.splitlines() == ['before', 'Error: Non-integer character in string', '0', '-42']
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT_DIR
+
+def run_main(*args):
+    return subprocess.run([sys.executable, 'main.py', *args], cwd=ROOT_DIR, capture_output=True, text=True, timeout=120)
+
+@pytest.mark.parametrize('flags', [
+    ['--max-steps', '1000'],
+    ['--max-depth', '1'],
+    ['--max-memory', '0.01'],
+    ['--max-steps', '1000', '--stats']
+])
+def test_limits_leave_the_std_bootstrap_alone(tmp_path, flags):
+    script = tmp_path / 'hi.peach'
+    script.write_text('print("hi");\n')
+
+    result = run_main(*flags, str(script))
+
+    assert result.returncode == 0
+    assert result.stdout == 'hi\n'
+
+def test_small_step_limit_stops_a_loop_in_the_script(tmp_path):
+    script = tmp_path / 'spin.peach'
+    script.write_text('let i = 0;\n\nwhile true {\n    i += 1;\n}\n')
+
+    result = run_main('--max-steps', '1000', str(script))
+
+    assert 'step limit of 1000 exceeded' in result.stdout
+    assert '{}:'.format(script) in result.stdout
+    assert 'std/' not in result.stdout
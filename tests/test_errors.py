@@ -0,0 +1,35 @@
+import io
+
+from interpreter.service import run_job
+from peach import Peach
+
+def test_runtime_errors_go_to_the_output_stream(run, capsys):
+    (peach, output) = run('print("before");\nlet x = undefined_name;')
+
+    assert peach.failed
+    lines = output.splitlines()
+    assert lines[0] == 'before'
+    assert 'undefined_name' in lines[1]
+    assert capsys.readouterr().out == ''
+
+def test_parse_errors_and_missing_scripts_go_to_the_output_stream(capsys):
+    output = io.StringIO()
+    peach = Peach(output=output)
+
+    peach.eval(data='let = ;')
+    assert peach.failed
+    assert 'Syntax error' in output.getvalue()
+
+    peach.eval(filename='does/not/exist.peach')
+    assert peach.failed
+
+    assert "Script 'does/not/exist.peach' could not be found" in output.getvalue()
+    assert capsys.readouterr().out == ''
+
+def test_job_output_holds_its_errors(capsys):
+    result = run_job({'id': 1, 'source': 'print("hi");\nlet x = undefined_name;'})
+
+    assert not result['ok']
+    assert result['output'].startswith('hi\n')
+    assert 'undefined_name' in result['output']
+    assert capsys.readouterr().out == ''
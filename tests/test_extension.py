@@ -0,0 +1,23 @@
+import io
+
+from interpreter.extension import PeachModule
+from peach import Peach
+
+def test_pure_function_cache_tells_ints_and_floats_apart(runtime):
+    calls = []
+    module = PeachModule('kinds')
+
+    @module.function(pure=True)
+    def kind(value):
+        calls.append(value)
+        return type(value).__name__
+
+    output = io.StringIO()
+    peach = Peach(runtime=runtime, output=output)
+    peach.register_module(module)
+    peach.eval(data='print(kinds.kind(1));\nprint(kinds.kind(1.0));\nprint(kinds.kind(1));')
+
+    assert not peach.failed
+    assert output.getvalue().splitlines() == ['int', 'float', 'int']
+    # the second call with 1 came from the cache
+    assert len(calls) == 2
@@ -0,0 +1,24 @@
+import io
+
+import pytest
+
+from error import InterpreterError
+from peach import Peach
+
+def test_failed_lookup_leaves_no_stale_error():
+    output = io.StringIO()
+    peach = Peach(output=output)
+    peach.eval(data='func fail() { return missing_name; }')
+
+    with pytest.raises(InterpreterError):
+        peach.get_function('nope')
+
+    assert peach.interpreter.error_list.get_errors() == []
+    assert output.getvalue().count('nope') == 1
+
+    with pytest.raises(InterpreterError):
+        peach.call_function('fail')
+
+    # only the new error is printed, not the lookup's again
+    assert output.getvalue().count('nope') == 1
+    assert output.getvalue().count('missing_name') == 1
@@ -0,0 +1,109 @@
+import re
+
+import pytest
+
+from interpreter.limits import ExecutionLimits
+
+MEMORY_LIMIT = 256 * 1024
+
+RUNAWAY_SOURCES = {
+    'array append': '''
+let xs = [];
+let i = 0;
+
+while true {
+    xs.append("item number " + i.to_str());
+    i += 1;
+}
+''',
+    'object literals': '''
+let xs = [];
+
+while true {
+    xs.append({ a = 1 b = "x" });
+}
+''',
+    'string repeat': '''
+let chunks = [];
+
+while true {
+    chunks.append("abcdefgh" * 10000);
+}
+'''
+}
+
+@pytest.mark.parametrize('name', sorted(RUNAWAY_SOURCES))
+def test_memory_quota_stops_runaway_scripts(run, name):
+    limits = ExecutionLimits(max_memory=MEMORY_LIMIT)
+    (peach, output) = run(RUNAWAY_SOURCES[name], limits=limits)
+
+    assert peach.failed
+    assert limits.memory.in_use > MEMORY_LIMIT
+    assert 'LimitExceeded error' in output
+    assert 'memory limit of {} bytes exceeded'.format(MEMORY_LIMIT) in output
+
+def test_memory_quota_lets_small_scripts_finish(run):
+    limits = ExecutionLimits(max_memory=MEMORY_LIMIT)
+    (peach, output) = run('let xs = [1, 2, 3];\nxs.append({ a = 1 });\nprint(xs.len());', limits=limits)
+
+    assert not peach.failed
+    assert output == '4\n'
+
+SPIN_SOURCE = '''
+let xs = [];
+let i = 0;
+
+while true {
+    xs.append(i);
+    i += 1;
+}
+'''
+
+RECURSIVE_SOURCE = '''
+func f(n) {
+    return [n].map(func(x) { return f(x + 1); });
+}
+
+f(0);
+'''
+
+def error_row(output):
+    match = re.search(r'<none>:(\d+):(\d+): .*LimitExceeded', output)
+    assert match is not None, output
+
+    return int(match.group(1))
+
+@pytest.mark.parametrize('limits', [
+    ExecutionLimits(max_steps=5000),
+    ExecutionLimits(timeout=0.2),
+    ExecutionLimits(max_memory=MEMORY_LIMIT)
+], ids=['steps', 'timeout', 'memory'])
+def test_limits_are_reported_inside_the_script(run, limits):
+    # the loop spends most of its steps inside the std library's Array,
+    # which must not be what the error points at
+    (peach, output) = run(SPIN_SOURCE, limits=limits)
+
+    assert peach.failed
+    assert error_row(output) in (5, 6, 7)
+
+def test_call_depth_limit_is_reported_at_the_scripts_call(run):
+    (peach, output) = run(RECURSIVE_SOURCE, limits=ExecutionLimits(max_depth=20))
+
+    assert peach.failed
+    assert 'call depth limit of 20 exceeded' in output
+    assert error_row(output) == 3
+
+def test_limits_are_removed_after_eval(run):
+    limits = ExecutionLimits(max_steps=10 ** 6, timeout=60, max_depth=50, max_memory=MEMORY_LIMIT)
+    (peach, output) = run('func f(n) { return n + 1; }\nprint(f(1));', limits=limits)
+
+    assert not peach.failed
+    assert output == '2\n'
+
+    interpreter = peach.interpreter
+
+    assert interpreter.limits is None
+    assert interpreter.step_counter is None
+
+    for name in ('visit', 'call_function_expression', 'call_builtin_function', 'visit_ArrayExpression', 'visit_ObjectExpression'):
+        assert name not in interpreter.__dict__
@@ -0,0 +1,63 @@
+from peach import Peach
+
+def make_peach(source):
+    peach = Peach()
+    peach.eval(data=source)
+
+    return peach
+
+def test_append_through_nested_list_reaches_host():
+    peach = make_peach('''
+func add_row(d) {
+    d.rows.append({ a = 1 });
+}
+''')
+
+    host = {'rows': [{'a': 0}]}
+    rows = host['rows']
+
+    peach.call_function('add_row', [host])
+
+    assert host['rows'] is rows
+    assert len(rows) == 2
+    assert rows[0] == {'a': 0}
+    assert rows[1]['a'] == 1
+
+def test_nested_members_keep_their_identity():
+    peach = make_peach('''
+func set_inner(d) {
+    d.inner.b = 2;
+    d.rows[0].b = 3;
+}
+''')
+
+    host = {'inner': {'b': 1}, 'rows': [{'b': 0}]}
+
+    peach.call_function('set_inner', [host])
+
+    assert host['inner'] == {'b': 2}
+    assert host['rows'] == [{'b': 3}]
+
+def test_nested_lists_are_shared_both_ways():
+    peach = make_peach('''
+func grow(xs) {
+    xs[0].append(9);
+    xs.append([1]);
+    return xs;
+}
+''')
+
+    host = [[1, 2], {'k': 'v'}]
+    result = peach.call_function('grow', [host])
+
+    assert result is host
+    assert host[0] == [1, 2, 9]
+    assert host[2] == [1]
+
+def test_dict_members_convert_each_member_once():
+    from interpreter.marshalling import DictMembers
+
+    members = DictMembers({'inner': {'b': 1}, 'rows': [1, 2]})
+
+    assert members['inner'] is members['inner']
+    assert members['rows'] is members['rows']
@@ -0,0 +1,57 @@
+from interpreter.memory import AllocationSites
+from peach import Peach
+
+SOURCE = '''let Point = Type.extend({
+  name = 'Point'
+  instance = {
+    x = 0
+  }
+  func __construct__(self, x) {
+    self.x = x;
+  }
+});
+
+let points = [];
+let i = 0;
+
+while i < 50 {
+    points.append(Point.new(i));
+    i += 1;
+}
+
+let rows = [1, 2, 3].map(func(x) { return [x]; });
+'''
+
+def sites_of(report, kind):
+    return {site['site']: site['count'] for site in report.as_dict()['sites'] if site['kind'] == kind}
+
+def test_memory_report_groups_values_by_script_line(tmp_path):
+    script = tmp_path / 'points.peach'
+    script.write_text(SOURCE)
+
+    peach = Peach()
+    peach.eval(filename=str(script), memory=True)
+
+    assert not peach.failed
+
+    # made inside the std library's Type.new, put down to the script's line
+    assert sites_of(peach.memory, 'Point') == {'{}:15'.format(script): 50}
+
+    arrays = sites_of(peach.memory, 'Array (unboxed)')
+    assert arrays['{}:11'.format(script)] == 1
+    assert arrays['{}:19'.format(script)] == 4
+
+    # the std library's own types were there before the script ran
+    assert set(sites_of(peach.memory, 'Type')) == {'{}:1'.format(script), AllocationSites.UNKNOWN}
+
+    report = peach.memory.report()
+    assert '{}:15'.format(script) in report
+    assert '.py:' not in report
+
+def test_sites_are_taken_off_the_interpreter(run):
+    (peach, output) = run('let xs = [[1], { a = 1 }];', memory=True)
+
+    assert not peach.failed
+
+    for name in AllocationSites.WRAPPED_METHODS:
+        assert name not in peach.interpreter.__dict__
@@ -0,0 +1,77 @@
+import operator
+import random
+
+import pytest
+
+from interpreter import numeric_array
+from interpreter.numeric_array import NumericArray
+
+LARGEST = 2 ** 63 - 1
+SMALLEST = -2 ** 63
+
+OPERATORS = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'div': operator.floordiv
+}
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(numeric_array, 'numpy', None)
+
+    return request.param
+
+def edge_values():
+    values = [0, 1, -1, 2, -2, 3, LARGEST, SMALLEST, LARGEST - 1, SMALLEST + 1, 2 ** 32, -2 ** 32, 3037000499, 3037000500, -3037000500]
+    rng = random.Random(0)
+    values += [rng.randint(SMALLEST, LARGEST) for _ in range(20)]
+    values += [rng.randint(-2 ** 33, 2 ** 33) for _ in range(20)]
+
+    return values
+
+@pytest.mark.parametrize('op_name', sorted(OPERATORS))
+def test_int_ops_overflow_like_python_ints(backend, op_name):
+    values = edge_values()
+    op = OPERATORS[op_name]
+
+    for a in values:
+        for b in values:
+            if op_name == 'div' and b == 0:
+                continue
+
+            expected = op(a, b)
+            lhs = NumericArray.from_values('int', [a])
+            rhs = NumericArray.from_values('int', [b, b])
+
+            if SMALLEST <= expected <= LARGEST:
+                assert lhs.binary_op(op_name, rhs).to_list() == [expected, expected]
+            else:
+                with pytest.raises(OverflowError, match='int too big to convert'):
+                    lhs.binary_op(op_name, rhs)
+
+def test_int_overflow_with_a_scalar(backend):
+    array = NumericArray.from_values('int', [1, LARGEST])
+
+    with pytest.raises(OverflowError, match='int too big to convert'):
+        array.binary_op('add', 1)
+
+    with pytest.raises(OverflowError, match='int too big to convert'):
+        array.binary_op('sub', SMALLEST, reverse=True)
+
+    assert array.binary_op('sub', 1).to_list() == [0, LARGEST - 1]
+
+def test_int_overflow_is_an_error_in_peach(run):
+    (peach, output) = run('let a = IntArray.new([9223372036854775807]);\nprint(a + 1);')
+
+    assert peach.failed
+    assert 'int too big to convert' in output
+
+def test_arrays_print_their_elements_and_types_their_name(run):
+    (peach, output) = run('print(IntArray.new([1, 2, 3]));\nprint(FloatArray.new(2).to_str());\nprint(IntArray);\nprint(FloatArray);')
+
+    assert not peach.failed
+    assert output.splitlines() == ['[1, 2, 3]', '[0.0, 0.0]', 'IntArray', 'FloatArray']
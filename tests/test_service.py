@@ -0,0 +1,48 @@
+import main
+from interpreter.service import JobPool, with_default_limits
+
+SPIN_SOURCE = '''
+let i = 0;
+
+while true {
+    i += 1;
+}
+'''
+
+def test_default_limits_fill_in_what_a_job_leaves_out():
+    job = {'id': 0, 'source': '', 'timeout': 5}
+    limited = with_default_limits(job, {'timeout': 1, 'max_steps': 100})
+
+    assert limited == {'id': 0, 'source': '', 'timeout': 5, 'max_steps': 100}
+    assert job == {'id': 0, 'source': '', 'timeout': 5}
+    assert with_default_limits(job, {}) is job
+
+def test_pool_bounds_jobs_by_its_default_limits():
+    pool = JobPool(1, {'timeout': 0.2, 'max_steps': None})
+
+    try:
+        results = {result['id']: result for result in pool.run([
+            {'id': 0, 'source': SPIN_SOURCE},
+            {'id': 1, 'source': SPIN_SOURCE, 'max_steps': 500},
+            {'id': 2, 'source': 'print("done");'}
+        ])}
+    finally:
+        pool.shutdown()
+
+    assert not results[0]['ok']
+    assert 'time limit of 0.2s exceeded' in results[0]['output']
+    assert not results[1]['ok']
+    assert 'step limit of 500 exceeded' in results[1]['output']
+    assert results[2]['ok']
+    assert results[2]['output'] == 'done\n'
+
+def test_scripts_named_like_commands_run_as_scripts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert main.is_service_command(['main.py', 'serve'])
+    assert not main.is_service_command(['main.py', 'script.peach'])
+
+    (tmp_path / 'serve').write_text('print("a script");\n')
+
+    assert not main.is_service_command(['main.py', 'serve'])
+    assert main.is_service_command(['main.py', 'batch'])
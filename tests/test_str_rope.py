@@ -0,0 +1,29 @@
+from interpreter.str_rope import StrRope
+
+APPEND_SOURCE = '''
+let piece = "0123456789abcdef" * 4;
+let result = "";
+let index = 0;
+
+while index < 200 {
+    result += piece;
+    index += 1;
+}
+'''
+
+def test_appends_leave_the_rope_unflattened(run, monkeypatch):
+    flattened = []
+    flatten = StrRope.flatten
+
+    def counted_flatten(self):
+        flattened.append(self.length)
+        return flatten(self)
+
+    monkeypatch.setattr(StrRope, 'flatten', counted_flatten)
+
+    (peach, output) = run(APPEND_SOURCE + 'print(result.len());')
+
+    assert not peach.failed
+    assert output == '{}\n'.format(200 * 64)
+    # the only flatten allowed is whatever `len` or `print` needs at the end
+    assert len(flattened) <= 1